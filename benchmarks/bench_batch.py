@@ -0,0 +1,67 @@
+"""Resumes per minute of the batch CLI against the stub board and a fake client.
+
+Usage:
+    python benchmarks/bench_batch.py --resumes 1 10 50 --latency 0.2
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.filtering import FilteringAgent  # noqa: E402
+from agents.search_strategy import SearchStrategyAgent  # noqa: E402
+from agents.web_scraper import WebScraperAgent  # noqa: E402
+from batch import run_batch  # noqa: E402
+from corpus import ROLES, make_resume_text  # noqa: E402
+from fake_anthropic import FakeAnthropic  # noqa: E402
+from stub_board import StubBoard  # noqa: E402
+from utils.score_cache import ScoreCache  # noqa: E402
+
+
+def write_resumes(directory: str, count: int):
+    roles = list(ROLES)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"resume_{i:04d}.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(make_resume_text(roles[i % len(roles)], seed=i))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resumes', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--latency', type=float, default=0.2, help='fake LLM call latency (s)')
+    parser.add_argument('--board-latency', type=float, default=0.05, help='stub response latency (s)')
+    args = parser.parse_args()
+
+    print(f"{'resumes':>8} {'queries':>8} {'listings':>9} {'llm calls':>10} {'parse (s)':>10} "
+          f"{'scrape (s)':>11} {'score (s)':>10} {'resumes/min':>12}")
+    with StubBoard(latency=args.board_latency) as board:
+        for count in args.resumes:
+            client = FakeAnthropic(latency=args.latency)
+            cache = ScoreCache(":memory:")
+            scraper = WebScraperAgent(use_cache=False, per_host_rate=50, per_host_burst=10,
+                                      per_host_concurrency=4, rate_limit_path=board.rate_limit_path)
+            logging.getLogger('agents').setLevel(logging.WARNING)
+            scraper.search_endpoints['linkedin'] = board.url
+            with tempfile.TemporaryDirectory(prefix='bench-batch-') as directory:
+                paths = write_resumes(directory, count)
+                _, report = run_batch(
+                    paths,
+                    SearchStrategyAgent(client=client, cache=cache),
+                    scraper,
+                    FilteringAgent(client=client, cache=cache),
+                    locations=['remote']
+                )
+            print(f"{count:>8} {report['queries']:>8} {report['listings']:>9} {client.calls:>10} "
+                  f"{report['parse_seconds']:>10.2f} {report['scrape_seconds']:>11.2f} "
+                  f"{report['score_seconds']:>10.2f} {report['resumes_per_minute']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""LLM calls, cost and recall of the scoring cascade versus single-tier scoring.
+
+A listing counts as relevant when it was drawn from the resume's role. Recall
+is the share of relevant listings the cascade sends to the expensive model;
+the fake client returns random scores, so only the heuristic tiers decide it.
+
+Usage:
+    python benchmarks/bench_cascade.py --jobs 500 --max-expensive 25 50 100
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.filtering import FilteringAgent, ScoringCascade  # noqa: E402
+from corpus import make_jobs, make_resume  # noqa: E402
+from fake_anthropic import FakeAnthropic  # noqa: E402
+from utils.score_cache import ScoreCache  # noqa: E402
+
+
+def run(jobs, resume, prefilter_top_k, cascade=None):
+    agent = FilteringAgent(client=FakeAnthropic(latency=0, per_job_latency=0), cache=ScoreCache(":memory:"),
+                           prefilter_top_k=prefilter_top_k, cascade=cascade)
+    jobs = [dict(job) for job in jobs]
+    agent.filter_jobs(jobs, resume)
+    return jobs, agent.usage_report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=500)
+    parser.add_argument('--role', default='Backend Engineer')
+    parser.add_argument('--prefilter-top-k', type=int, default=None)
+    parser.add_argument('--max-expensive', type=int, nargs='+', default=[25, 50, 100])
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    resume = make_resume(args.role)
+    relevant = sum(1 for job in jobs if job['_role'] == args.role)
+    print(f"{len(jobs)} listings, {relevant} relevant")
+
+    print(f"{'config':>18} {'calls':>6} {'expensive jobs':>15} {'cheap jobs':>11} {'recall':>7} {'cost ($)':>9}")
+    configs = [('single tier', None)] + [
+        (f"cascade top {n}", ScoringCascade(max_expensive_jobs=n)) for n in args.max_expensive
+    ]
+    for name, cascade in configs:
+        scored, usage = run(jobs, resume, args.prefilter_top_k, cascade)
+        tiers = [job.get('score_tier', 'expensive') for job in scored]
+        hits = sum(1 for job, tier in zip(scored, tiers) if tier == 'expensive' and job['_role'] == args.role)
+        print(f"{name:>18} {sum(row['calls'] for row in usage):>6} {tiers.count('expensive'):>15} "
+              f"{tiers.count('cheap'):>11} {hits / max(1, relevant):>7.2f} "
+              f"{sum(row['cost_usd'] for row in usage):>9.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Board requests and Claude calls with N concurrent identical searches, with and without coalescing.
+
+Each session (a browser tab, say) has its own scraper and filtering agent
+and starts the same search at the same moment against the stub board and
+the fake Anthropic client. Response caching is off and every agent has its
+own in-memory score cache, so only in-flight coalescing can save requests.
+
+Usage:
+    python benchmarks/bench_coalesce.py --sessions 1 2 4 8
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.filtering import FilteringAgent  # noqa: E402
+from agents.web_scraper import WebScraperAgent  # noqa: E402
+from corpus import make_resume  # noqa: E402
+from fake_anthropic import FakeAnthropic  # noqa: E402
+from stub_board import StubBoard  # noqa: E402
+from utils.score_cache import ScoreCache  # noqa: E402
+
+QUERIES = ['python developer', 'backend engineer', 'data engineer', 'devops engineer']
+
+
+def run(board: StubBoard, sessions: int, coalesce: bool, latency: float, listings: int) -> dict:
+    client = FakeAnthropic(latency=latency, per_job_latency=0.01)
+    resume = make_resume('Backend Engineer')
+    requests_before = board.requests
+    agents = []
+    for _ in range(sessions):
+        scraper = WebScraperAgent(use_cache=False, max_results_per_query=listings, per_host_rate=1000,
+                                  per_host_burst=50, per_host_concurrency=16, boards=['linkedin'],
+                                  coalesce=coalesce, rate_limit_path=board.rate_limit_path)
+        scraper.search_endpoints['linkedin'] = board.url
+        agent = FilteringAgent(client=client, cache=ScoreCache(":memory:"), prefilter_top_k=20,
+                               enricher=scraper.enrich_jobs, coalesce=coalesce)
+        agents.append((scraper, agent))
+
+    start = threading.Barrier(sessions)
+    seconds = []
+
+    def session(scraper, agent):
+        start.wait()
+        started = time.perf_counter()
+        agent.filter_jobs(scraper.scrape_jobs(QUERIES), resume)
+        seconds.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=session, args=pair) for pair in agents]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    result = {
+        'requests': board.requests - requests_before,
+        'llm_calls': client.calls,
+        'pages_coalesced': sum(scraper.http_stats()['coalesced'] for scraper, _ in agents),
+        'scores_coalesced': sum(agent.coalesced_report()['scores'] for _, agent in agents),
+        'seconds': max(seconds),
+    }
+    for scraper, _ in agents:
+        scraper.http.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--listings', type=int, default=30, help='listings per query on the stub board')
+    parser.add_argument('--latency', type=float, default=0.05, help='stub response latency (s)')
+    parser.add_argument('--llm-latency', type=float, default=0.3, help='fake Claude call latency (s)')
+    args = parser.parse_args()
+
+    logging.getLogger('agents').setLevel(logging.WARNING)
+    print(f"{'sessions':>9} {'coalesce':>9} {'requests':>9} {'LLM calls':>10} {'pages shared':>13} "
+          f"{'scores shared':>14} {'seconds':>8}")
+    with StubBoard(latency=args.latency, total_per_query=args.listings) as board:
+        for sessions in args.sessions:
+            for coalesce in (False, True):
+                result = run(board, sessions, coalesce, args.llm_latency, args.listings)
+                print(f"{sessions:>9} {'on' if coalesce else 'off':>9} {result['requests']:>9} "
+                      f"{result['llm_calls']:>10} {result['pages_coalesced']:>13} "
+                      f"{result['scores_coalesced']:>14} {result['seconds']:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
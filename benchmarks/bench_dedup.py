@@ -0,0 +1,91 @@
+"""Dedup ratio, accuracy and speed of MinHash/LSH near-duplicate detection.
+
+Generates distinct postings plus re-posted variants (abbreviated titles,
+respelled locations, company suffixes, other boards) with known ground truth.
+
+Usage:
+    python benchmarks/bench_dedup.py --listings 1000 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.dedup import NearDuplicateIndex  # noqa: E402
+from corpus import ROLES  # noqa: E402
+
+SPECIALTIES = ['Platform', 'Payments', 'Search', 'Growth', 'Infrastructure', 'Analytics', 'Security', 'Mobile']
+LEVELS = [('Senior', 'Sr.'), ('Junior', 'Jr.'), ('Lead', 'Lead'), ('', '')]
+LOCATIONS = [
+    ('New York, NY', 'New York, New York, United States'),
+    ('San Francisco, CA', 'San Francisco Bay Area'),
+    ('London, UK', 'London, England, United Kingdom'),
+    ('Remote', 'Remote (US)'),
+    ('Berlin, Germany', 'Berlin, Berlin, Germany'),
+    ('Austin, TX', 'Austin, Texas Metropolitan Area'),
+]
+SYLLABLES = ['ac', 'me', 'glo', 'bex', 'ini', 'tech', 'um', 'bra', 'hoo', 'li', 'stark', 'way', 'ne', 'zen']
+BOARDS = ['LinkedIn', 'Indeed', 'Glassdoor']
+
+
+def make_listings(count, seed=0):
+    rng = random.Random(seed)
+    listings, truth, bases = [], [], set()
+    while len(listings) < count:
+        level, level_short = rng.choice(LEVELS)
+        role = f"{rng.choice(SPECIALTIES)} {rng.choice(list(ROLES))}"
+        company = ''.join(rng.sample(SYLLABLES, 3)).title()
+        location, location_alt = rng.choice(LOCATIONS)
+        if (level, role, company, location) in bases:
+            continue
+        bases.add((level, role, company, location))
+        cluster = len(bases)
+        listings.append({'title': f"{level} {role}".strip(), 'company': company, 'location': location,
+                         'link': f"https://linkedin.example/{cluster}", 'source': 'LinkedIn'})
+        truth.append(cluster)
+        for variant in range(rng.choice([0, 0, 1, 2])):
+            listings.append({
+                'title': f"{level_short} {role}".strip(),
+                'company': company + rng.choice(['', ' Inc.', ', LLC']),
+                'location': rng.choice([location, location_alt]),
+                'link': f"https://{rng.choice(BOARDS).lower()}.example/{cluster}-{variant}",
+                'source': rng.choice(BOARDS)
+            })
+            truth.append(cluster)
+    return listings[:count], truth[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--listings', type=int, nargs='+', default=[1000, 10000])
+    args = parser.parse_args()
+
+    print(f"{'listings':>9} {'true dups':>10} {'collapsed':>10} {'ratio':>6} {'precision':>10} "
+          f"{'recall':>7} {'s/10k':>7} {'exact-only ratio':>17}")
+    for count in args.listings:
+        listings, truth = make_listings(count)
+        cluster_of = {id(job): cluster for job, cluster in zip(listings, truth)}
+
+        index = NearDuplicateIndex()
+        started = time.perf_counter()
+        merged = correct = 0
+        for job in listings:
+            canonical = index.add(job)
+            if canonical is not None:
+                merged += 1
+                correct += cluster_of[id(canonical)] == cluster_of[id(job)]
+        elapsed = time.perf_counter() - started
+
+        true_duplicates = len(listings) - len(set(truth))
+        exact = len({(j['title'], j['company'], j['location']) for j in listings})
+        report = index.report()
+        print(f"{count:>9} {true_duplicates:>10} {merged:>10} {report['dedup_ratio']:>6.1%} "
+              f"{correct / max(1, merged):>10.1%} {correct / max(1, true_duplicates):>7.1%} "
+              f"{elapsed / count * 10000:>7.2f} {1 - exact / len(listings):>17.1%}")
+
+
+if __name__ == '__main__':
+    main()
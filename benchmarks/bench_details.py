@@ -0,0 +1,89 @@
+"""Posting-page fetches and time: enrich every listing vs only those that survive ranking.
+
+Scrapes the stub board, then scores the listings with the fake Anthropic
+client. 'eager' fetches the posting page of every scraped listing before
+scoring; 'lazy' lets FilteringAgent fetch only the listings it is about to
+send to Claude, after the local TF-IDF pre-filter or scoring cascade.
+
+Usage:
+    python benchmarks/bench_details.py --queries 8 --listings 100 --top-k 15
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.filtering import FilteringAgent, ScoringCascade  # noqa: E402
+from agents.web_scraper import WebScraperAgent  # noqa: E402
+from corpus import make_resume  # noqa: E402
+from fake_anthropic import FakeAnthropic  # noqa: E402
+from stub_board import StubBoard  # noqa: E402
+from utils.score_cache import ScoreCache  # noqa: E402
+
+QUERIES = ['python developer', 'backend engineer', 'data engineer', 'devops engineer', 'java developer',
+           'frontend developer', 'sales manager', 'accountant']
+
+
+def make_scraper(board: StubBoard, workers: int) -> WebScraperAgent:
+    scraper = WebScraperAgent(use_cache=False, max_results_per_query=board.total_per_query, per_host_rate=1000,
+                              per_host_burst=50, per_host_concurrency=workers, detail_workers=workers,
+                              boards=['linkedin'], rate_limit_path=board.rate_limit_path)
+    scraper.search_endpoints['linkedin'] = board.url
+    return scraper
+
+
+def run(mode: str, board: StubBoard, queries, resume, workers: int, top_k: int, cascade) -> dict:
+    scraper = make_scraper(board, workers)
+    jobs = scraper.scrape_jobs(queries)
+    board.detail_requests = 0
+    agent = FilteringAgent(client=FakeAnthropic(latency=0, per_job_latency=0), cache=ScoreCache(":memory:"),
+                           prefilter_top_k=top_k, cascade=cascade,
+                           enricher=scraper.enrich_jobs if mode == 'lazy' else None)
+
+    started = time.perf_counter()
+    if mode == 'eager':
+        scraper.enrich_jobs(jobs)
+    agent.filter_jobs(jobs, resume)
+    seconds = time.perf_counter() - started
+    scraper.http.close()
+
+    scored = [job for job in jobs if job.get('score_tier', 'expensive') != 'heuristic' and 'match_score' in job]
+    calls = sum(row['calls'] for row in agent.usage_report())
+    return {
+        'listings': len(jobs),
+        'fetches': board.detail_requests,
+        'seconds': seconds,
+        'llm_calls': calls,
+        'with_details': sum(1 for job in scored if job['description']) / max(1, len(scored)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=8)
+    parser.add_argument('--listings', type=int, default=100, help='listings per query on the stub board')
+    parser.add_argument('--latency', type=float, default=0.02, help='stub response latency (s)')
+    parser.add_argument('--workers', type=int, default=4, help='concurrent posting fetches')
+    parser.add_argument('--top-k', type=int, default=15, help='listings kept by the TF-IDF pre-filter')
+    args = parser.parse_args()
+
+    logging.getLogger('agents').setLevel(logging.WARNING)
+    resume = make_resume('Backend Engineer')
+    queries = QUERIES[:args.queries]
+    configs = [('eager', f'top-{args.top_k}', None), ('lazy', f'top-{args.top_k}', None),
+               ('lazy', 'cascade', ScoringCascade())]
+
+    print(f"{'mode':>6} {'scoring':>8} {'listings':>9} {'fetches':>8} {'seconds':>8} {'LLM calls':>10} "
+          f"{'scored w/ details':>18}")
+    with StubBoard(latency=args.latency, total_per_query=args.listings) as board:
+        for mode, scoring, cascade in configs:
+            result = run(mode, board, queries, resume, args.workers, args.top_k, cascade)
+            print(f"{mode:>6} {scoring:>8} {result['listings']:>9} {result['fetches']:>8} "
+                  f"{result['seconds']:>8.2f} {result['llm_calls']:>10} {result['with_details']:>18.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Memory and export time: list of dicts + DataFrame vs the columnar ResultStore.
+
+Each run collects N scored listings and exports them to CSV, Markdown and
+Parquet in a fresh process, reporting wall time per step and the process's
+peak RSS growth. 'dicts' is the previous path (listings kept as dicts, a
+DataFrame for CSV/Parquet and Markdown built with repeated +=); 'store'
+freezes listings into Arrow record batches as they arrive and streams every
+export batch by batch.
+
+Usage:
+    python benchmarks/bench_export.py --listings 10000 50000 100000
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from corpus import make_jobs  # noqa: E402
+
+CHUNK = 5000
+
+
+def scored_listings(count: int):
+    """Listings as the filter yields them, one batch at a time"""
+    for seed, start in enumerate(range(0, count, CHUNK)):
+        batch = make_jobs(min(CHUNK, count - start), seed=seed)
+        for i, job in enumerate(batch):
+            del job['_role']
+            job['match_score'] = float((start + i) % 100)
+            job['score_tier'] = 'expensive' if i % 10 == 0 else 'cheap'
+            job['alternate_links'] = []
+        yield batch
+
+
+def legacy_markdown(job_listings):
+    """DataProcessor.generate_markdown before streaming export"""
+    markdown = "# Job Matches\n\n"
+    for job in job_listings:
+        markdown += f"## {job.get('title', 'Unknown Position')}\n\n"
+        markdown += f"**Company:** {job.get('company', 'Unknown')}\n\n"
+        markdown += f"**Location:** {job.get('location', 'Unknown')}\n\n"
+        if job.get('match_score'):
+            markdown += f"**Match Score:** {job['match_score']}%\n\n"
+        if job.get('description'):
+            markdown += "### Description\n\n"
+            markdown += f"{job['description']}\n\n"
+        if job.get('requirements'):
+            markdown += "### Requirements\n\n"
+            markdown += f"{job['requirements']}\n\n"
+        if job.get('link'):
+            markdown += f"[Apply Here]({job['link']})\n\n"
+        markdown += "---\n\n"
+    return markdown
+
+
+def max_rss() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run(mode: str, count: int) -> dict:
+    import pandas as pd
+    import pyarrow  # noqa: F401  (imported before the baseline so both modes pay for it)
+
+    from utils.data_processor import DataProcessor
+    from utils.result_store import ResultStore
+
+    baseline = max_rss()
+    timings = {}
+    with tempfile.TemporaryDirectory(prefix='bench-export-') as directory:
+        started = time.perf_counter()
+        if mode == 'dicts':
+            results = []
+            for batch in scored_listings(count):
+                results.extend(batch)
+            results.sort(key=lambda job: job['match_score'], reverse=True)
+        else:
+            results = ResultStore()
+            for batch in scored_listings(count):
+                results.extend(batch)
+            results = results.sort_by('match_score')
+        timings['collect'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if mode == 'dicts':
+            df = pd.DataFrame(results)
+            df.to_csv(os.path.join(directory, 'out.csv'), index=False)
+        else:
+            results.write_csv(os.path.join(directory, 'out.csv'))
+        timings['csv'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if mode == 'dicts':
+            with open(os.path.join(directory, 'out.md'), 'w', encoding='utf-8') as f:
+                f.write(legacy_markdown(results))
+        else:
+            DataProcessor.write_markdown(results, os.path.join(directory, 'out.md'))
+        timings['markdown'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if mode == 'dicts':
+            df.to_parquet(os.path.join(directory, 'out.parquet'), index=False)
+        else:
+            results.write_parquet(os.path.join(directory, 'out.parquet'))
+        timings['parquet'] = time.perf_counter() - started
+
+    timings['peak_rss_mb'] = (max_rss() - baseline) / 1024 / 1024
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--listings', type=int, nargs='+', default=[10000, 50000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'listings':>9} {'mode':>6} {'collect (s)':>12} {'csv (s)':>8} {'markdown (s)':>13} "
+          f"{'parquet (s)':>12} {'peak RSS +MB':>13}")
+    context = multiprocessing.get_context('spawn')
+    for count in args.listings:
+        for mode in ('dicts', 'store'):
+            # A fresh process per run so peak RSS is not inherited from earlier runs
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run, mode, count).result()
+            print(f"{count:>9} {mode:>6} {result['collect']:>12.2f} {result['csv']:>8.2f} "
+                  f"{result['markdown']:>13.2f} {result['parquet']:>12.2f} {result['peak_rss_mb']:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Resume text extraction latency versus PDF page count.
+
+Usage:
+    python benchmarks/bench_extraction.py --pages 1 10 100 --workers 4
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+import PyPDF2
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from corpus import make_pdf  # noqa: E402
+from utils.text_extraction import extract_pdf_text  # noqa: E402
+
+
+def concat_pages(data: bytes) -> str:
+    """The previous ResumeParser approach: copy into memory, grow one string"""
+    content = ""
+    for page in PyPDF2.PdfReader(io.BytesIO(data)).pages:
+        content += page.extract_text() + "\n"
+    return content
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='processes for the parallel run')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'size (KB)':>10} {'concat (ms)':>12} {'streamed (ms)':>14} "
+          f"{'parallel x' + str(args.workers) + ' (ms)':>18}")
+    for pages in args.pages:
+        data = make_pdf(pages)
+        concat = timed(lambda: concat_pages(data), args.repeat)
+        streamed = timed(lambda: extract_pdf_text(io.BytesIO(data), max_pages=None, workers=1), args.repeat)
+        parallel = timed(lambda: extract_pdf_text(io.BytesIO(data), max_pages=None, workers=args.workers,
+                                                  parallel_min_pages=1), args.repeat)
+        print(f"{pages:>6} {len(data) / 1024:>10.1f} {concat * 1000:>12.1f} {streamed * 1000:>14.1f} "
+              f"{parallel * 1000:>18.1f}")
+
+
+if __name__ == '__main__':
+    main()
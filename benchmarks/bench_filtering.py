@@ -0,0 +1,54 @@
+"""Throughput and tail latency of FilteringAgent.filter_jobs against a fake client.
+
+Usage:
+    python benchmarks/bench_filtering.py --jobs 200 --latency 0.5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.filtering import FilteringAgent  # noqa: E402
+from fake_anthropic import FakeAnthropic  # noqa: E402
+from utils.score_cache import ScoreCache  # noqa: E402
+
+RESUME = {
+    'skills': ['python', 'django', 'aws', 'docker', 'sql'],
+    'experience': [{'title': 'Backend Engineer', 'company': 'Acme', 'duration': '', 'description': ''}],
+    'education': [{'degree': 'BSc Computer Science', 'institution': 'State University', 'year': '2018', 'details': ''}],
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.5, help='fake call latency (s)')
+    args = parser.parse_args()
+
+    jobs = [{'title': f"Engineer {i}", 'description': 'Build services in Python', 'requirements': ''}
+            for i in range(args.jobs)]
+    configs = [('sequential', 1, 1), ('batched', 10, 1), ('batched+concurrent', 10, 4)]
+
+    print(f"{'mode':>20} {'calls':>6} {'jobs/s':>8} {'p50 (s)':>8} {'p95 (s)':>8} {'p99 (s)':>8}")
+    for name, batch_size, workers in configs:
+        client = FakeAnthropic(latency=args.latency)
+        agent = FilteringAgent(client=client, batch_size=batch_size, max_workers=workers,
+                               cache=ScoreCache(":memory:"))
+        started = time.perf_counter()
+        agent.filter_jobs([dict(job) for job in jobs], RESUME)
+        elapsed = time.perf_counter() - started
+        print(f"{name:>20} {client.calls:>6} {args.jobs / elapsed:>8.1f} "
+              f"{statistics.median(client.latencies):>8.2f} {percentile(client.latencies, 95):>8.2f} "
+              f"{percentile(client.latencies, 99):>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
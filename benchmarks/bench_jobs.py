@@ -0,0 +1,176 @@
+"""Concurrent users: searches run in page threads vs the background job service.
+
+N users submit a search at once against the stub board and the fake
+Anthropic client. 'inline' runs every search in a thread of one process
+with shared agents, as Streamlit does when each session runs the search in
+its script thread; 'service' queues them for JobService worker processes.
+Reports the time until all searches are done, throughput and per-search
+latency. --crash also kills a worker mid-search and reports how much work
+the search resumed from its checkpoints had left to redo.
+
+Usage:
+    python benchmarks/bench_jobs.py --users 1 4 8 --workers 2 4 --crash
+"""
+import argparse
+import functools
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.filtering import FilteringAgent, ScoringCascade  # noqa: E402
+from agents.search_strategy import SearchStrategyAgent  # noqa: E402
+from agents.web_scraper import WebScraperAgent  # noqa: E402
+from corpus import ROLES, make_resume  # noqa: E402
+from fake_anthropic import FakeAnthropic  # noqa: E402
+from job_service import FINISHED, JobQueue, JobService, run_search  # noqa: E402
+from stub_board import StubBoard  # noqa: E402
+from utils.query_planner import QueryHistory, QueryPlanner  # noqa: E402
+from utils.score_cache import ScoreCache  # noqa: E402
+
+
+def bench_agents(board_url: str, rate_limit_path: str, listings: int, latency: float, per_job_latency: float):
+    """Agents of one worker (or of the whole process, inline), pointed at the stub board"""
+    logging.getLogger('agents').setLevel(logging.WARNING)
+    scraper = WebScraperAgent(use_cache=False, max_results_per_query=listings, per_host_rate=1000,
+                              per_host_burst=50, per_host_concurrency=8, boards=['linkedin'],
+                              rate_limit_path=rate_limit_path)
+    scraper.search_endpoints['linkedin'] = board_url
+    client = FakeAnthropic(latency=latency, per_job_latency=per_job_latency)
+    planner = QueryPlanner(QueryHistory(":memory:"), requests_per_query=scraper.max_requests_per_query())
+    search_agent = SearchStrategyAgent(client=client, cache=ScoreCache(":memory:"), planner=planner)
+    filter_agent = FilteringAgent(client=client, cache=ScoreCache(":memory:"), cascade=ScoringCascade(),
+                                  enricher=scraper.enrich_jobs)
+    return search_agent, scraper, filter_agent
+
+
+def submit_searches(queue: JobQueue, users: int):
+    roles = list(ROLES)
+    job_ids = []
+    for i in range(users):
+        role = roles[i % len(roles)]
+        job_ids.append(queue.submit({'resume_data': make_resume(role), 'skills': [], 'job_titles': [role],
+                                     'locations': ['remote', 'berlin']}))
+    return job_ids
+
+
+def wait_for(queue: JobQueue, job_ids, poll: float = 0.05):
+    while True:
+        statuses = [queue.status(job_id) for job_id in job_ids]
+        if all(status['status'] in FINISHED for status in statuses):
+            return statuses
+        time.sleep(poll)
+
+
+def summarise(statuses, started: float) -> dict:
+    latencies = sorted(status['finished_at'] - status['created_at'] for status in statuses)
+    makespan = max(status['finished_at'] for status in statuses) - started
+    return {
+        'makespan': makespan,
+        'per_minute': len(statuses) * 60 / makespan,
+        'p50': statistics.median(latencies),
+        'p95': latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        'failed': sum(status['status'] != 'done' for status in statuses),
+    }
+
+
+def run_inline(path: str, users: int, factory) -> dict:
+    queue = JobQueue(path)
+    agents = factory()
+    started = time.time()
+    job_ids = submit_searches(queue, users)
+
+    def page_thread(i):
+        job = queue.claim(f"thread-{i}")
+        run_search(queue, job, *agents)
+        queue.finish(job['id'], job['worker'], 'done')
+
+    threads = [threading.Thread(target=page_thread, args=(i,)) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarise(wait_for(queue, job_ids), started)
+
+
+def run_service(path: str, users: int, workers: int, factory, warmup: float) -> dict:
+    with JobService(path, workers=workers, agent_factory=factory, poll_interval=0.05) as service:
+        # Workers import the agents before the clock starts, as they would in a long-running app
+        time.sleep(warmup)
+        started = time.time()
+        job_ids = submit_searches(service.queue, users)
+        return summarise(wait_for(service.queue, job_ids), started)
+
+
+def run_crash(path: str, board: StubBoard, factory, warmup: float):
+    """Kill the only worker during scoring, then let a fresh one pick the search up"""
+    # Small scoring chunks so the search is killed between two scoring checkpoints
+    options = {'agent_factory': factory, 'poll_interval': 0.05, 'stale_after': 1, 'score_chunk': 2}
+    requests_before = board.requests
+    with JobService(path, workers=1, **options) as service:
+        time.sleep(warmup)
+        started = time.time()
+        job_id = submit_searches(service.queue, 1)[0]
+        while True:
+            status = service.status(job_id)
+            if status['status'] in FINISHED or (status['stage'] == 'filter' and status['progress'] >= 0.8):
+                break
+            time.sleep(0.02)
+        for process in service.processes:
+            process.terminate()
+            process.join()
+        killed_at = time.time()
+        requests_first = board.requests - requests_before
+        print(f"killed worker at stage {status['stage']} ({status['progress']:.0%}, {status['message']}) "
+              f"after {killed_at - started:.2f}s and {requests_first} board requests")
+
+    requests_before = board.requests
+    with JobService(path, workers=1, **options) as service:
+        status = wait_for(service.queue, [job_id])[0]
+        print(f"resumed: {status['status']} after {status['attempts']} attempts, "
+              f"{time.time() - killed_at:.2f}s and {board.requests - requests_before} more board requests "
+              "(includes the worker start and 1s stale timeout)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4])
+    parser.add_argument('--listings', type=int, default=50, help='listings per query on the stub board')
+    parser.add_argument('--latency', type=float, default=0.02, help='stub response latency (s)')
+    parser.add_argument('--llm-latency', type=float, default=0.3, help='fake Claude call latency (s)')
+    parser.add_argument('--per-job-latency', type=float, default=0.01, help='fake latency per scored job (s)')
+    parser.add_argument('--warmup', type=float, default=10, help='seconds workers get to start')
+    parser.add_argument('--crash', action='store_true', help='also kill and resume a search')
+    args = parser.parse_args()
+
+    logging.getLogger('agents').setLevel(logging.WARNING)
+    print(f"{'users':>6} {'mode':>10} {'all done (s)':>13} {'searches/min':>13} {'p50 (s)':>8} {'p95 (s)':>8} "
+          f"{'failed':>7}")
+    with StubBoard(latency=args.latency, total_per_query=args.listings) as board, \
+            tempfile.TemporaryDirectory(prefix='bench-jobs-') as directory:
+        factory = functools.partial(bench_agents, board.url, board.rate_limit_path, args.listings,
+                                    args.llm_latency, args.per_job_latency)
+        runs = 0
+        for users in args.users:
+            modes = [('inline', None)] + [(f'service x{workers}', workers) for workers in args.workers]
+            for mode, workers in modes:
+                runs += 1
+                path = os.path.join(directory, f'jobs-{runs}.sqlite')
+                if workers is None:
+                    result = run_inline(path, users, factory)
+                else:
+                    result = run_service(path, users, workers, factory, args.warmup)
+                print(f"{users:>6} {mode:>10} {result['makespan']:>13.2f} {result['per_minute']:>13.1f} "
+                      f"{result['p50']:>8.2f} {result['p95']:>8.2f} {result['failed']:>7}")
+        if args.crash:
+            run_crash(os.path.join(directory, 'crash.sqlite'), board, factory, args.warmup)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Cards/sec and allocations of the lxml card parser versus the BeautifulSoup path.
+
+Usage:
+    python benchmarks/bench_parser.py --repeat 200
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.job_parsers import get_parser  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'linkedin_search_*.html')
+
+
+def parse_bs4(html):
+    """The previous WebScraperAgent parsing path, kept as the reference"""
+    jobs = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for card in soup.find_all('div', {'class': 'job-search-card'}):
+        jobs.append({
+            'title': card.find('h3', {'class': 'base-search-card__title'}).text.strip(),
+            'company': card.find('h4', {'class': 'base-search-card__subtitle'}).text.strip(),
+            'location': card.find('span', {'class': 'job-search-card__location'}).text.strip(),
+            'link': card.find('a', {'class': 'base-card__full-link'})['href'],
+            'source': 'LinkedIn'
+        })
+    return jobs
+
+
+def measure(parse, html, repeat):
+    cards = len(parse(html))
+    started = time.perf_counter()
+    for _ in range(repeat):
+        parse(html)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    parse(html)
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+    return cards * repeat / elapsed, peak / 1024, blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    lxml_parse = get_parser('linkedin').parse
+    print(f"{'fixture':>26} {'parser':>6} {'cards/s':>10} {'peak KB':>8} {'live blocks':>12}")
+    for path in sorted(glob.glob(FIXTURES)):
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        assert parse_bs4(html) == lxml_parse(html), f"parsers disagree on {path}"
+        for name, parse in (('bs4', parse_bs4), ('lxml', lxml_parse)):
+            rate, peak_kb, blocks = measure(parse, html, args.repeat)
+            print(f"{os.path.basename(path):>26} {name:>6} {rate:>10.0f} {peak_kb:>8.1f} {blocks:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""End-to-end pipeline benchmark per stage, compared against a stored baseline.
+
+Runs ResumeParser -> SearchStrategyAgent -> WebScraperAgent -> FilteringAgent ->
+DataProcessor for every synthetic resume against the stub board and the fake
+Anthropic client, and reports throughput, p50/p95 latency and peak RSS per stage.
+
+Usage:
+    python benchmarks/bench_pipeline.py --sizes small medium
+    python benchmarks/bench_pipeline.py --sizes small medium --save-baseline
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from docx import Document
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.filtering import FilteringAgent  # noqa: E402
+from agents.search_strategy import SearchStrategyAgent  # noqa: E402
+from agents.web_scraper import WebScraperAgent  # noqa: E402
+from corpus import ROLES, make_resume_text  # noqa: E402
+from fake_anthropic import FakeAnthropic  # noqa: E402
+from stub_board import StubBoard  # noqa: E402
+from utils.data_processor import DataProcessor  # noqa: E402
+from utils.resume_parser import ResumeParser  # noqa: E402
+from utils.score_cache import ScoreCache  # noqa: E402
+
+# resumes per run, listings the stub board holds per query
+SIZES = {
+    'small': {'resumes': 5, 'listings': 25},
+    'medium': {'resumes': 20, 'listings': 50},
+    'large': {'resumes': 50, 'listings': 100},
+}
+STAGES = ['parse', 'queries', 'scrape', 'filter', 'export']
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baselines', 'pipeline.json')
+
+
+def current_rss() -> int:
+    """Resident set size in bytes (Linux /proc, else the process peak)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RssSampler:
+    """Track the peak RSS while a block runs by sampling on a background thread"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self.stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            self.stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = current_rss()
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        self.thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def write_resumes(directory: str, count: int):
+    """Alternate TXT and DOCX resumes"""
+    roles = list(ROLES)
+    paths = []
+    for i in range(count):
+        text = make_resume_text(roles[i % len(roles)], seed=i)
+        if i % 2:
+            path = os.path.join(directory, f"resume_{i:04d}.docx")
+            document = Document()
+            for line in text.split('\n'):
+                document.add_paragraph(line)
+            document.save(path)
+        else:
+            path = os.path.join(directory, f"resume_{i:04d}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        paths.append(path)
+    return paths
+
+
+def run_size(name: str, board: StubBoard, latency: float) -> dict:
+    size = SIZES[name]
+    board.total_per_query = size['listings']
+    client = FakeAnthropic(latency=latency, per_job_latency=0.0)
+    cache = ScoreCache(":memory:")
+    resume_parser = ResumeParser(workers=1)
+    search_agent = SearchStrategyAgent(client=client, cache=cache)
+    filter_agent = FilteringAgent(client=client, cache=cache)
+
+    timings = {stage: [] for stage in STAGES}
+    items = {stage: 0 for stage in STAGES}
+    peaks = {stage: 0 for stage in STAGES}
+
+    def measure(stage, fn, count=lambda result: 1):
+        with RssSampler() as sampler:
+            started = time.perf_counter()
+            result = fn()
+            timings[stage].append(time.perf_counter() - started)
+        peaks[stage] = max(peaks[stage], sampler.peak)
+        items[stage] += count(result)
+        return result
+
+    with tempfile.TemporaryDirectory(prefix='bench-pipeline-') as directory:
+        for path in write_resumes(directory, size['resumes']):
+            # A fresh scraper per resume with the response cache off, so every search hits the stub
+            scraper = WebScraperAgent(use_cache=False, per_host_rate=100, per_host_burst=10,
+                                      per_host_concurrency=4, rate_limit_path=board.rate_limit_path)
+            logging.getLogger('agents').setLevel(logging.WARNING)
+            scraper.search_endpoints['linkedin'] = board.url
+
+            with open(path, 'rb') as f:
+                resume_data = measure('parse', lambda: resume_parser.parse(f))
+            queries = measure('queries', lambda: search_agent.generate_queries(resume_data, [], [], ['remote']),
+                              count=len)
+            jobs = measure('scrape', lambda: scraper.scrape_jobs(queries), count=len)
+            matches = measure('filter', lambda: filter_agent.filter_jobs(jobs, resume_data), count=lambda _: len(jobs))
+            measure('export', lambda: (DataProcessor.generate_markdown(matches), DataProcessor.format_csv_data(matches)),
+                    count=lambda _: len(matches))
+            scraper.http.close()
+
+    results = {}
+    for stage in STAGES:
+        total = sum(timings[stage])
+        results[stage] = {
+            'items_per_s': items[stage] / total if total else 0.0,
+            'p50_ms': statistics.median(timings[stage]) * 1000,
+            'p95_ms': percentile(timings[stage], 95) * 1000,
+            'peak_rss_mb': peaks[stage] / 1024 / 1024,
+        }
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_ms: float) -> list:
+    """
+    Stages whose p95 latency grew or throughput dropped by more than `tolerance`
+
+    Stages faster than `min_ms` at p95 are too noisy to compare and are skipped.
+    """
+    regressions = []
+    for name, stages in results.items():
+        for stage, metrics in stages.items():
+            base = baseline.get(name, {}).get(stage)
+            if not base or max(base['p95_ms'], metrics['p95_ms']) < min_ms:
+                continue
+            if base['p95_ms'] and metrics['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+                regressions.append(f"{name}/{stage}: p95 {base['p95_ms']:.1f} -> {metrics['p95_ms']:.1f} ms")
+            if base['items_per_s'] and metrics['items_per_s'] < base['items_per_s'] * (1 - tolerance):
+                regressions.append(f"{name}/{stage}: throughput {base['items_per_s']:.1f} -> "
+                                   f"{metrics['items_per_s']:.1f} items/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['small', 'medium'])
+    parser.add_argument('--latency', type=float, default=0.05, help='fake LLM call latency (s)')
+    parser.add_argument('--board-latency', type=float, default=0.01, help='stub response latency (s)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='overwrite the baseline with this run')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown')
+    parser.add_argument('--min-ms', type=float, default=5.0, help='ignore stages faster than this at p95')
+    args = parser.parse_args()
+
+    results = {}
+    with StubBoard(latency=args.board_latency) as board:
+        for name in args.sizes:
+            results[name] = run_size(name, board, args.latency)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{'size':>7} {'stage':>8} {'items/s':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'peak RSS (MB)':>14} "
+          f"{'p95 vs baseline':>16}")
+    for name, stages in results.items():
+        for stage, metrics in stages.items():
+            base = baseline.get(name, {}).get(stage)
+            delta = f"{metrics['p95_ms'] / base['p95_ms'] - 1:+.0%}" if base and base['p95_ms'] else '-'
+            print(f"{name:>7} {stage:>8} {metrics['items_per_s']:>10.1f} {metrics['p50_ms']:>9.1f} "
+                  f"{metrics['p95_ms']:>9.1f} {metrics['peak_rss_mb']:>14.1f} {delta:>16}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.tolerance, args.min_ms)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Recall versus LLM cost of the TF-IDF pre-filter in FilteringAgent.
+
+A listing counts as relevant when it was drawn from the resume's role.
+Recall@K is the share of relevant listings that survive the pre-filter;
+cost is the number of listings (and batched calls) sent to Claude.
+
+Usage:
+    python benchmarks/bench_prefilter.py --jobs 2000 --k 25 50 100 200 500
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.filtering import TfidfRanker  # noqa: E402
+from corpus import make_jobs, make_resume  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--k', type=int, nargs='+', default=[25, 50, 100, 200, 500])
+    parser.add_argument('--role', default='Backend Engineer')
+    parser.add_argument('--batch-size', type=int, default=10)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    resume = make_resume(args.role)
+    relevant = {id(job) for job in jobs if job['_role'] == args.role}
+    ranker = TfidfRanker()
+
+    started = time.perf_counter()
+    ranker.score(jobs, resume)
+    rank_ms = (time.perf_counter() - started) * 1000
+    print(f"{len(jobs)} listings, {len(relevant)} relevant, ranking took {rank_ms:.1f} ms")
+
+    print(f"{'K':>6} {'recall@K':>9} {'precision':>10} {'LLM jobs':>9} {'LLM calls':>10} {'cost':>6}")
+    full_calls = math.ceil(len(jobs) / args.batch_size)
+    for k in args.k:
+        kept = ranker.top_k(jobs, resume, k)
+        hits = sum(1 for job in kept if id(job) in relevant)
+        calls = math.ceil(len(kept) / args.batch_size)
+        print(f"{k:>6} {hits / max(1, len(relevant)):>9.2f} {hits / max(1, len(kept)):>10.2f} "
+              f"{len(kept):>9} {calls:>10} {calls / full_calls:>6.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Scoring prompt tokens and cost: raw prompts vs compaction.
+
+Usage:
+    python benchmarks/bench_prompt.py --jobs 200 --budget 200
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.filtering import FilteringAgent  # noqa: E402
+from corpus import make_jobs, make_resume  # noqa: E402
+from fake_anthropic import FakeAnthropic  # noqa: E402
+from utils.score_cache import ScoreCache  # noqa: E402
+
+# Real postings wrap a few relevant sentences in company boilerplate
+ABOUT = ("About us: we are an equal opportunity employer founded over twenty years ago with offices on "
+         "three continents. Our mission is to delight customers every single day. ") * 3
+BENEFITS = ("Benefits include a competitive salary, equity, health, dental and vision insurance, a learning "
+            "budget, flexible hours, parental leave and a generous holiday allowance. ") * 3
+
+
+def make_long_jobs(count: int):
+    jobs = make_jobs(count, seed=3)
+    for job in jobs:
+        job['description'] = f"{ABOUT}\n{job['description']}\n{BENEFITS}"
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--budget', type=int, default=200, help='description token budget')
+    args = parser.parse_args()
+
+    resume = make_resume('Backend Engineer', seed=1)
+    resume['experience'][0]['description'] = ("Designed and operated high-traffic Python services. " * 12).strip()
+    configs = [('raw', 100_000), ('compact', args.budget)]
+
+    print(f"{'mode':>8} {'calls':>6} {'input':>9} {'output':>7} {'cost ($)':>9} {'saved ($)':>10}")
+    for name, budget in configs:
+        agent = FilteringAgent(client=FakeAnthropic(latency=0, per_job_latency=0), cache=ScoreCache(":memory:"),
+                               prefilter_top_k=None, description_budget=budget)
+        agent.filter_jobs(make_long_jobs(args.jobs), resume)
+        for row in agent.usage_report():
+            print(f"{name:>8} {row['calls']:>6} {row['input_tokens']:>9} {row['output_tokens']:>7} "
+                  f"{row['cost_usd']:>9.4f} {row['saved_usd']:>10.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Query count, board requests and yield: raw cross product vs the query planner.
+
+Generates queries for large keyword inputs, then runs the planned queries
+twice against the stub board so the second search is ranked by the first
+one's yield of new unique listings per request.
+
+Usage:
+    python benchmarks/bench_queries.py --titles 10 --locations 5 --budget 60
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.search_strategy import SearchStrategyAgent  # noqa: E402
+from agents.web_scraper import WebScraperAgent  # noqa: E402
+from corpus import ROLES, make_resume  # noqa: E402
+from fake_anthropic import FakeAnthropic  # noqa: E402
+from stub_board import StubBoard  # noqa: E402
+from utils.query_planner import QueryHistory, QueryPlanner  # noqa: E402
+from utils.score_cache import ScoreCache  # noqa: E402
+from utils.search_stats import SearchStats  # noqa: E402
+
+LOCATIONS = ['remote', 'Remote', 'new york', 'berlin', 'london', 'austin', 'paris', 'toronto']
+
+
+def make_titles(count: int):
+    """Role titles with spelling and word-order variants, as users type them"""
+    roles = [role.lower() for role in ROLES]
+    titles = []
+    for i in range(count):
+        role = roles[i % len(roles)]
+        titles.append(role.title() if i // len(roles) % 2 else ' '.join(reversed(role.split())) + ',')
+    return titles
+
+
+def search(board: StubBoard, queries, max_results: int) -> dict:
+    scraper = WebScraperAgent(use_cache=False, max_results_per_query=max_results, per_host_rate=1000,
+                              per_host_burst=50, per_host_concurrency=8, boards=['linkedin'],
+                              rate_limit_path=board.rate_limit_path)
+    scraper.search_endpoints['linkedin'] = board.url
+    requests_before = board.requests
+    stats = SearchStats()
+    started = time.perf_counter()
+    jobs = scraper.scrape_jobs(queries, stats)
+    seconds = time.perf_counter() - started
+    scraper.http.close()
+    requests_made = board.requests - requests_before
+    return {'queries': len(queries), 'requests': requests_made, 'listings': len(jobs), 'seconds': seconds,
+            'yield': len(jobs) / max(1, requests_made), 'stats': stats.query_report()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=10)
+    parser.add_argument('--locations', type=int, default=5)
+    parser.add_argument('--budget', type=int, default=60, help='board requests per search')
+    parser.add_argument('--max-results', type=int, default=50, help='listings paged through per query')
+    parser.add_argument('--listings', type=int, default=30, help='listings per query on the stub board')
+    parser.add_argument('--latency', type=float, default=0.01, help='stub response latency (s)')
+    args = parser.parse_args()
+
+    logging.getLogger('agents').setLevel(logging.WARNING)
+    resume = make_resume('Backend Engineer')
+    titles = make_titles(args.titles)
+    locations = LOCATIONS[:args.locations]
+    client = FakeAnthropic(latency=0, per_job_latency=0)
+    pages = -(-args.max_results // 10)
+
+    unplanned = SearchStrategyAgent(client=client, cache=ScoreCache(":memory:"),
+                                    planner=QueryPlanner(max_requests=10 ** 9))
+    raw = unplanned._generate_queries(resume, [], titles, locations)
+    history = QueryHistory(":memory:")
+    planner = QueryPlanner(history, max_requests=args.budget, requests_per_query=pages)
+    agent = SearchStrategyAgent(client=client, cache=ScoreCache(":memory:"), planner=planner)
+
+    print(f"{len(titles)} titles x {len(locations)} locations: {len(raw)} raw queries")
+    print(f"{'run':>10} {'queries':>8} {'requests':>9} {'listings':>9} {'new/request':>12} {'seconds':>8}")
+    with StubBoard(latency=args.latency, total_per_query=args.listings) as board:
+        runs = [('raw', raw)]
+        for name in ('planned 1', 'planned 2'):
+            runs.append((name, None))
+        for name, queries in runs:
+            if queries is None:
+                plan = SearchStats()
+                queries = agent.generate_queries(resume, [], titles, locations, plan)
+            result = search(board, queries, args.max_results)
+            if name != 'raw':
+                planner.record(result['stats'])
+            print(f"{name:>10} {result['queries']:>8} {result['requests']:>9} {result['listings']:>9} "
+                  f"{result['yield']:>12.2f} {result['seconds']:>8.2f}")
+    print(f"last plan: {plan.plan}")
+
+
+if __name__ == '__main__':
+    main()
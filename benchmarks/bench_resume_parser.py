@@ -0,0 +1,75 @@
+"""Skill extraction time versus taxonomy size: substring scan vs Aho-Corasick.
+
+Usage:
+    python benchmarks/bench_resume_parser.py --terms 30 300 3000 30000
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from corpus import ROLES, make_resume_text  # noqa: E402
+from utils.resume_parser import ResumeParser  # noqa: E402
+from utils.skill_matcher import SkillMatcher, load_taxonomy  # noqa: E402
+
+
+def make_terms(count: int, seed: int = 0):
+    """The real taxonomy padded with random one- and two-word terms"""
+    rng = random.Random(seed)
+    terms = list(load_taxonomy())[:count]
+    while len(terms) < count:
+        words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(rng.randint(1, 2))]
+        terms.append(' '.join(words))
+    return terms
+
+
+def substring_scan(content: str, terms) -> set:
+    """The previous approach: one `in` scan of the whole text per term"""
+    content_lower = content.lower()
+    return {term for term in terms if term in content_lower}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--terms', type=int, nargs='+', default=[30, 300, 3000, 30000])
+    parser.add_argument('--resumes', type=int, default=50)
+    args = parser.parse_args()
+
+    roles = list(ROLES)
+    texts = ["\n".join(make_resume_text(roles[(i + j) % len(roles)], seed=i + j) for j in range(5))
+             for i in range(args.resumes)]
+
+    print(f"{'terms':>7} {'build (ms)':>11} {'substring (ms/resume)':>22} {'automaton (ms/resume)':>22} "
+          f"{'parse (ms/resume)':>18}")
+    for count in args.terms:
+        terms = make_terms(count)
+        started = time.perf_counter()
+        matcher = SkillMatcher(terms)
+        build = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for text in texts:
+            substring_scan(text, terms)
+        substring = (time.perf_counter() - started) / len(texts)
+
+        started = time.perf_counter()
+        for text in texts:
+            matcher.find(text)
+        automaton = (time.perf_counter() - started) / len(texts)
+
+        resume_parser = ResumeParser(skill_matcher=matcher)
+        started = time.perf_counter()
+        for text in texts:
+            resume_parser.parse_text(text)
+        parse = (time.perf_counter() - started) / len(texts)
+
+        print(f"{count:>7} {build * 1000:>11.1f} {substring * 1000:>22.3f} {automaton * 1000:>22.3f} "
+              f"{parse * 1000:>18.3f}")
+
+
+if __name__ == '__main__':
+    main()
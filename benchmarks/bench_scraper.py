@@ -0,0 +1,66 @@
+"""Wall-clock time of WebScraperAgent.scrape_jobs versus query count.
+
+Usage:
+    python benchmarks/bench_scraper.py --queries 1 5 10 20 --latency 0.2
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.web_scraper import WebScraperAgent  # noqa: E402
+from stub_board import StubBoard  # noqa: E402
+
+
+def make_agent(board: StubBoard, **agent_kwargs) -> WebScraperAgent:
+    # A fresh cache directory and rate budget per agent, so cold runs really are cold
+    cache_dir = tempfile.mkdtemp(prefix='bench-scraper-')
+    agent = WebScraperAgent(cache_dir=cache_dir, rate_limit_path=os.path.join(cache_dir, 'rate_limits.sqlite'),
+                            **agent_kwargs)
+    logging.getLogger('agents').setLevel(logging.WARNING)
+    agent.search_endpoints['linkedin'] = board.url
+    return agent
+
+
+def run(agent: WebScraperAgent, queries) -> float:
+    started = time.perf_counter()
+    agent.scrape_jobs(queries)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, nargs='+', default=[1, 5, 10, 20])
+    parser.add_argument('--latency', type=float, default=0.2, help='stub response latency (s)')
+    parser.add_argument('--rate', type=float, default=20.0, help='per-host requests/s')
+    parser.add_argument('--concurrency', type=int, default=4, help='per-host in-flight requests')
+    args = parser.parse_args()
+
+    print(f"{'queries':>8} {'sequential (s)':>15} {'concurrent (s)':>15} {'speedup':>8} "
+          f"{'cached (s)':>11} {'revalidate (s)':>15} {'304s':>5} {'KB':>7} {'reuse':>6}")
+    with StubBoard(latency=args.latency) as board:
+        for n in args.queries:
+            queries = [f"engineer {i}" for i in range(n)]
+            limits = dict(per_host_rate=args.rate, per_host_burst=args.concurrency,
+                          per_host_concurrency=args.concurrency)
+            sequential = run(make_agent(board, max_workers=1, **limits), queries)
+            agent = make_agent(board, max_workers=args.concurrency, **limits)
+            concurrent = run(agent, queries)
+            # Same agent again: every page is served from the response cache
+            cached = run(agent, queries)
+            # With a zero TTL, cached pages are revalidated with conditional GETs
+            agent = make_agent(board, max_workers=args.concurrency, cache_ttl=0, **limits)
+            run(agent, queries)
+            revalidate = run(agent, queries)
+            stats = agent.http_stats()
+            print(f"{n:>8} {sequential:>15.2f} {concurrent:>15.2f} {sequential / concurrent:>7.1f}x "
+                  f"{cached:>11.2f} {revalidate:>15.2f} {stats['not_modified']:>5} "
+                  f"{stats['bytes_received'] / 1024:>7.1f} {stats['connection_reuse_rate']:>6.0%}")
+
+
+if __name__ == '__main__':
+    main()
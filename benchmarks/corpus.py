@@ -0,0 +1,121 @@
+"""Deterministic synthetic resumes and job listings for benchmarks."""
+import random
+from typing import Dict, List
+
+ROLES = {
+    'Backend Engineer': ['python', 'django', 'flask', 'sql', 'postgresql', 'redis', 'docker', 'aws'],
+    'Frontend Developer': ['javascript', 'react', 'angular', 'vue', 'html', 'css', 'node.js'],
+    'Data Scientist': ['python', 'machine learning', 'sql', 'pandas', 'statistics', 'tensorflow'],
+    'DevOps Engineer': ['kubernetes', 'docker', 'terraform', 'aws', 'azure', 'jenkins', 'linux'],
+    'Java Developer': ['java', 'spring', 'sql', 'mysql', 'microservices', 'kafka'],
+    'Mobile Developer': ['swift', 'kotlin', 'ios', 'android', 'flutter', 'firebase'],
+    'Accountant': ['bookkeeping', 'excel', 'gaap', 'auditing', 'tax', 'payroll'],
+    'Sales Manager': ['crm', 'salesforce', 'negotiation', 'forecasting', 'b2b', 'pipeline'],
+    'Nurse': ['patient care', 'triage', 'emr', 'medication administration', 'bls'],
+}
+SENIORITY = ['Junior', '', 'Senior', 'Lead', 'Staff']
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises']
+LOCATIONS = ['Remote', 'New York, NY', 'Berlin, Germany', 'London, UK', 'Austin, TX']
+FILLER = ('We are a fast growing team building products used by millions. You will collaborate '
+          'with stakeholders, own projects end to end and help shape our engineering culture.')
+
+
+def make_resume(role: str = 'Backend Engineer', seed: int = 0) -> Dict:
+    """Parsed-resume dict (ResumeParser output shape) for a role"""
+    rng = random.Random(seed)
+    skills = rng.sample(ROLES[role], k=min(5, len(ROLES[role])))
+    return {
+        'raw_text': '',
+        'sections': {},
+        'skills': sorted(skills),
+        'experience': [{
+            'title': role,
+            'company': rng.choice(COMPANIES),
+            'duration': 'Jan 2019 - Present',
+            'description': f"Built systems with {', '.join(skills[:3])}."
+        }],
+        'education': [{'degree': 'BSc Computer Science', 'institution': 'State University',
+                       'year': '2018', 'details': ''}],
+    }
+
+
+def make_resume_text(role: str = 'Backend Engineer', seed: int = 0) -> str:
+    """Plain-text resume for a role, suitable for ResumeParser.parse_text"""
+    data = make_resume(role, seed)
+    experience = data['experience'][0]
+    return "\n".join([
+        f"Candidate {seed}",
+        "Summary",
+        f"Experienced {role.lower()} with a record of shipping reliable products.",
+        "Skills",
+        ", ".join(data['skills']),
+        "Experience",
+        f"{experience['title']} at {experience['company']}",
+        experience['duration'],
+        experience['description'],
+        "Education",
+        "BSc Computer Science, State University 2018",
+    ])
+
+
+def make_jobs(count: int, seed: int = 0, with_details: bool = True) -> List[Dict]:
+    """
+    Job listings spread across all roles
+
+    Each listing carries a hidden `_role` field naming the role it was drawn
+    from, used as ground truth for relevance.
+    """
+    rng = random.Random(seed)
+    roles = list(ROLES)
+    jobs = []
+    for i in range(count):
+        role = rng.choice(roles)
+        skills = rng.sample(ROLES[role], k=min(4, len(ROLES[role])))
+        title = f"{rng.choice(SENIORITY)} {role}".strip()
+        job = {
+            'title': title,
+            'company': rng.choice(COMPANIES),
+            'location': rng.choice(LOCATIONS),
+            'link': f"https://jobs.example.com/view/{seed}-{i}",
+            'source': 'Synthetic',
+            '_role': role,
+        }
+        if with_details:
+            job['description'] = f"{FILLER} Day to day you will work with {', '.join(skills)}."
+            job['requirements'] = f"Experience with {skills[0]} and {skills[1]}."
+        jobs.append(job)
+    return jobs
+
+
+def make_pdf(pages: int, lines_per_page: int = 45, seed: int = 0) -> bytes:
+    """Minimal multi-page text PDF built by hand (no PDF writer dependency)"""
+    rng = random.Random(seed)
+    roles = list(ROLES)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in range(pages):
+        lines = []
+        for line in range(lines_per_page):
+            role = rng.choice(roles)
+            text = f"{role} at {rng.choice(COMPANIES)} using {', '.join(rng.sample(ROLES[role], k=3))}"
+            lines.append(f"({text}) Tj 0 -14 Td")
+        stream = ("BT /F1 10 Tf 50 780 Td " + " ".join(lines) + " ET").encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode('ascii')
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % pages
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
@@ -0,0 +1,56 @@
+"""In-process stand-in for the Anthropic client with configurable latency."""
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+JOB_ID_PATTERN = re.compile(r'^\[(\d+)\]$', re.MULTILINE)
+
+
+class FakeMessages:
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, model, max_tokens, messages, **kwargs):
+        client = self.client
+        prompt = messages[-1]['content']
+        if not isinstance(prompt, str):
+            prompt = "".join(block.get('text', '') for block in prompt)
+        started = time.perf_counter()
+        time.sleep(client.latency + client.per_job_latency * max(1, len(JOB_ID_PATTERN.findall(prompt))))
+
+        ids = [int(i) for i in JOB_ID_PATTERN.findall(prompt)]
+        if ids:
+            text = json.dumps([{'id': i, 'score': client.rng.randint(0, 100)} for i in ids])
+        elif 'job titles' in prompt:
+            text = "Software Engineer\nBackend Developer\nData Engineer"
+        elif 'Explain' in prompt:
+            text = "Strong overlap between the listed skills and the role requirements."
+        else:
+            text = str(client.rng.randint(0, 100))
+
+        with client.lock:
+            client.calls += 1
+            client.latencies.append(time.perf_counter() - started)
+        usage = SimpleNamespace(input_tokens=(len(prompt) + len(kwargs.get('system') or '')) // 4,
+                                output_tokens=len(text) // 4)
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=usage, model=model)
+
+
+class FakeAnthropic:
+    def __init__(self, latency: float = 0.5, per_job_latency: float = 0.01, seed: int = 0):
+        """
+        Args:
+            latency (float): Fixed seconds per call (network + queueing)
+            per_job_latency (float): Extra seconds per job in a batched prompt
+            seed (int): Seed for the generated scores
+        """
+        self.latency = latency
+        self.per_job_latency = per_job_latency
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.latencies = []
+        self.messages = FakeMessages(self)
@@ -0,0 +1,177 @@
+"""Local stub job board serving LinkedIn-style guest search and posting pages."""
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+CARD_TEMPLATE = """
+<li>
+  <div class="base-card relative w-full hover:no-underline focus:no-underline base-card--link base-search-card base-search-card--link job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}" data-impression-id="jobs-search-result-{index}" data-reference-id="ref{job_id}" data-tracking-id="track{job_id}" data-column="1" data-row="{row}">
+    <a class="base-card__full-link absolute top-0 right-0 bottom-0 left-0 p-0 z-[2]" href="{link}" data-tracking-control-name="public_jobs_jserp-result_search-card" data-tracking-will-navigate>
+      <span class="sr-only">
+          {title}
+      </span>
+    </a>
+    <div class="search-entity-media">
+      <img class="artdeco-entity-image artdeco-entity-image--square-4" data-delayed-url="https://media.example.com/logo/{job_id}.png" data-ghost-classes="artdeco-entity-image--ghost" data-ghost-url="https://static.example.com/ghost.svg" alt="{company}">
+    </div>
+    <div class="base-search-card__info">
+      <h3 class="base-search-card__title">
+          {title}
+      </h3>
+      <h4 class="base-search-card__subtitle">
+          <a class="hidden-nested-link" data-tracking-control-name="public_jobs_jserp-result_job-search-card-subtitle" data-tracking-will-navigate href="https://www.example.com/company/{company_slug}">
+          {company}
+          </a>
+      </h4>
+      <div class="base-search-card__metadata">
+          <span class="job-search-card__location">
+          {location}
+          </span>
+          <div class="job-posting-benefits text-sm">
+            <icon class="job-posting-benefits__icon" data-delayed-url="https://static.example.com/icon.svg" data-svg-class-name="job-posting-benefits__icon-svg"></icon>
+            <span class="job-posting-benefits__text">
+              Actively Hiring
+            </span>
+          </div>
+          <time class="job-search-card__listdate" datetime="2025-03-01">
+            2 weeks ago
+          </time>
+      </div>
+    </div>
+  </div>
+</li>
+"""
+
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries']
+LOCATIONS = ['Remote', 'New York, NY', 'Berlin, Germany', 'London, UK']
+
+
+DETAIL_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>{title}</title></head><body>
+<section class="description">
+  <div class="description__text description__text--rich">
+    <div class="show-more-less-html__markup">
+      <p>{company} is hiring. {filler}</p>
+      <p>You will design, build and run services used by our customers every day.</p>
+      <p><strong>Requirements</strong></p>
+      <ul><li>{years}+ years of professional experience</li><li>Experience with {skills}</li></ul>
+      <p><strong>Benefits</strong></p>
+      <ul><li>Flexible hours and a learning budget</li></ul>
+    </div>
+  </div>
+</section>
+</body></html>
+"""
+SKILLS = ['python', 'sql', 'docker', 'kubernetes', 'react', 'java', 'aws', 'terraform', 'excel', 'salesforce']
+FILLER = 'We are a fast growing team building products used by millions. ' * 4
+
+
+def render_detail(job_id: int) -> str:
+    """Render a deterministic posting page for a job id"""
+    return DETAIL_TEMPLATE.format(
+        title=f"Job {job_id}",
+        company=COMPANIES[job_id % len(COMPANIES)],
+        filler=FILLER,
+        years=job_id % 8 + 1,
+        skills=', '.join(SKILLS[(job_id + k) % len(SKILLS)] for k in range(3))
+    )
+
+
+def render_page(query: str, start: int, page_size: int = 10, total: int = 50, host: str = 'stub.local') -> str:
+    """Render a deterministic page of job cards for a query; links point at `host`"""
+    cards = []
+    for i in range(start, min(start + page_size, total)):
+        digest = int(hashlib.md5(f"{query}-{i}".encode()).hexdigest(), 16)
+        company = COMPANIES[digest % len(COMPANIES)]
+        cards.append(CARD_TEMPLATE.format(
+            job_id=digest % 10**9,
+            index=i,
+            row=i + 1,
+            title=f"{query.title()} {i}",
+            company=company,
+            company_slug=company.lower().replace(' ', '-'),
+            location=LOCATIONS[digest % len(LOCATIONS)],
+            link=f"http://{host}/jobs/view/{digest % 10**9}"
+        ))
+    return "".join(cards)
+
+
+class StubBoard:
+    def __init__(self, latency: float = 0.2, total_per_query: int = 50):
+        """
+        Threaded HTTP server answering search requests after a fixed latency
+
+        Args:
+            latency (float): Seconds to wait before each response
+            total_per_query (int): Number of listings available per query
+        """
+        self.latency = latency
+        self.total_per_query = total_per_query
+        self.requests = 0
+        self.detail_requests = 0
+        self.not_modified = 0
+        # Agents scraping the stub take their rate budget from here, not the machine-wide file
+        self.directory = tempfile.mkdtemp(prefix='stub-board-')
+        self.rate_limit_path = os.path.join(self.directory, 'rate_limits.sqlite')
+        board = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                board.requests += 1
+                time.sleep(board.latency)
+                path = urlparse(self.path)
+                if path.path.startswith('/jobs/view/'):
+                    board.detail_requests += 1
+                    body = render_detail(int(path.path.rsplit('/', 1)[-1])).encode()
+                else:
+                    params = parse_qs(path.query)
+                    query = params.get('keywords', [''])[0]
+                    start = int(params.get('start', ['0'])[0] or 0)
+                    # Posting links point back at this server, as seen by the client
+                    body = render_page(query, start, total=board.total_per_query,
+                                       host=self.headers.get('Host', 'stub.local')).encode()
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if self.headers.get('If-None-Match') == etag:
+                    board.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    body = gzip.compress(body)
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/jobs-guest/jobs/api/seeMoreJobPostings/search"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory, ignore_errors=True)
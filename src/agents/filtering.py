@@ -1,35 +1,256 @@
 from anthropic import Anthropic
 import os
+import re
+import json
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from scipy import sparse
 from dotenv import load_dotenv
-from typing import List, Dict
+from tenacity import Retrying, stop_after_attempt, wait_exponential
+from typing import Callable, List, Dict, Iterable, Iterator, Optional
+from utils.search_stats import SearchStats
+from utils.score_cache import ScoreCache, make_key, normalize_job, prompt_version, resume_digest
+from utils.single_flight import SingleFlight
+from utils.tracing import add_usage, span, submit_in_context
+from utils.prompt_builder import (
+    UsageMeter, compact_profile, estimate_tokens, resume_keywords, trim_to_budget
+)
+
+# The compact resume profile is rendered once per batch into the system prompt
+SCORE_SYSTEM_PROMPT = """Analyze how well job listings match the candidate's resume.
+
+Candidate:
+{profile}
+
+Calculate a percentage match score for every listing based on:
+1. Skills match
+2. Experience relevance
+3. Education requirements
+4. Overall role fit
+
+Return only a JSON array with one object per listing, for example:
+[{{"id": 0, "score": 75}}, {{"id": 1, "score": 40}}]"""
+
+BATCH_SCORE_PROMPT = """Job Listings:
+{jobs}"""
+
+BATCH_JOB_TEMPLATE = """[{id}]
+Title: {title}
+Description: {description}
+Requirements: {requirements}"""
+
+EXPLANATION_PROMPT = """Explain why this job matches the candidate's resume.
+
+Job Listing:
+Title: {title}
+Description: {description}
+Requirements: {requirements}
+
+Resume:
+{profile}
+
+Provide a brief explanation highlighting the key matching points."""
+
+EXPLANATION_FALLBACK = "Match based on general qualifications and requirements."
+
+# Bumped automatically whenever the scoring prompt changes
+SCORE_PROMPT_VERSION = prompt_version(SCORE_SYSTEM_PROMPT, BATCH_SCORE_PROMPT, BATCH_JOB_TEMPLATE)
+EXPLANATION_PROMPT_VERSION = prompt_version(EXPLANATION_PROMPT)
+
+# Keyed by score/explanation cache key and shared by every agent in the process,
+# so concurrent searches over the same listings and resume make one Claude call
+LLM_FLIGHTS = SingleFlight()
+
+class TfidfRanker:
+    """Cheap local relevance ranking of job listings against a parsed resume"""
+    
+    TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+    
+    def tokenize(self, text: str) -> List[str]:
+        return [token.rstrip('.') for token in self.TOKEN_PATTERN.findall(text.lower())]
+    
+    def job_text(self, job: Dict) -> str:
+        """Text of a listing used for ranking; the title counts twice"""
+        title = job.get('title', '')
+        return f"{title} {title} {job.get('description', '')} {job.get('requirements', '')}"
+    
+    def resume_text(self, resume_data: Dict) -> str:
+        """Text of a resume used as the ranking query; skills count twice"""
+        skills = " ".join(resume_data.get('skills', []))
+        experience = " ".join(
+            f"{exp.get('title', '')} {exp.get('description', '')}"
+            for exp in resume_data.get('experience', [])
+        )
+        education = " ".join(edu.get('degree', '') for edu in resume_data.get('education', []))
+        return f"{skills} {skills} {experience} {education}"
+    
+    def score(self, job_listings: List[Dict], resume_data: Dict) -> np.ndarray:
+        """
+        Cosine similarity between each listing and the resume in TF-IDF space
+        
+        Args:
+            job_listings (list): List of job listings
+            resume_data (dict): Parsed resume data
+            
+        Returns:
+            numpy.ndarray: Similarity in [0, 1] per listing
+        """
+        documents = [self.tokenize(self.job_text(job)) for job in job_listings]
+        documents.append(self.tokenize(self.resume_text(resume_data)))
+        
+        # Sparse term-count matrix, one row per document (the resume is last)
+        vocabulary = {}
+        rows, cols = [], []
+        for row, tokens in enumerate(documents):
+            for token in tokens:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(token, len(vocabulary)))
+        counts = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(documents), len(vocabulary))
+        )
+        counts.sum_duplicates()
+        
+        # Sublinear tf, smoothed idf, then L2-normalise the rows
+        counts.data = np.log1p(counts.data)
+        document_frequency = np.bincount(counts.indices, minlength=len(vocabulary))
+        idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+        weights = counts.multiply(idf.astype(np.float32)).tocsr()
+        norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        weights = sparse.diags(1 / norms) @ weights
+        
+        similarities = weights[:-1] @ weights[-1].T
+        return similarities.toarray().ravel()
+    
+    def top_k(self, job_listings: List[Dict], resume_data: Dict, k: int) -> List[Dict]:
+        """
+        Keep the k listings most similar to the resume, in their original order
+        
+        Args:
+            job_listings (list): List of job listings
+            resume_data (dict): Parsed resume data
+            k (int): Number of listings to keep
+            
+        Returns:
+            list: The selected job listings
+        """
+        if len(job_listings) <= k:
+            return job_listings
+        similarities = self.score(job_listings, resume_data)
+        keep = np.sort(np.argsort(-similarities, kind='stable')[:k])
+        return [job_listings[i] for i in keep]
+
+class ScoringCascade:
+    def __init__(self, cheap_model: str = "claude-3-haiku-20240307", reject_below: float = 15,
+                 accept_above: float = 70, escalate_above: float = 60, similarity_scale: float = 0.3,
+                 max_cheap_jobs: int = 200, max_expensive_jobs: int = 25):
+        """
+        Tiered scoring: a local heuristic first, a cheap model for borderline
+        listings and the agent's (expensive) model only for the top tier
+        
+        Every listing gets a heuristic score from its TF-IDF similarity to the
+        resume, scaled so that `similarity_scale` maps to 100. Listings below
+        `reject_below` keep that score and never reach Claude. Listings at or
+        above `accept_above` skip the cheap model. The rest are scored by
+        `cheap_model`, and those reaching `escalate_above` join the top tier.
+        The top tier is rescored by the expensive model, best first, until its
+        budget runs out; anything left over keeps its earlier score. Each
+        listing's `score_tier` records which tier set its `match_score`.
+        
+        Args:
+            cheap_model (str): Model for borderline listings
+            reject_below (float): Heuristic score below which listings are not sent to Claude
+            accept_above (float): Heuristic score from which listings go straight to the top tier
+            escalate_above (float): Cheap model score from which listings join the top tier
+            similarity_scale (float): TF-IDF similarity that counts as a heuristic score of 100
+            max_cheap_jobs (int): Listings the cheap model may score per search
+            max_expensive_jobs (int): Listings the expensive model may score per search
+        """
+        self.cheap_model = cheap_model
+        self.reject_below = reject_below
+        self.accept_above = accept_above
+        self.escalate_above = escalate_above
+        self.similarity_scale = similarity_scale
+        self.max_cheap_jobs = max_cheap_jobs
+        self.max_expensive_jobs = max_expensive_jobs
 
 class FilteringAgent:
-    def __init__(self):
+    def __init__(self, client=None, model: str = "claude-3-sonnet-20240229",
+                 batch_size: int = 10, max_workers: int = 4,
+                 max_attempts: int = 3, threshold: float = 50,
+                 cache: Optional[ScoreCache] = None, prefilter_top_k: Optional[int] = 50,
+                 description_budget: int = 200,
+                 cascade: Optional[ScoringCascade] = None,
+                 enricher: Optional[Callable[[List[Dict]], object]] = None,
+                 coalesce: bool = True):
+        """
+        Args:
+            client: Anthropic client; created from ANTHROPIC_API_KEY if omitted
+            model (str): Model used for scoring
+            batch_size (int): Number of jobs packed into one scoring prompt
+            max_workers (int): Number of scoring batches in flight at once
+            max_attempts (int): Attempts per batch before falling back to the default score
+            threshold (float): Minimum match score for a job to be kept
+            cache (ScoreCache): Score cache; a shared on-disk cache is used if omitted
+            prefilter_top_k (int): Only the k listings ranked highest by local TF-IDF
+                similarity are sent to Claude; None scores every listing
+            description_budget (int): Approximate tokens of each job description sent
+                to Claude; the sentences most relevant to the resume are kept
+            cascade (ScoringCascade): Tiered scoring configuration; None scores
+                every listing with `model`
+            enricher (callable): Called with the listings about to be sent to
+                Claude, after the local ranking, and the search's SearchStats
+                (or None) to fill in their details in place (e.g.
+                WebScraperAgent.enrich_jobs)
+            coalesce (bool): Wait for scores and explanations another agent in the
+                process is already requesting, instead of requesting them again
+        """
         load_dotenv()
-        self.anthropic = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        self.anthropic = client or Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        self.model = model
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.threshold = threshold
+        self.cache = cache if cache is not None else ScoreCache()
+        self.prefilter_top_k = prefilter_top_k
+        self.description_budget = description_budget
+        self.cascade = cascade
+        self.enricher = enricher
+        self.ranker = TfidfRanker()
+        self.usage = UsageMeter()
+        self.flights = LLM_FLIGHTS if coalesce else None
+        self.coalesced = {'scores': 0, 'explanations': 0}
+        self.coalesced_lock = threading.Lock()
     
-    def filter_jobs(self, job_listings: List[Dict], resume_data: Dict) -> List[Dict]:
+    def filter_jobs(self, job_listings: List[Dict], resume_data: Dict,
+                    stats: Optional[SearchStats] = None) -> List[Dict]:
         """
         Filter and rank job listings based on resume match
         
         Args:
             job_listings (list): List of job listings
             resume_data (dict): Parsed resume data
+            stats (SearchStats): Collects this search's Claude usage and shared scores
             
         Returns:
             list: Filtered and ranked job listings
         """
         filtered_jobs = []
         
+        # Drop listings with little overlap with the resume before paying for Claude
+        if self.prefilter_top_k is not None:
+            with span('filter.prefilter', listings=len(job_listings)):
+                job_listings = self.ranker.top_k(job_listings, resume_data, self.prefilter_top_k)
+        
+        self._score_search(job_listings, resume_data, self.new_budget(), stats)
+        
         for job in job_listings:
-            # Calculate match score using Claude
-            match_score = self._calculate_match_score(job, resume_data)
-            
-            # Add match score to job listing
-            job['match_score'] = match_score
-            
             # Only include jobs with match score above threshold
-            if match_score >= 50:  # 50% match threshold
+            if job['match_score'] >= self.threshold:
                 filtered_jobs.append(job)
         
         # Sort by match score
@@ -37,6 +258,295 @@ class FilteringAgent:
         
         return filtered_jobs
     
+    def filter_jobs_stream(self, job_batches: Iterable[List[Dict]], resume_data: Dict,
+                           stats: Optional[SearchStats] = None,
+                           budget: Optional[Dict[str, float]] = None) -> Iterator[List[Dict]]:
+        """
+        Score job listings as they arrive from the scraper
+        
+        Top-K pre-filtering cannot wait for the whole result set, so in
+        streaming mode it keeps a running cutoff instead: a listing is scored
+        only if its similarity to the resume is among the `prefilter_top_k`
+        best seen so far in the stream. Each batch is ranked on its own, so
+        the cutoff is approximate, and early batches pass more listings than
+        later ones. Callers that have every listing up front should apply
+        `ranker.top_k` first. Only matching listings are kept, so memory stays
+        bounded by the number of matches rather than the number of listings
+        scraped.
+        
+        Args:
+            job_batches (iterable): Batches of job listings, e.g. from WebScraperAgent.scrape_jobs_stream
+            resume_data (dict): Parsed resume data
+            stats (SearchStats): Collects this search's Claude usage and shared scores
+            budget (dict): Listings each cascade tier may still score, from
+                `new_budget()`, updated in place as batches are scored; pass the
+                remaining budget of an interrupted search to resume it
+            
+        Yields:
+            list: Listings from each batch that pass the threshold, unsorted
+        """
+        budget = budget if budget is not None else self.new_budget()
+        # Min-heap of the prefilter_top_k highest similarities seen so far
+        best = []
+        for batch in job_batches:
+            if self.prefilter_top_k is not None and batch:
+                with span('filter.prefilter', listings=len(batch)):
+                    similarities = self.ranker.score(batch, resume_data)
+                    kept = []
+                    for i in np.argsort(-similarities, kind='stable'):
+                        similarity = float(similarities[i])
+                        if similarity <= 0 or (len(best) >= self.prefilter_top_k and similarity <= best[0]):
+                            break
+                        if len(best) < self.prefilter_top_k:
+                            heapq.heappush(best, similarity)
+                        else:
+                            heapq.heapreplace(best, similarity)
+                        kept.append(i)
+                    batch = [batch[i] for i in sorted(kept)]
+            
+            self._score_search(batch, resume_data, budget, stats)
+            yield [job for job in batch if job['match_score'] >= self.threshold]
+    
+    def new_budget(self) -> Dict[str, float]:
+        """Listings each cascade tier may still score in one search"""
+        if self.cascade is None:
+            return {'cheap': 0, 'expensive': float('inf')}
+        return {'cheap': self.cascade.max_cheap_jobs, 'expensive': self.cascade.max_expensive_jobs}
+    
+    def _score_search(self, job_listings: List[Dict], resume_data: Dict, budget: Dict[str, float],
+                      stats: Optional[SearchStats] = None):
+        """
+        Set `match_score` on every listing, through the scoring cascade if one is configured
+        
+        Args:
+            job_listings (list): Job listings to score in place
+            resume_data (dict): Parsed resume data
+            budget (dict): Remaining listings per tier for this search, updated in place
+            stats (SearchStats): Collects this search's Claude usage and shared scores
+        """
+        if self.cascade is None:
+            self._enrich(job_listings, stats)
+            self._score_jobs(job_listings, resume_data, stats=stats)
+            return
+        if not job_listings:
+            return
+        
+        cascade = self.cascade
+        with span('filter.heuristic', listings=len(job_listings)):
+            similarities = self.ranker.score(job_listings, resume_data)
+        for job, similarity in zip(job_listings, similarities):
+            job['match_score'] = round(min(100.0, 100.0 * float(similarity) / cascade.similarity_scale), 1)
+            job['score_tier'] = 'heuristic'
+        
+        by_score = lambda job: -job['match_score']
+        top = [job for job in job_listings if job['match_score'] >= cascade.accept_above]
+        borderline = sorted(
+            (job for job in job_listings if cascade.reject_below <= job['match_score'] < cascade.accept_above),
+            key=by_score
+        )
+        
+        # Cheap model for the borderline band, best candidates first while the budget lasts
+        cheap = borderline[:max(0, int(budget['cheap']))]
+        budget['cheap'] -= len(cheap)
+        if cheap:
+            self._enrich(cheap, stats)
+            self._score_jobs(cheap, resume_data, cascade.cheap_model, stats)
+            for job in cheap:
+                job['score_tier'] = 'cheap'
+            top.extend(job for job in cheap if job['match_score'] >= cascade.escalate_above)
+        
+        # Expensive model only for the top tier
+        expensive = sorted(top, key=by_score)[:max(0, int(min(budget['expensive'], len(top))))]
+        budget['expensive'] -= len(expensive)
+        if expensive:
+            self._enrich(expensive, stats)
+            self._score_jobs(expensive, resume_data, self.model, stats)
+            for job in expensive:
+                job['score_tier'] = 'expensive'
+    
+    def _enrich(self, job_listings: List[Dict], stats: Optional[SearchStats] = None):
+        """Fetch details of listings that passed the local ranking, before they reach Claude"""
+        if self.enricher is not None and job_listings:
+            self.enricher(job_listings, stats)
+    
+    def _score_jobs(self, job_listings: List[Dict], resume_data: Dict, model: Optional[str] = None,
+                    stats: Optional[SearchStats] = None):
+        """
+        Set `match_score` on every listing, using the cache and concurrent batched Claude calls
+        
+        Args:
+            job_listings (list): Job listings to score in place
+            resume_data (dict): Parsed resume data
+            model (str): Model to score with; defaults to the agent's model
+            stats (SearchStats): Collects this search's Claude usage and shared scores
+        """
+        model = model or self.model
+        
+        # Serve previously scored (job, resume, model, prompt) pairs from the cache
+        with span('filter.cache_lookup', listings=len(job_listings)) as attrs:
+            digest = resume_digest(resume_data)
+            keys = [self._score_key(job, digest, model) for job in job_listings]
+            scores = [self.cache.get(key) for key in keys]
+            pending = [i for i, score in enumerate(scores) if score is None]
+            attrs['hits'] = len(job_listings) - len(pending)
+            
+            # Listings another search is already scoring with the same key are waited for, not rescored
+            following = []
+            if self.flights is not None:
+                leading = []
+                for i in pending:
+                    flight, leader = self.flights.begin(keys[i])
+                    if leader:
+                        leading.append(i)
+                    else:
+                        following.append((i, flight))
+                pending = leading
+                attrs['coalesced'] = len(following)
+        
+        try:
+            # Score the remaining jobs in concurrent batches, one Claude call per batch
+            batches = [
+                pending[i:i + self.batch_size]
+                for i in range(0, len(pending), self.batch_size)
+            ]
+            if batches:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                    futures = [
+                        submit_in_context(executor, self._score_batch, [job_listings[i] for i in batch], resume_data,
+                                          model, stats)
+                        for batch in batches
+                    ]
+                    batch_scores = [future.result() for future in futures]
+            else:
+                batch_scores = []
+            
+            for batch, results in zip(batches, batch_scores):
+                for i, score in zip(batch, results or [None] * len(batch)):
+                    if score is None:
+                        scores[i] = 50.0  # Default middle score on error
+                    else:
+                        scores[i] = score
+                        self.cache.set(keys[i], score)
+        finally:
+            # Searches waiting on the same listings get these scores, cached or not
+            if self.flights is not None:
+                for i in pending:
+                    self.flights.finish(keys[i], scores[i])
+        
+        for i, flight in following:
+            score = flight.wait()
+            scores[i] = 50.0 if score is None else score
+        if following:
+            with self.coalesced_lock:
+                self.coalesced['scores'] += len(following)
+            if stats is not None:
+                stats.add_coalesced('scores', len(following))
+        
+        for job, match_score in zip(job_listings, scores):
+            # Add match score to job listing
+            job['match_score'] = match_score
+    
+    def _score_key(self, job: Dict, digest: str, model: Optional[str] = None) -> str:
+        """Cache key for a job's score against a resume digest"""
+        return make_key('match_score', normalize_job(job), digest, model or self.model, SCORE_PROMPT_VERSION,
+                        self.description_budget)
+    
+    def _score_batch(self, jobs: List[Dict], resume_data: Dict, model: Optional[str] = None,
+                     stats: Optional[SearchStats] = None) -> Optional[List[float]]:
+        """
+        Score a batch of jobs with a single Claude call, retrying with backoff
+        
+        Args:
+            jobs (list): Job listings to score
+            resume_data (dict): Parsed resume data
+            model (str): Model to score with; defaults to the agent's model
+            stats (SearchStats): Search the call's usage is also recorded in
+            
+        Returns:
+            list: Match score per job in the same order as `jobs`, or None if every attempt failed
+        """
+        keywords = resume_keywords(resume_data)
+        prompt = BATCH_SCORE_PROMPT.format(
+            jobs="\n\n".join(
+                BATCH_JOB_TEMPLATE.format(
+                    id=i,
+                    title=job.get('title', ''),
+                    description=trim_to_budget(job.get('description', ''), keywords, self.description_budget),
+                    requirements=trim_to_budget(job.get('requirements', ''), keywords, self.description_budget // 2)
+                )
+                for i, job in enumerate(jobs)
+            )
+        )
+        model = model or self.model
+        system = SCORE_SYSTEM_PROMPT.format(profile=compact_profile(resume_data))
+        uncompacted = self._uncompacted_tokens(jobs, resume_data)
+        
+        try:
+            retrying = Retrying(
+                stop=stop_after_attempt(self.max_attempts),
+                wait=wait_exponential(multiplier=1, min=1, max=10),
+                reraise=True
+            )
+            for attempt in retrying:
+                with attempt, span(f'llm.score_batch.{model}', jobs=len(jobs)) as attrs:
+                    response = self.anthropic.messages.create(
+                        model=model,
+                        max_tokens=50 + 20 * len(jobs),
+                        system=system,
+                        messages=[
+                            {"role": "user", "content": prompt}
+                        ]
+                    )
+                    add_usage(attrs, response)
+                    self.usage.record(model, response, uncompacted)
+                    if stats is not None:
+                        stats.usage.record(model, response, uncompacted)
+                    return self._parse_batch_scores(response.content[0].text, len(jobs))
+            
+        except Exception as e:
+            print(f"Error calculating batch match scores: {str(e)}")
+            return None
+    
+    def _uncompacted_tokens(self, jobs: List[Dict], resume_data: Dict) -> int:
+        """Estimated prompt tokens with the raw resume and full descriptions, for savings accounting"""
+        resume = f"{resume_data.get('skills', [])} {resume_data.get('experience', [])} {resume_data.get('education', [])}"
+        listings = " ".join(
+            f"{job.get('title', '')} {job.get('description', '')} {job.get('requirements', '')}" for job in jobs
+        )
+        return estimate_tokens(SCORE_SYSTEM_PROMPT + resume + BATCH_SCORE_PROMPT + listings) + 15 * len(jobs)
+    
+    def usage_report(self, since: Optional[Dict] = None) -> List[Dict]:
+        """Tokens, cost and savings of the Claude calls made since the agent was created, per model"""
+        return self.usage.report(since)
+    
+    def _parse_batch_scores(self, text: str, count: int) -> List[float]:
+        """
+        Parse the JSON score list returned for a batch
+        
+        Args:
+            text (str): Raw model response
+            count (int): Number of jobs in the batch
+            
+        Returns:
+            list: Match score per job id
+            
+        Raises:
+            ValueError: If the response is not a complete score list
+        """
+        start, end = text.find('['), text.rfind(']')
+        if start == -1 or end < start:
+            raise ValueError(f"No JSON array in response: {text[:100]!r}")
+        
+        scores = {}
+        for item in json.loads(text[start:end + 1]):
+            scores[int(item['id'])] = min(max(float(item['score']), 0), 100)
+        
+        missing = [i for i in range(count) if i not in scores]
+        if missing:
+            raise ValueError(f"Missing scores for jobs {missing}")
+        
+        return [scores[i] for i in range(count)]
+    
     def _calculate_match_score(self, job: Dict, resume_data: Dict) -> float:
         """
         Calculate match score between job listing and resume using Claude
@@ -50,17 +560,16 @@ class FilteringAgent:
         """
         try:
             # Prepare prompt for Claude
+            keywords = resume_keywords(resume_data)
             prompt = f"""Analyze the match between this job listing and candidate's resume.
             
             Job Listing:
             Title: {job.get('title', '')}
-            Description: {job.get('description', '')}
-            Requirements: {job.get('requirements', '')}
+            Description: {trim_to_budget(job.get('description', ''), keywords, self.description_budget)}
+            Requirements: {trim_to_budget(job.get('requirements', ''), keywords, self.description_budget // 2)}
             
             Resume:
-            Skills: {resume_data.get('skills', [])}
-            Experience: {resume_data.get('experience', [])}
-            Education: {resume_data.get('education', [])}
+            {compact_profile(resume_data)}
             
             Calculate a percentage match score based on:
             1. Skills match
@@ -71,13 +580,16 @@ class FilteringAgent:
             Return only a number between 0 and 100."""
 
             # Get score from Claude
-            response = self.anthropic.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=50,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            with span(f'llm.score.{self.model}') as attrs:
+                response = self.anthropic.messages.create(
+                    model=self.model,
+                    max_tokens=50,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                )
+                add_usage(attrs, response)
+            self.usage.record(self.model, response, self._uncompacted_tokens([job], resume_data))
             
             # Extract score from response
             score = float(response.content[0].text.strip())
@@ -87,6 +599,46 @@ class FilteringAgent:
             print(f"Error calculating match score: {str(e)}")
             return 50.0  # Default middle score on error
     
+    def explain(self, job: Dict, resume_data: Dict) -> str:
+        """
+        Explanation of a single match, generated on demand and cached
+        
+        Explanations cost a full Claude call each, so they are only produced
+        for listings the user asks about rather than for every match.
+        
+        Args:
+            job (dict): Job listing
+            resume_data (dict): Parsed resume data
+            
+        Returns:
+            str: Explanation of the match
+        """
+        key = make_key('explanation', normalize_job(job), resume_digest(resume_data), self.model,
+                       EXPLANATION_PROMPT_VERSION, self.description_budget)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        if self.flights is None:
+            return self._explain(job, resume_data, key)
+        
+        # Another session asking about the same listing and resume shares this call
+        explanation, shared = self.flights.do(key, self._explain, job, resume_data, key)
+        if shared:
+            with self.coalesced_lock:
+                self.coalesced['explanations'] += 1
+        return explanation
+    
+    def _explain(self, job: Dict, resume_data: Dict, key: str) -> str:
+        explanation = self._generate_match_explanation(job, resume_data)
+        if explanation != EXPLANATION_FALLBACK:
+            self.cache.set(key, explanation)
+        return explanation
+    
+    def coalesced_report(self) -> Dict[str, int]:
+        """Scores and explanations this agent took from identical calls already in flight, since it was created"""
+        with self.coalesced_lock:
+            return dict(self.coalesced)
+    
     def _generate_match_explanation(self, job: Dict, resume_data: Dict) -> str:
         """
         Generate explanation for why a job matches the resume
@@ -100,31 +652,28 @@ class FilteringAgent:
         """
         try:
             # Prepare prompt for Claude
-            prompt = f"""Explain why this job matches the candidate's resume.
-            
-            Job Listing:
-            Title: {job.get('title', '')}
-            Description: {job.get('description', '')}
-            Requirements: {job.get('requirements', '')}
-            
-            Resume:
-            Skills: {resume_data.get('skills', [])}
-            Experience: {resume_data.get('experience', [])}
-            Education: {resume_data.get('education', [])}
-            
-            Provide a brief explanation highlighting the key matching points."""
+            keywords = resume_keywords(resume_data)
+            prompt = EXPLANATION_PROMPT.format(
+                title=job.get('title', ''),
+                description=trim_to_budget(job.get('description', ''), keywords, self.description_budget),
+                requirements=trim_to_budget(job.get('requirements', ''), keywords, self.description_budget // 2),
+                profile=compact_profile(resume_data)
+            )
 
             # Get explanation from Claude
-            response = self.anthropic.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=200,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            with span('llm.explanation') as attrs:
+                response = self.anthropic.messages.create(
+                    model=self.model,
+                    max_tokens=200,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                )
+                add_usage(attrs, response)
+            self.usage.record(self.model, response, self._uncompacted_tokens([job], resume_data))
             
             return response.content[0].text.strip()
             
         except Exception as e:
             print(f"Error generating match explanation: {str(e)}")
-            return "Match based on general qualifications and requirements."
\ No newline at end of file
+            return EXPLANATION_FALLBACK
\ No newline at end of file
@@ -0,0 +1,139 @@
+import os
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from utils.job_parsers import DETAIL_PARSER, get_parser, normalize_listing
+
+# Board name -> adapter class, filled in by @register_board
+BOARD_REGISTRY = {}
+
+
+def register_board(cls):
+    """Class decorator adding a JobBoard adapter to the registry"""
+    BOARD_REGISTRY[cls.name] = cls
+    return cls
+
+
+class JobBoard:
+    """
+    Adapter for one job board: how to build search page URLs, parse them and page through them
+
+    Subclasses set `name` and `default_endpoint` and implement `search_url`.
+    Posting pages are fetched from each listing's link and read by the shared
+    detail parser unless `fetch_details` is off.
+    """
+
+    name = ''
+    default_endpoint = ''
+    page_size = 10
+    # Seconds per request, and for all pages of one query on this board
+    request_timeout = 15
+    query_timeout = 60
+    enabled_by_default = True
+    fetch_details = True
+
+    def __init__(self):
+        self.parser = get_parser(self.name)
+
+    def is_available(self) -> bool:
+        """Whether the board can be queried at all (e.g. has its API key)"""
+        return True
+
+    def search_url(self, endpoint: str, query: str, start: int) -> str:
+        """URL of the results page starting at offset `start`"""
+        raise NotImplementedError
+
+    def parse(self, text: str) -> List[Dict]:
+        """Job listings on a results page, in the common listing schema"""
+        return [normalize_listing(job) for job in self.parser.parse(text)]
+
+    def detail_url(self, job: Dict) -> str:
+        """URL of a listing's full posting page"""
+        return job['link']
+
+    def parse_detail(self, text: str) -> Dict:
+        """Description and requirements from a posting page"""
+        return DETAIL_PARSER.parse(text)
+
+    def page_starts(self, max_results: int) -> List[int]:
+        """Offsets of the result pages to request, in order"""
+        return list(range(0, max_results, self.page_size))
+
+
+@register_board
+class LinkedInBoard(JobBoard):
+    name = 'linkedin'
+    default_endpoint = 'https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search'
+    page_size = 10
+
+    def search_url(self, endpoint: str, query: str, start: int) -> str:
+        # Format query for URL
+        formatted_query = query.replace(' ', '%20')
+        return f"{endpoint}?keywords={formatted_query}&location=&start={start}"
+
+
+@register_board
+class IndeedBoard(JobBoard):
+    name = 'indeed'
+    default_endpoint = 'https://api.indeed.com/ads/apisearch'
+    page_size = 25
+    request_timeout = 10
+
+    def __init__(self, api_key: Optional[str] = None):
+        super().__init__()
+        self.api_key = api_key or os.getenv('INDEED_API_KEY')
+
+    def is_available(self) -> bool:
+        # The publisher API refuses requests without a key
+        return bool(self.api_key) and self.api_key != 'your_indeed_api_key'
+
+    def search_url(self, endpoint: str, query: str, start: int) -> str:
+        params = {
+            'publisher': self.api_key,
+            'q': query,
+            'start': start,
+            'limit': self.page_size,
+            'format': 'json',
+            'v': 2
+        }
+        return f"{endpoint}?{urlencode(params)}"
+
+
+@register_board
+class GlassdoorBoard(JobBoard):
+    name = 'glassdoor'
+    default_endpoint = 'https://www.glassdoor.com/Job/jobs.htm'
+    page_size = 30
+    request_timeout = 10
+    # Glassdoor usually answers anonymous scrapers with 403; opt in explicitly
+    enabled_by_default = False
+
+    def search_url(self, endpoint: str, query: str, start: int) -> str:
+        params = {'sc.keyword': query}
+        page = start // self.page_size + 1
+        if page > 1:
+            params['p'] = page
+        return f"{endpoint}?{urlencode(params)}"
+
+
+def create_boards(names: Optional[List[str]] = None) -> Dict[str, JobBoard]:
+    """
+    Instantiate board adapters
+
+    Args:
+        names (list): Boards to enable; defaults to every registered board
+            that is enabled by default and available
+
+    Returns:
+        dict: Board name -> adapter
+    """
+    if names is None:
+        names = [name for name, cls in BOARD_REGISTRY.items() if cls.enabled_by_default]
+    boards = {}
+    for name in names:
+        if name not in BOARD_REGISTRY:
+            raise ValueError(f"Unknown job board '{name}'")
+        board = BOARD_REGISTRY[name]()
+        if board.is_available():
+            boards[name] = board
+    return boards
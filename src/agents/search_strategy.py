@@ -1,13 +1,43 @@
 from anthropic import Anthropic
 import os
 from dotenv import load_dotenv
+from utils.query_planner import QueryPlanner, rank_skills
+from utils.score_cache import ScoreCache, make_key, prompt_version
+from utils.tracing import add_usage, span
+
+JOB_TITLES_PROMPT = """Based on the following resume information, suggest relevant job titles to search for:
+
+            Experience:
+            {experience}
+
+            Skills:
+            {skills}
+
+            Please provide 3-5 relevant job titles that match this candidate's experience and skills.
+            Return only the job titles, one per line."""
+
+# Bumped automatically whenever the job title prompt changes
+JOB_TITLES_PROMPT_VERSION = prompt_version(JOB_TITLES_PROMPT)
 
 class SearchStrategyAgent:
-    def __init__(self):
+    def __init__(self, client=None, model="claude-3-sonnet-20240229", cache=None, planner=None, max_skills=3):
+        """
+        Args:
+            client: Anthropic client; created from ANTHROPIC_API_KEY if omitted
+            model (str): Model used for job title suggestions
+            cache (ScoreCache): LLM result cache; a shared on-disk cache is used if omitted
+            planner (QueryPlanner): Deduplicates, ranks and budgets the generated
+                queries; a planner without history is used if omitted
+            max_skills (int): Highest-weighted skills added to the skills variant of each query
+        """
         load_dotenv()
-        self.anthropic = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        self.anthropic = client or Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        self.model = model
+        self.cache = cache if cache is not None else ScoreCache()
+        self.planner = planner if planner is not None else QueryPlanner()
+        self.max_skills = max_skills
     
-    def generate_queries(self, resume_data, skills, job_titles, locations):
+    def generate_queries(self, resume_data, skills, job_titles, locations, stats=None):
         """
         Generate optimized search queries based on resume data and user inputs
         
@@ -16,12 +46,28 @@ class SearchStrategyAgent:
             skills (list): User-provided skills
             job_titles (list): User-provided job titles
             locations (list): User-provided locations
+            stats (SearchStats): Receives the planner's report in `stats.plan`
             
         Returns:
-            list: List of search queries optimized for different job platforms
+            list: List of search queries optimized for different job platforms,
+            deduplicated and cut to the planner's request budget, best first
+        """
+        with span('generate_queries') as attrs:
+            candidates = self._generate_queries(resume_data, skills, job_titles, locations)
+            queries = self.planner.plan(candidates, stats.plan if stats is not None else None)
+            attrs['candidates'] = len(candidates)
+            attrs['queries'] = len(queries)
+        return queries
+    
+    def _generate_queries(self, resume_data, skills, job_titles, locations):
+        """
+        Titles x locations cross product, then a top-skills variant of each
+        
+        Basic queries come first so a tight request budget still covers every
+        title and location before spending requests on the narrower variants.
         """
-        # Combine resume skills with user-provided skills
-        all_skills = set(resume_data.get('skills', []) + skills)
+        # Resume and user-provided skills, highest weight first
+        top_skills = rank_skills(resume_data, skills, limit=self.max_skills)
         
         # Generate base queries
         queries = []
@@ -38,10 +84,12 @@ class SearchStrategyAgent:
                 # Basic query
                 query = f"{title} {location}"
                 queries.append(query)
-                
-                # Add skills to create more specific queries
-                if all_skills:
-                    skills_str = " ".join(list(all_skills)[:3])  # Use top 3 skills
+        
+        # Add skills to create more specific queries
+        if top_skills:
+            skills_str = " ".join(top_skills)
+            for title in search_titles:
+                for location in search_locations:
                     specific_query = f"{title} {skills_str} {location}"
                     queries.append(specific_query)
         
@@ -51,29 +99,33 @@ class SearchStrategyAgent:
         """Extract relevant job titles from resume data using Claude"""
         try:
             # Prepare prompt for Claude
-            prompt = f"""Based on the following resume information, suggest relevant job titles to search for:
-
-            Experience:
-            {resume_data.get('experience', [])}
-
-            Skills:
-            {resume_data.get('skills', [])}
-
-            Please provide 3-5 relevant job titles that match this candidate's experience and skills.
-            Return only the job titles, one per line."""
+            prompt = JOB_TITLES_PROMPT.format(
+                experience=resume_data.get('experience', []),
+                skills=resume_data.get('skills', [])
+            )
+            
+            # Reuse suggestions for an identical prompt, model and template version
+            key = make_key('job_titles', prompt, self.model, JOB_TITLES_PROMPT_VERSION)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
 
             # Get suggestions from Claude
-            response = self.anthropic.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=150,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            with span('llm.job_titles') as attrs:
+                response = self.anthropic.messages.create(
+                    model=self.model,
+                    max_tokens=150,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                )
+                add_usage(attrs, response)
             
             # Process response
             suggested_titles = response.content[0].text.strip().split('\n')
-            return [title.strip() for title in suggested_titles if title.strip()]
+            titles = [title.strip() for title in suggested_titles if title.strip()]
+            self.cache.set(key, titles)
+            return titles
             
         except Exception as e:
             print(f"Error extracting job titles: {str(e)}")
@@ -1,21 +1,81 @@
-import requests
-from bs4 import BeautifulSoup
+import threading
 import time
-import random
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Iterator, Optional, Tuple
+from dotenv import load_dotenv
 from fake_useragent import UserAgent
 import logging
+from utils.rate_limiter import DEFAULT_RATE_LIMIT_PATH, shared_rate_limiter
+from utils.http_client import HttpClient
+from utils.response_cache import DEFAULT_RESPONSE_CACHE_DIR, ResponseCache
+from utils.circuit_breaker import CircuitBreaker
+from utils.dedup import NearDuplicateIndex
+from utils.search_stats import SearchStats
+from utils.tracing import span, submit_in_context
+from agents.job_boards import BOARD_REGISTRY, JobBoard, create_boards
 
 class WebScraperAgent:
-    def __init__(self):
+    def __init__(self, max_workers: int = 8, per_host_rate: float = 0.2,
+                 per_host_burst: float = 1, per_host_concurrency: int = 2,
+                 host_limits: Optional[Dict[str, Dict]] = None,
+                 max_results_per_query: int = 50,
+                 use_cache: bool = True, cache_dir: str = DEFAULT_RESPONSE_CACHE_DIR,
+                 cache_ttl: float = 3600, replay: bool = False,
+                 boards: Optional[List[str]] = None, detail_workers: int = 4,
+                 coalesce: bool = True, rate_limit_path: str = DEFAULT_RATE_LIMIT_PATH):
+        """
+        Args:
+            max_workers (int): Size of the thread pool fetching queries
+            per_host_rate (float): Requests per second allowed per host
+            per_host_burst (float): Requests a host may receive back to back
+            per_host_concurrency (int): Maximum in-flight requests per host
+            host_limits (dict): Per-host overrides of rate, burst and concurrency
+            max_results_per_query (int): Listings to page through per query and board
+            use_cache (bool): Keep fetched pages in an on-disk response cache
+            cache_dir (str): Directory of the response cache
+            cache_ttl (float): Seconds a cached page is served without revalidation
+            replay (bool): Serve pages only from the cache, without network access
+            boards (list): Job boards to search; defaults to every available board
+                that is enabled by default (see agents/job_boards.py)
+            detail_workers (int): Size of the thread pool fetching posting pages
+            coalesce (bool): Share in-flight requests for the same page with every
+                other agent in the process
+            rate_limit_path (str): SQLite file of the per-host rate budget, shared
+                by every agent and process that uses the same file
+        """
+        # Board API keys (e.g. INDEED_API_KEY) may come from .env
+        load_dotenv()
         self.ua = UserAgent()
         # Initialize logger
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
-        # Longer delay between requests to avoid rate limiting
-        self.min_delay = 5
-        self.max_delay = 10
+        # Queries run concurrently; each host keeps its own politeness budget
+        # (the default of one request per 5 s matches the old fixed delay),
+        # shared through SQLite by every agent in every process on the machine
+        self.max_workers = max_workers
+        self.rate_limiter = shared_rate_limiter(
+            rate=per_host_rate,
+            burst=per_host_burst,
+            concurrency=per_host_concurrency,
+            host_limits=host_limits,
+            path=rate_limit_path
+        )
+        
+        self.detail_workers = detail_workers
+        
+        # Pagination; a query stops early on an empty or all-duplicate page
+        self.max_results_per_query = max_results_per_query
+        
+        # One pooled keep-alive session shared by every query and page,
+        # backed by the on-disk response cache
+        self.http = HttpClient(
+            pool_maxsize=max(max_workers, per_host_concurrency) * 2,
+            cache=ResponseCache(cache_dir, ttl=cache_ttl) if use_cache or replay else None,
+            replay=replay,
+            rate_limiter=self.rate_limiter,
+            coalesce=coalesce
+        )
         
         # Add more realistic browser headers
         self.base_headers = {
@@ -33,11 +93,47 @@ class WebScraperAgent:
         }
         
         # Job search endpoints
-        self.search_endpoints = {
-            'linkedin': 'https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search',
-            'indeed': 'https://api.indeed.com/ads/apisearch',  # Would require API key
-            'glassdoor': 'https://www.glassdoor.com/Job/jobs.htm'
-        }
+        self.search_endpoints = {name: cls.default_endpoint for name, cls in BOARD_REGISTRY.items()}
+        
+        # Enabled board adapters, each behind its own circuit breaker
+        self.boards = create_boards(boards)
+        self.breakers = {name: CircuitBreaker() for name in self.boards}
+        self.boards_by_source = {board.parser.source: board for board in self.boards.values()}
+        self.stats_lock = threading.Lock()
+        self.board_stats = {name: self._empty_board_stats() for name in self.boards}
+    
+    def http_stats(self) -> Dict:
+        """Requests, 304s, bytes transferred and connection reuse rate of the shared session"""
+        return self.http.stats()
+    
+    def board_report(self) -> List[Dict]:
+        """
+        Per-board latency and yield since the agent was created
+        
+        Returns:
+            list: One row per board with requests, errors, listings, average
+            request latency, new listings per request and circuit state
+        """
+        report = []
+        with self.stats_lock:
+            for name, stats in self.board_stats.items():
+                requests_made = stats['requests']
+                report.append({
+                    'board': name,
+                    'requests': requests_made,
+                    'errors': stats['errors'],
+                    'skipped': stats['skipped'],
+                    'listings': stats['listings'],
+                    'new_listings': stats['new_listings'],
+                    'avg_latency_s': stats['latency'] / requests_made if requests_made else 0.0,
+                    'yield_per_request': stats['new_listings'] / requests_made if requests_made else 0.0,
+                    'circuit': self.breakers[name].state
+                })
+        return report
+    
+    def max_requests_per_query(self) -> int:
+        """Requests one query costs at most: its pages on every enabled board"""
+        return sum(len(board.page_starts(self.max_results_per_query)) for board in self.boards.values())
     
     def get_headers(self):
         """Generate headers with random user agent"""
@@ -45,86 +141,261 @@ class WebScraperAgent:
         headers['User-Agent'] = self.ua.random
         return headers
     
-    def scrape_jobs(self, search_queries: List[str]) -> List[Dict]:
+    def scrape_jobs(self, search_queries: List[str], stats: Optional[SearchStats] = None) -> List[Dict]:
         """
         Scrape job listings from multiple job boards based on search queries
         
         Args:
             search_queries (list): List of search queries to use
+            stats (SearchStats): Collects this search's per-query results,
+                dedup report and page fetches shared with concurrent searches
             
         Returns:
             list: List of job listings
         """
         all_jobs = []
         
-        for query in search_queries:
-            # Add delay between queries
-            delay = random.uniform(self.min_delay, self.max_delay)
-            time.sleep(delay)
+        if not search_queries:
+            return all_jobs
+        
+        dedup = NearDuplicateIndex()
+        tasks = [(query, board) for query in search_queries for board in self.boards.values()]
+        if not tasks:
+            return all_jobs
+        stats = stats if stats is not None else SearchStats()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+            futures = [submit_in_context(executor, self._scrape_query, query, board, dedup, stats)
+                       for query, board in tasks]
+            # Collect in query order so results are deterministic
+            for future in futures:
+                all_jobs.extend(future.result())
+        
+        # Duplicates were already collapsed as pages arrived
+        stats.dedup = dedup.report()
+        stats.alternate_links = dedup.alternate_links()
+        return all_jobs
+    
+    def scrape_jobs_stream(self, search_queries: List[str], known_listings: Optional[List[Dict]] = None,
+                           stats: Optional[SearchStats] = None) -> Iterator[List[Dict]]:
+        """
+        Scrape job listings, yielding each (query, board) pair's new listings as soon as it finishes
+        
+        Every query fans out to all enabled boards concurrently, so a slow
+        board only delays its own batches.
+        
+        Args:
+            search_queries (list): List of search queries to use
+            known_listings (list): Listings from earlier runs; they are not
+                yielded again and pages made up of them end pagination early
+            stats (SearchStats): Collects this search's per-query results,
+                dedup report and page fetches shared with concurrent searches
             
-            try:
-                # Start with LinkedIn as it's more scraping-friendly
-                jobs = self._scrape_linkedin(query)
-                all_jobs.extend(jobs)
-                
-                self.logger.info(f"Successfully scraped {len(jobs)} jobs for query: {query}")
-                
-            except Exception as e:
-                self.logger.error(f"Error scraping jobs for query '{query}': {str(e)}")
-                continue
+        Yields:
+            list: Listings from one query on one board that are neither exact nor
+            near duplicates of any earlier listing; the links of collapsed
+            duplicates are added to their canonical listing's `alternate_links`,
+            and since that can happen after the listing was yielded, the
+            search's `stats.alternate_links` holds them all once the stream ends
+        """
+        tasks = [(query, board) for query in search_queries for board in self.boards.values()]
+        if not tasks:
+            return
         
-        # Remove duplicates
-        return self._remove_duplicates(all_jobs)
+        stats = stats if stats is not None else SearchStats()
+        dedup = NearDuplicateIndex()
+        for job in known_listings or []:
+            dedup.add_known(job)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+            futures = [submit_in_context(executor, self._scrape_query, query, board, dedup, stats)
+                       for query, board in tasks]
+            for future in as_completed(futures):
+                stats.dedup = dedup.report()
+                stats.alternate_links = dedup.alternate_links()
+                yield future.result()
     
-    def _scrape_linkedin(self, query: str) -> List[Dict]:
-        """Scrape job listings from LinkedIn"""
-        jobs = []
-        start = 0
-        limit = 10  # Number of jobs per request
+    def enrich_jobs(self, jobs: List[Dict], stats: Optional[SearchStats] = None) -> List[Dict]:
+        """
+        Fill in `description` and `requirements` from each listing's posting page
+        
+        Posting pages are fetched concurrently on a bounded pool, through the
+        shared session, so they count against the same per-host rate limits
+        and response cache as search pages. Listings already enriched, or
+        from boards without posting pages, are skipped, which makes it cheap
+        to call this again for listings that move up a tier. Meant to run
+        only on listings that survived a cheap first-pass ranking (see
+        FilteringAgent's `enricher`).
+        
+        Args:
+            jobs (list): Job listings, updated in place
+            stats (SearchStats): Counts posting pages shared with concurrent searches
+            
+        Returns:
+            list: The same listings
+        """
+        pending = []
+        for job in jobs:
+            board = self.boards_by_source.get(job.get('source'))
+            if board is not None and board.fetch_details and job.get('link') and not job.get('details_fetched'):
+                pending.append((job, board))
+        if not pending:
+            return jobs
         
+        with span('scrape.details', listings=len(pending)) as attrs:
+            with ThreadPoolExecutor(max_workers=min(self.detail_workers, len(pending))) as executor:
+                futures = [submit_in_context(executor, self._fetch_details, job, board, stats)
+                           for job, board in pending]
+                attrs['fetched'] = sum(future.result() for future in futures)
+        return jobs
+    
+    def _fetch_details(self, job: Dict, board: JobBoard, stats: Optional[SearchStats] = None) -> bool:
+        """Fetch and merge one listing's posting page; False if it could not be fetched"""
+        url = board.detail_url(job)
         try:
-            # Format query for URL
-            formatted_query = query.replace(' ', '%20')
-            base_url = f"{self.search_endpoints['linkedin']}?keywords={formatted_query}&location=&start={start}"
+            response = self.http.get(url, headers=self.get_headers, timeout=board.request_timeout)
+        except Exception as e:
+            self.logger.error(f"Error fetching {board.name} posting {url}: {str(e)}")
+            return False
+        if stats is not None and response.source == 'coalesced':
+            stats.add_coalesced('pages')
+        if response.status_code != 200:
+            self.logger.warning(f"{board.name} returned {response.status_code} for posting {url}")
+            return False
+        
+        details = board.parse_detail(response.text)
+        # Keep whatever the results page had (e.g. Indeed snippets) if the posting is shorter
+        for field in ('description', 'requirements'):
+            if len(details.get(field, '')) > len(job.get(field, '')):
+                job[field] = details[field]
+        job['details_fetched'] = True
+        return True
+    
+    def _scrape_query(self, query: str, board: JobBoard, dedup: Optional[NearDuplicateIndex] = None,
+                      stats: Optional[SearchStats] = None) -> List[Dict]:
+        """Scrape a single query on one board, logging instead of raising on failure"""
+        try:
+            jobs = self._scrape_board(board, query, dedup, stats)
+            self.logger.info(f"Successfully scraped {len(jobs)} jobs from {board.name} for query: {query}")
+            return jobs
             
-            headers = self.get_headers()
-            response = requests.get(base_url, headers=headers, timeout=15)
+        except Exception as e:
+            self.logger.error(f"Error scraping {board.name} jobs for query '{query}': {str(e)}")
+            return []
+    
+    def _scrape_board(self, board: JobBoard, query: str, dedup: Optional[NearDuplicateIndex] = None,
+                      stats: Optional[SearchStats] = None) -> List[Dict]:
+        """
+        Scrape job listings from one board, paging until max_results_per_query
+        
+        Each page is parsed before the next one is requested, so a query never
+        spends a request (and its rate-limit wait) past its last useful page.
+        Paging stops at the first short page, the first page whose listings
+        are all duplicates of listings already in `dedup`, a failed request
+        or unparseable page, or once the board's per-query time budget is
+        spent. Listings from earlier pages are kept either way.
+        
+        Args:
+            board (JobBoard): Board adapter
+            query (str): Search query
+            dedup (NearDuplicateIndex): Running dedup index shared by every query of a search
+            stats (SearchStats): Search the query's results are recorded in
+            
+        Returns:
+            list: Listings from this query not already in `dedup`
+        """
+        jobs = []
+        listings = 0
+        requests_sent = 0
+        exhausted = False
+        dedup = dedup if dedup is not None else NearDuplicateIndex()
+        stats = stats if stats is not None else SearchStats()
+        deadline = time.monotonic() + board.query_timeout
+        
+        for i, start in enumerate(board.page_starts(self.max_results_per_query)):
+            if i and time.monotonic() >= deadline:
+                break
+            text, sent = self._fetch_page(board, query, start, stats)
+            requests_sent += sent
+            if text is None:
+                break
             
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Extract job cards
-                job_cards = soup.find_all('div', {'class': 'job-search-card'})
-                
-                for card in job_cards:
-                    try:
-                        job = {
-                            'title': card.find('h3', {'class': 'base-search-card__title'}).text.strip(),
-                            'company': card.find('h4', {'class': 'base-search-card__subtitle'}).text.strip(),
-                            'location': card.find('span', {'class': 'job-search-card__location'}).text.strip(),
-                            'link': card.find('a', {'class': 'base-card__full-link'})['href'],
-                            'source': 'LinkedIn'
-                        }
-                        
-                        jobs.append(job)
-                    except Exception as e:
-                        self.logger.warning(f"Error parsing job card: {str(e)}")
-                        continue
+            try:
+                with span('scrape.parse', bytes=len(text)):
+                    page = board.parse(text)
+            except Exception as e:
+                self._record(board.name, errors=1)
+                self.logger.error(f"Error parsing {board.name} page for query '{query}' at start={start}: {str(e)}")
+                break
+            listings += len(page)
+            with span('scrape.dedup', listings=len(page)):
+                new_jobs = dedup.claim(page)
+            jobs.extend(new_jobs)
+            self._record(board.name, listings=len(page), new_listings=len(new_jobs))
             
-        except Exception as e:
-            self.logger.error(f"Error scraping LinkedIn: {str(e)}")
+            # A short page means the board has no more results for this query
+            exhausted = len(page) < board.page_size
+            if exhausted or not new_jobs:
+                break
         
+        stats.record_query(query, requests=requests_sent, listings=listings, new_listings=len(jobs), exhausted=exhausted)
         return jobs
     
-    def _remove_duplicates(self, jobs: List[Dict]) -> List[Dict]:
-        """Remove duplicate job listings"""
-        seen = set()
-        unique_jobs = []
+    def _fetch_page(self, board: JobBoard, query: str, start: int,
+                    stats: Optional[SearchStats] = None) -> Tuple[Optional[str], bool]:
+        """
+        Fetch one results page through the board's circuit breaker
         
-        for job in jobs:
-            key = f"{job.get('title', '')}-{job.get('company', '')}-{job.get('location', '')}"
-            if key not in seen:
-                seen.add(key)
-                unique_jobs.append(job)
+        Returns:
+            tuple: Page body, or None if the circuit is open or the request
+            failed, and whether a request was actually sent to the board
+        """
+        breaker = self.breakers[board.name]
+        if not breaker.allow():
+            self._record(board.name, skipped=1)
+            return None, False
         
-        return unique_jobs
\ No newline at end of file
+        url = board.search_url(self.search_endpoints[board.name], query, start)
+        started = time.monotonic()
+        with span('scrape.fetch') as attrs:
+            try:
+                # Headers are built lazily: picking a random user agent is slow and cache hits skip it
+                response = self.http.get(url, headers=self.get_headers, timeout=board.request_timeout)
+            except Exception as e:
+                attrs['error'] = True
+                breaker.record_failure()
+                self._record(board.name, requests=1, errors=1, latency=time.monotonic() - started)
+                self.logger.error(f"Error fetching {board.name} page for query '{query}' at start={start}: {str(e)}")
+                return None, True
+            attrs['error'] = response.status_code != 200
+        
+        # Cached and coalesced pages cost this query no request to the board
+        sent = response.source in ('network', 'not_modified')
+        if stats is not None and response.source == 'coalesced':
+            stats.add_coalesced('pages')
+        if self.http.replay and response.source == 'cache' and response.status_code != 200:
+            # A replay-mode cache miss says nothing about the board's health
+            self._record(board.name, skipped=1)
+            self.logger.info(f"No cached {board.name} page for query '{query}' at start={start}")
+            return None, False
+        self._record(board.name, requests=1, latency=time.monotonic() - started)
+        if response.status_code != 200:
+            breaker.record_failure()
+            self._record(board.name, errors=1)
+            self.logger.warning(f"{board.name} returned {response.status_code} for query '{query}' at start={start}")
+            return None, sent
+        
+        breaker.record_success()
+        return response.text, sent
+    
+    def _empty_board_stats(self) -> Dict:
+        return {'requests': 0, 'errors': 0, 'skipped': 0, 'listings': 0, 'new_listings': 0, 'latency': 0.0}
+    
+    def _record(self, board_name: str, **counts):
+        """Add to a board's latency and yield counters"""
+        with self.stats_lock:
+            stats = self.board_stats[board_name]
+            for name, value in counts.items():
+                stats[name] += value
+    
+    def _remove_duplicates(self, jobs: List[Dict]) -> List[Dict]:
+        """Remove exact and near-duplicate job listings, keeping the first of each cluster"""
+        return NearDuplicateIndex().claim(jobs)
@@ -1,10 +1,133 @@
+import hashlib
+import io
+import os
+import time
 import streamlit as st
 import pandas as pd
 from utils.resume_parser import ResumeParser
 from utils.data_processor import DataProcessor
-from agents.search_strategy import SearchStrategyAgent
-from agents.web_scraper import WebScraperAgent
-from agents.filtering import FilteringAgent
+from job_service import FINISHED, JobService, make_agents
+from utils.result_store import ResultStore
+from utils.saved_search import SavedSearchStore
+from utils.search_stats import SearchStats
+from utils.tracing import span, trace_run
+
+# Streamlit reruns main() on every widget change, so anything expensive is
+# cached: agents, their HTTP pools and Anthropic clients live for the whole
+# process, and parsed resumes are keyed on a hash of their content.
+
+@st.cache_resource
+def get_resume_parser():
+    return ResumeParser()
+
+@st.cache_resource
+def get_agents():
+    """Search, scraper and filtering agents shared by every session"""
+    return make_agents()
+
+@st.cache_resource
+def get_job_service():
+    """Worker processes for background searches; JOB_SEARCH_WORKERS=0 when they run separately"""
+    return JobService(workers=int(os.getenv('JOB_SEARCH_WORKERS', '2'))).start()
+
+@st.cache_resource
+def get_saved_search_store():
+    return SavedSearchStore()
+
+@st.cache_data(show_spinner="Parsing resume...", max_entries=64)
+def parse_resume_file(digest, file_name, _data):
+    """Parse an uploaded resume; `digest` is the cache key, the bytes are not hashed again"""
+    file = io.BytesIO(_data)
+    file.name = file_name
+    return get_resume_parser().parse(file)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def parse_resume_text(text):
+    return get_resume_parser().parse_text(text)
+
+def build_exports(results):
+    """CSV, Parquet and Markdown exports of a result set; every export streams the store batch by batch"""
+    with span('export.csv', rows=len(results)):
+        csv_content = io.BytesIO()
+        results.write_csv(csv_content)
+    
+    with span('export.parquet', rows=len(results)):
+        parquet_content = io.BytesIO()
+        results.write_parquet(parquet_content)
+    
+    # Generate markdown
+    with span('export.markdown', rows=len(results)):
+        markdown_content = io.StringIO()
+        DataProcessor.write_markdown(results, markdown_content)
+    return {
+        'csv': csv_content.getvalue(),
+        'parquet': parquet_content.getvalue(),
+        'markdown': markdown_content.getvalue()
+    }
+
+def show_downloads(results):
+    """
+    Download buttons for a result set
+    
+    The exports are built the first time a result set is shown and kept in the
+    session, so the reruns that keep the results on screen (picking a match to
+    explain, say) do not build them again.
+    """
+    cached = st.session_state.get('exports')
+    if cached is None or cached[0] is not results:
+        cached = st.session_state['exports'] = (results, build_exports(results))
+    exports = cached[1]
+    st.download_button(
+        label="Download as CSV",
+        data=exports['csv'],
+        file_name="job_matches.csv",
+        mime="text/csv"
+    )
+    st.download_button(
+        label="Download as Parquet",
+        data=exports['parquet'],
+        file_name="job_matches.parquet",
+        mime="application/vnd.apache.parquet"
+    )
+    st.download_button(
+        label="Download as Markdown",
+        data=exports['markdown'],
+        file_name="job_matches.md",
+        mime="text/markdown"
+    )
+
+def show_search_job(job_id):
+    """
+    Show a background search, rerunning the page every second until it finishes
+    
+    Once it is done its matches become the session's results, like a search run in the page.
+    """
+    service = get_job_service()
+    job = service.status(job_id)
+    if job is None or job['status'] in FINISHED:
+        st.session_state.pop('search_job', None)
+        if job is None:
+            return
+        if job['status'] == 'done':
+            st.session_state['matches'] = service.results(job_id)
+            st.session_state['matches_resume'] = st.session_state.pop('search_job_resume', None)
+            st.session_state['explanations'] = {}
+        elif job['status'] == 'failed':
+            st.error(f"Background search failed: {job['error']}")
+        else:
+            st.warning("Background search cancelled")
+        return
+    
+    st.header("Job Matches")
+    st.progress(job['progress'], text=job['message'] or f"Search {job['status']}...")
+    if st.button("Cancel search"):
+        service.cancel(job_id)
+    # Matches checkpointed so far
+    partial = service.results(job_id)
+    if len(partial):
+        st.dataframe(partial.to_pandas())
+    time.sleep(1)
+    st.rerun()
 
 def main():
     st.title("Resume-Based Job Search")
@@ -31,15 +154,26 @@ def main():
         skills = st.text_input("Skills (comma-separated)")
         job_titles = st.text_input("Desired Job Titles (comma-separated)")
         locations = st.text_input("Preferred Locations (comma-separated)")
+        
+        st.header("Saved Search")
+        saved_search_name = st.text_input(
+            "Saved search name (optional)",
+            help="Re-running a saved search only scrapes and scores listings it has not seen before"
+        )
+        background = st.checkbox(
+            "Run search in the background",
+            help="The search keeps running in a worker process across reruns and page refreshes; "
+                 "saved searches always run in the page"
+        )
     
     # Main content area
     try:
         # Process resume based on input method
-        resume_parser = ResumeParser()
         if input_method == "Upload Resume" and resume_file is not None:
-            resume_data = resume_parser.parse(resume_file)
+            data = resume_file.getvalue()
+            resume_data = parse_resume_file(hashlib.sha256(data).hexdigest(), resume_file.name, data)
         elif input_method == "Manual Entry" and 'resume_text' in locals() and resume_text.strip():
-            resume_data = resume_parser.parse_text(resume_text)
+            resume_data = parse_resume_text(resume_text)
         else:
             st.info("Please provide your resume to start the job search.")
             return
@@ -48,51 +182,168 @@ def main():
         st.header("Parsed Resume Information")
         st.write(resume_data)
         
-        # Initialize agents
-        search_agent = SearchStrategyAgent()
-        scraper_agent = WebScraperAgent()
-        filter_agent = FilteringAgent()
+        # Shared agents, created on the first run only
+        search_agent, scraper_agent, filter_agent = get_agents()
+        
+        skill_list = skills.split(",") if skills else []
+        title_list = job_titles.split(",") if job_titles else []
+        location_list = locations.split(",") if locations else []
         
         # Process job search
-        if st.button("Search Jobs"):
-            with st.spinner("Searching for matching jobs..."):
+        searched = st.button("Search Jobs")
+        if searched and background and not saved_search_name.strip():
+            # Queued for a worker process; its progress is polled below
+            st.session_state['search_job'] = get_job_service().submit(
+                resume_data, skill_list, title_list, location_list
+            )
+            st.session_state['search_job_resume'] = resume_data
+            searched = False
+        if st.session_state.get('search_job'):
+            show_search_job(st.session_state['search_job'])
+        elif searched:
+            # The agents are shared by every session, so this search's own numbers are collected here
+            stats = SearchStats()
+            # Time every stage; JOB_SEARCH_PROFILE=cprofile|pyinstrument also profiles the run
+            with trace_run('search', profile=os.getenv('JOB_SEARCH_PROFILE') or None) as trace:
                 # Get search queries
                 search_queries = search_agent.generate_queries(
                     resume_data,
-                    skills.split(",") if skills else [],
-                    job_titles.split(",") if job_titles else [],
-                    locations.split(",") if locations else []
+                    skill_list,
+                    title_list,
+                    location_list,
+                    stats
                 )
                 
-                # Scrape job listings
-                job_listings = scraper_agent.scrape_jobs(search_queries)
+                st.header("Job Matches")
+                progress = st.progress(0.0, text="Searching for matching jobs...")
+                table = st.empty()
+                # Matches are frozen into a columnar store as they arrive
+                results = ResultStore()
+                scraped = {'queries': 0, 'listings': 0}
+                total_tasks = len(search_queries) * len(scraper_agent.boards)
                 
-                # Filter and rank jobs
-                filtered_jobs = filter_agent.filter_jobs(job_listings, resume_data)
+                def track_progress(job_batches):
+                    # One batch arrives per finished (query, board) pair
+                    for batch in job_batches:
+                        scraped['queries'] += 1
+                        scraped['listings'] += len(batch)
+                        yield batch
                 
-                # Convert to DataFrame
-                df = pd.DataFrame(filtered_jobs)
+                # Scrape and score as a stream so matches show up as they are found
+                if saved_search_name.strip():
+                    saved_searches = get_saved_search_store()
+                    match_stream = saved_searches.run(
+                        saved_search_name.strip(),
+                        scraper_agent,
+                        filter_agent,
+                        search_queries,
+                        resume_data,
+                        track=track_progress,
+                        stats=stats
+                    )
+                else:
+                    saved_searches = None
+                    job_stream = track_progress(scraper_agent.scrape_jobs_stream(search_queries, stats=stats))
+                    match_stream = filter_agent.filter_jobs_stream(job_stream, resume_data, stats)
+                for matches in match_stream:
+                    results.extend(matches)
+                    progress.progress(
+                        scraped['queries'] / max(1, total_tasks),
+                        text=f"Scraped {scraped['listings']} listings from {scraped['queries']}/"
+                             f"{total_tasks} board searches, {len(results)} matches so far"
+                    )
+                    if matches:
+                        table.dataframe(results.sort_by('match_score').to_pandas())
                 
-                # Display results
-                st.header("Job Matches")
-                st.dataframe(df)
+                progress.progress(1.0, text=f"Done: {len(results)} matches from {scraped['listings']} listings")
+                # Duplicates can turn up after their listing was already stored
+                results.merge_alternate_links(stats.alternate_links)
+                search_agent.planner.record(stats.query_report())
+                plan = stats.plan
+                st.caption(
+                    f"Query plan: {plan.get('planned', 0)} of {plan.get('candidates', 0)} candidate queries run "
+                    f"({plan.get('duplicates', 0)} duplicates, {plan.get('covered', 0)} covered by broader queries, "
+                    f"{plan.get('over_budget', 0)} over the request budget)"
+                )
+                if saved_searches:
+                    run = stats.saved_search
+                    st.caption(
+                        f"Saved search '{saved_search_name.strip()}': {run['known']} known listings, "
+                        f"{run['new']} new, {run['scored']} scored this run"
+                    )
+                
+                # Best matches first, for the table and every export
+                results = results.sort_by('match_score')
+                df = results.to_pandas()
+                table.dataframe(df)
+                st.session_state['matches'] = results
+                st.session_state['matches_resume'] = resume_data
+                st.session_state['explanations'] = {}
                 
-                # Download buttons
+                with st.expander("Job board report"):
+                    st.dataframe(pd.DataFrame(scraper_agent.board_report()))
+                    dedup = stats.dedup
+                    if dedup:
+                        st.caption(
+                            f"Deduplication: {dedup['listings']} listings, {dedup['exact_duplicates']} exact and "
+                            f"{dedup['near_duplicates']} near duplicates collapsed ({dedup['dedup_ratio']:.0%})"
+                        )
+                
+                show_downloads(results)
+            
+            with st.expander("Pipeline timings"):
+                st.dataframe(pd.DataFrame(trace.summary()))
+                coalesced = stats.coalesced_report()
+                if any(coalesced.values()):
+                    st.caption(
+                        f"Shared with concurrent searches: {coalesced['pages']} page fetches and "
+                        f"{coalesced['scores']} scores"
+                    )
+                usage = stats.usage.report()
+                if usage:
+                    tiers = df['score_tier'].dropna().value_counts() if len(df) else pd.Series(dtype=int)
+                    st.caption(
+                        f"Claude scoring usage: {sum(row['calls'] for row in usage)} LLM calls this search "
+                        f"(tokens and estimated cost per model; savings from prompt compaction)"
+                    )
+                    st.dataframe(pd.DataFrame(usage))
+                    if not tiers.empty:
+                        st.caption("Matches by scoring tier: " + ", ".join(f"{tier} {count}" for tier, count in tiers.items()))
                 st.download_button(
-                    label="Download as CSV",
-                    data=df.to_csv(index=False),
-                    file_name="job_matches.csv",
-                    mime="text/csv"
+                    label="Download timings as JSON",
+                    data=trace.to_json(),
+                    file_name="pipeline_timings.json",
+                    mime="application/json"
                 )
-                
-                # Generate markdown
-                markdown_content = DataProcessor.generate_markdown(filtered_jobs)
                 st.download_button(
-                    label="Download as Markdown",
-                    data=markdown_content,
-                    file_name="job_matches.md",
-                    mime="text/markdown"
+                    label="Download timings as Prometheus metrics",
+                    data=trace.to_prometheus(),
+                    file_name="pipeline_timings.prom",
+                    mime="text/plain"
                 )
+                if trace.profile:
+                    st.code(trace.profile)
+        
+        # Explanations cost a Claude call each, so they are only generated for matches the user picks
+        matches = st.session_state.get('matches')
+        if matches and st.session_state.get('matches_resume') == resume_data:
+            if not searched:
+                # Keep the last results on screen across reruns
+                st.header("Job Matches")
+                st.dataframe(matches.to_pandas())
+                show_downloads(matches)
+            st.header("Match Explanations")
+            explanations = st.session_state.setdefault('explanations', {})
+            labels = [
+                f"{job['title']} at {job['company']} ({job['match_score']:.0f}%)"
+                for job in matches.to_table().select(['title', 'company', 'match_score']).to_pylist()
+            ]
+            choice = st.selectbox("Job", range(len(matches)), format_func=lambda i: labels[i])
+            if st.button("Explain match") and choice not in explanations:
+                with st.spinner("Asking Claude..."):
+                    explanations[choice] = filter_agent.explain(matches.row(choice), resume_data)
+            if choice in explanations:
+                st.write(explanations[choice])
                     
     except Exception as e:
         st.error(f"An error occurred: {str(e)}")
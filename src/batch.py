@@ -0,0 +1,216 @@
+"""Rank a directory of resumes against one shared job corpus without the UI.
+
+Usage:
+    python src/batch.py resumes/ --output job_matches.parquet --locations "remote,berlin"
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+
+from agents.filtering import FilteringAgent
+from agents.search_strategy import SearchStrategyAgent
+from agents.web_scraper import WebScraperAgent
+from utils.query_planner import query_key
+from utils.result_store import ResultStore
+from utils.resume_parser import ResumeParser
+from utils.search_stats import SearchStats
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+
+def find_resumes(directory: str) -> List[str]:
+    """Resume files directly inside a directory, sorted by name"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(RESUME_EXTENSIONS) and os.path.isfile(os.path.join(directory, name))
+    )
+
+
+def parse_resume(path: str) -> Tuple[str, Optional[Dict], Optional[str]]:
+    """Parse one resume file; runs in a worker process"""
+    try:
+        with open(path, 'rb') as f:
+            # Already one process per resume, so large PDFs are not split further
+            return path, ResumeParser(workers=1).parse(f), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def split_list(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()] if value else []
+
+
+class CorpusEnricher:
+    def __init__(self, enricher: Callable, corpus: List[Dict]):
+        """
+        Enricher that fetches details into the shared corpus, not each resume's copy
+
+        Every resume scores its own copies of the corpus listings, so calling
+        the scraper's enricher on those copies would fetch a posting page
+        again for every resume that ranks the listing highly. This fills in
+        the corpus listing behind each copy instead (matched by link), which
+        the scraper's enricher skips once it is `details_fetched`, and copies
+        the fetched fields back.
+
+        Args:
+            enricher (callable): The filter agent's enricher, e.g. WebScraperAgent.enrich_jobs
+            corpus (list): Listings shared by every resume
+        """
+        self.enricher = enricher
+        self.by_link = {job['link']: job for job in corpus if job.get('link')}
+
+    def __call__(self, jobs: List[Dict], stats: Optional[SearchStats] = None) -> List[Dict]:
+        originals = [self.by_link.get(job.get('link')) for job in jobs]
+        self.enricher([original for original in originals if original is not None], stats)
+        for job, original in zip(jobs, originals):
+            if original is not None:
+                for field in ('description', 'requirements', 'details_fetched'):
+                    if field in original:
+                        job[field] = original[field]
+        return jobs
+
+
+def run_batch(paths: List[str], search_agent: SearchStrategyAgent, scraper_agent: WebScraperAgent,
+              filter_agent: FilteringAgent, skills: Optional[List[str]] = None,
+              job_titles: Optional[List[str]] = None, locations: Optional[List[str]] = None,
+              parse_workers: Optional[int] = None, score_workers: int = 2) -> Tuple[ResultStore, Dict]:
+    """
+    Parse every resume, scrape the union of their queries once and score each resume
+
+    Args:
+        paths (list): Resume files (PDF, DOCX or TXT)
+        search_agent (SearchStrategyAgent): Generates the queries of each resume
+        scraper_agent (WebScraperAgent): Scrapes the shared job corpus
+        filter_agent (FilteringAgent): Scores the corpus against each resume
+        skills (list): Extra skills applied to every resume
+        job_titles (list): Job titles applied to every resume
+        locations (list): Locations applied to every resume
+        parse_workers (int): Resume parsing processes (CPU count by default)
+        score_workers (int): Resumes scored concurrently
+
+    Returns:
+        tuple: Columnar store of every resume's matches (with a leading
+        `resume` column) and a report of counts, per-stage seconds and resumes per minute
+    """
+    started = time.perf_counter()
+    report = {'resumes': len(paths), 'parsed': 0, 'failed': 0}
+
+    # Parsing is CPU bound, so it runs in a process pool
+    resumes = {}
+    with ProcessPoolExecutor(max_workers=parse_workers) as executor:
+        for path, resume_data, error in executor.map(parse_resume, paths):
+            if error:
+                print(f"Error parsing {path}: {error}", file=sys.stderr)
+                report['failed'] += 1
+            else:
+                resumes[path] = resume_data
+    report['parsed'] = len(resumes)
+    report['parse_seconds'] = time.perf_counter() - started
+
+    # Scrape the union of all resumes' queries once
+    stage = time.perf_counter()
+    queries, seen = [], set()
+    for resume_data in resumes.values():
+        for query in search_agent.generate_queries(resume_data, list(skills or []),
+                                                   list(job_titles or []), list(locations or [])):
+            key = query_key(query)
+            if key not in seen:
+                seen.add(key)
+                queries.append(query)
+    report['queries'] = len(queries)
+    report['query_seconds'] = time.perf_counter() - stage
+
+    stage = time.perf_counter()
+    stats = SearchStats()
+    corpus = scraper_agent.scrape_jobs(queries, stats)
+    search_agent.planner.record(stats.query_report())
+    report['listings'] = len(corpus)
+    report['scrape_seconds'] = time.perf_counter() - stage
+
+    # Every resume is scored against its own copy of the shared corpus, but posting
+    # pages are fetched into the corpus itself, once for all resumes
+    stage = time.perf_counter()
+    enricher = filter_agent.enricher
+    if enricher is not None:
+        filter_agent.enricher = CorpusEnricher(enricher, corpus)
+
+    def score(item):
+        path, resume_data = item
+        matches = filter_agent.filter_jobs([dict(job) for job in corpus], resume_data)
+        for job in matches:
+            job['resume'] = os.path.basename(path)
+        return matches
+
+    # Matches are frozen into columns as each resume finishes, so the dicts do not pile up
+    results = ResultStore({'resume': pa.string()})
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, score_workers)) as executor:
+            for matches in executor.map(score, resumes.items()):
+                results.extend(matches)
+    finally:
+        filter_agent.enricher = enricher
+    report['matches'] = len(results)
+    report['score_seconds'] = time.perf_counter() - stage
+
+    report['total_seconds'] = time.perf_counter() - started
+    report['resumes_per_minute'] = report['parsed'] / report['total_seconds'] * 60 if report['total_seconds'] else 0.0
+
+    return results, report
+
+
+def write_results(results: ResultStore, output: str):
+    """Stream results to Parquet or CSV, chosen by the file extension"""
+    if output.lower().endswith('.parquet'):
+        # Nested fields such as alternate_links are kept as lists
+        results.write_parquet(output)
+    elif output.lower().endswith('.csv'):
+        results.write_csv(output)
+    else:
+        raise ValueError(f"Unsupported output format for '{output}': use .parquet or .csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('resume_dir', help='directory of PDF, DOCX or TXT resumes')
+    parser.add_argument('--output', default='job_matches.parquet', help='.parquet or .csv file')
+    parser.add_argument('--skills', help='extra skills for every resume (comma-separated)')
+    parser.add_argument('--titles', help='job titles for every resume (comma-separated)')
+    parser.add_argument('--locations', help='locations for every resume (comma-separated)')
+    parser.add_argument('--boards', help='job boards to search (comma-separated)')
+    parser.add_argument('--parse-workers', type=int, default=None, help='resume parsing processes')
+    parser.add_argument('--score-workers', type=int, default=2, help='resumes scored concurrently')
+    parser.add_argument('--replay', action='store_true', help='serve pages only from the response cache')
+    args = parser.parse_args()
+
+    paths = find_resumes(args.resume_dir)
+    if not paths:
+        parser.error(f"No resumes found in {args.resume_dir}")
+
+    scraper_agent = WebScraperAgent(boards=split_list(args.boards) or None, replay=args.replay)
+    results, report = run_batch(
+        paths,
+        SearchStrategyAgent(),
+        scraper_agent,
+        FilteringAgent(enricher=scraper_agent.enrich_jobs),
+        skills=split_list(args.skills),
+        job_titles=split_list(args.titles),
+        locations=split_list(args.locations),
+        parse_workers=args.parse_workers,
+        score_workers=args.score_workers
+    )
+    write_results(results, args.output)
+
+    print(f"{report['parsed']}/{report['resumes']} resumes parsed, {report['queries']} unique queries, "
+          f"{report['listings']} listings, {report['matches']} matches written to {args.output}")
+    print(f"parse {report['parse_seconds']:.1f}s, queries {report['query_seconds']:.1f}s, "
+          f"scrape {report['scrape_seconds']:.1f}s, score {report['score_seconds']:.1f}s, "
+          f"total {report['total_seconds']:.1f}s ({report['resumes_per_minute']:.1f} resumes/min)")
+
+
+if __name__ == '__main__':
+    main()
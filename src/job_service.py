@@ -0,0 +1,548 @@
+"""Background search jobs: a SQLite queue drained by worker processes.
+
+The Streamlit app submits searches here and polls their progress, so a
+rerun or browser refresh no longer throws the work away. Workers can also
+run on their own, next to any number of app instances:
+
+Usage:
+    python src/job_service.py --workers 2
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from agents.filtering import FilteringAgent, ScoringCascade
+from agents.search_strategy import SearchStrategyAgent
+from agents.web_scraper import WebScraperAgent
+from utils.query_planner import QueryHistory, QueryPlanner
+from utils.result_store import ResultStore
+from utils.search_stats import SearchStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_DB_PATH = os.path.join(
+    os.getenv('JOB_SEARCH_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'job-search')),
+    'search_jobs.sqlite'
+)
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class SearchCancelled(Exception):
+    """Raised inside a worker when the user cancelled the search it is running"""
+
+
+class JobLost(Exception):
+    """Raised inside a worker whose job was re-queued after missed heartbeats, so it is no longer its own"""
+
+
+class JobQueue:
+    def __init__(self, path: str = DEFAULT_JOB_DB_PATH, stale_after: float = 300, max_attempts: int = 3):
+        """
+        SQLite queue of search jobs and their stage checkpoints, shared by processes
+
+        Heartbeats, progress, checkpoints and the final status of a running job
+        are only written while the worker that claimed it still holds it. Once
+        the job was re-queued they change nothing and return False, so a
+        worker that was presumed dead cannot overwrite its successor's work.
+
+        Args:
+            path (str): SQLite database file
+            stale_after (float): Seconds without a heartbeat after which a running
+                job is considered abandoned (its worker died) and queued again
+            max_attempts (int): Times a job is started before an abandoned job is
+                marked failed instead of queued again
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        # Autocommit; claims take an explicit write lock with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(
+            'CREATE TABLE IF NOT EXISTS search_jobs ('
+            ' id TEXT PRIMARY KEY,'
+            ' params TEXT NOT NULL,'
+            ' status TEXT NOT NULL,'
+            ' stage TEXT,'
+            ' progress REAL NOT NULL DEFAULT 0,'
+            ' message TEXT,'
+            ' error TEXT,'
+            ' worker TEXT,'
+            ' attempts INTEGER NOT NULL DEFAULT 0,'
+            ' cancel_requested INTEGER NOT NULL DEFAULT 0,'
+            ' created_at REAL NOT NULL,'
+            ' started_at REAL,'
+            ' heartbeat REAL,'
+            ' finished_at REAL);'
+            'CREATE INDEX IF NOT EXISTS search_jobs_status ON search_jobs (status, created_at);'
+            'CREATE TABLE IF NOT EXISTS checkpoints ('
+            ' job_id TEXT NOT NULL,'
+            ' stage TEXT NOT NULL,'
+            ' data TEXT NOT NULL,'
+            ' saved_at REAL NOT NULL,'
+            ' PRIMARY KEY (job_id, stage));'
+            'CREATE TABLE IF NOT EXISTS checkpoint_parts ('
+            ' job_id TEXT NOT NULL,'
+            ' stage TEXT NOT NULL,'
+            ' part INTEGER NOT NULL,'
+            ' data TEXT NOT NULL,'
+            ' saved_at REAL NOT NULL,'
+            ' PRIMARY KEY (job_id, stage, part));'
+        )
+
+    def submit(self, params: Dict) -> str:
+        """Queue a search; `params` must be JSON-serialisable. Returns the job id"""
+        job_id = uuid.uuid4().hex
+        with self.lock:
+            self.conn.execute(
+                'INSERT INTO search_jobs (id, params, status, created_at) VALUES (?, ?, ?, ?)',
+                (job_id, json.dumps(params), QUEUED, time.time())
+            )
+        return job_id
+
+    def claim(self, worker: str) -> Optional[Dict]:
+        """
+        Take the oldest queued job, first re-queueing jobs whose worker stopped sending heartbeats
+
+        Returns:
+            dict: id, params, attempts and worker of the claimed job, or None if the queue is empty
+        """
+        now = time.time()
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                self.conn.execute(
+                    'UPDATE search_jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, '
+                    "error = CASE WHEN attempts >= ? THEN 'worker stopped responding' END, "
+                    'finished_at = CASE WHEN attempts >= ? THEN ? END '
+                    'WHERE status = ? AND heartbeat < ?',
+                    (self.max_attempts, FAILED, QUEUED, self.max_attempts, self.max_attempts, now,
+                     RUNNING, now - self.stale_after)
+                )
+                row = self.conn.execute(
+                    'SELECT id, params, attempts FROM search_jobs WHERE status = ? ORDER BY created_at LIMIT 1',
+                    (QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    self.conn.execute(
+                        'UPDATE search_jobs SET status = ?, worker = ?, attempts = attempts + 1, '
+                        'started_at = COALESCE(started_at, ?), heartbeat = ? WHERE id = ?',
+                        (RUNNING, worker, now, now, row[0])
+                    )
+                self.conn.execute('COMMIT')
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+        if row is None:
+            return None
+        return {'id': row[0], 'params': json.loads(row[1]), 'attempts': row[2] + 1, 'worker': worker}
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """Mark a running job as alive"""
+        with self.lock:
+            cursor = self.conn.execute(
+                'UPDATE search_jobs SET heartbeat = ? WHERE id = ? AND worker = ? AND status = ?',
+                (time.time(), job_id, worker, RUNNING)
+            )
+        return cursor.rowcount > 0
+
+    def progress(self, job_id: str, worker: str, stage: str, progress: float, message: str = '') -> bool:
+        """Record a running job's stage and progress (0-1); doubles as its heartbeat"""
+        with self.lock:
+            cursor = self.conn.execute(
+                'UPDATE search_jobs SET stage = ?, progress = ?, message = ?, heartbeat = ? '
+                'WHERE id = ? AND worker = ? AND status = ?',
+                (stage, progress, message, time.time(), job_id, worker, RUNNING)
+            )
+        return cursor.rowcount > 0
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with self.lock:
+            row = self.conn.execute('SELECT cancel_requested FROM search_jobs WHERE id = ?', (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def cancel(self, job_id: str):
+        """Cancel a queued job at once, or ask the worker running it to stop at its next checkpoint"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                'UPDATE search_jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?',
+                (CANCELLED, now, job_id, QUEUED)
+            )
+            self.conn.execute(
+                'UPDATE search_jobs SET cancel_requested = 1 WHERE id = ? AND status = ?', (job_id, RUNNING)
+            )
+
+    def finish(self, job_id: str, worker: str, status: str, error: Optional[str] = None) -> bool:
+        with self.lock:
+            cursor = self.conn.execute(
+                'UPDATE search_jobs SET status = ?, error = ?, finished_at = ?, '
+                'progress = CASE WHEN ? = ? THEN 1 ELSE progress END WHERE id = ? AND worker = ? AND status = ?',
+                (status, error, time.time(), status, DONE, job_id, worker, RUNNING)
+            )
+        return cursor.rowcount > 0
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """Status, stage, progress, message, error, attempts and timestamps of a job"""
+        with self.lock:
+            cursor = self.conn.execute(
+                'SELECT id, status, stage, progress, message, error, worker, attempts, created_at, started_at, '
+                'finished_at FROM search_jobs WHERE id = ?', (job_id,)
+            )
+            row = cursor.fetchone()
+            names = [column[0] for column in cursor.description]
+        return dict(zip(names, row)) if row else None
+
+    def save_checkpoint(self, job_id: str, worker: str, stage: str, data) -> bool:
+        with self.lock:
+            cursor = self.conn.execute(
+                'INSERT INTO checkpoints (job_id, stage, data, saved_at) SELECT ?, ?, ?, ? '
+                'WHERE EXISTS (SELECT 1 FROM search_jobs WHERE id = ? AND worker = ? AND status = ?) '
+                'ON CONFLICT(job_id, stage) DO UPDATE SET data = excluded.data, saved_at = excluded.saved_at',
+                (job_id, stage, json.dumps(data), time.time(), job_id, worker, RUNNING)
+            )
+        return cursor.rowcount > 0
+
+    def append_checkpoint(self, job_id: str, worker: str, stage: str, part, state) -> bool:
+        """
+        Add one part of a stage's output and replace the stage's state, in one transaction
+
+        Stages that produce their output piece by piece (scrape groups, scoring
+        chunks) save only the new piece, so a checkpoint costs the size of the
+        piece rather than of everything the stage produced so far.
+
+        Args:
+            job_id (str): Running job
+            worker (str): Worker that claimed it
+            stage (str): Stage name
+            part: JSON-serialisable output added since the last checkpoint
+            state: JSON-serialisable stage state, e.g. how far the stage got
+
+        Returns:
+            bool: False, with nothing saved, if the job is no longer the worker's
+        """
+        now = time.time()
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                owned = self.conn.execute(
+                    'SELECT 1 FROM search_jobs WHERE id = ? AND worker = ? AND status = ?', (job_id, worker, RUNNING)
+                ).fetchone() is not None
+                if owned:
+                    self.conn.execute(
+                        'INSERT INTO checkpoint_parts (job_id, stage, part, data, saved_at) '
+                        'SELECT ?, ?, COALESCE(MAX(part), -1) + 1, ?, ? FROM checkpoint_parts '
+                        'WHERE job_id = ? AND stage = ?',
+                        (job_id, stage, json.dumps(part), now, job_id, stage)
+                    )
+                    self.conn.execute(
+                        'INSERT INTO checkpoints (job_id, stage, data, saved_at) VALUES (?, ?, ?, ?) '
+                        'ON CONFLICT(job_id, stage) DO UPDATE SET data = excluded.data, saved_at = excluded.saved_at',
+                        (job_id, stage, json.dumps(state), now)
+                    )
+                self.conn.execute('COMMIT')
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+        return owned
+
+    def load_checkpoint(self, job_id: str, stage: str):
+        """Data last saved for a stage of a job (its state, for stages saved in parts), or None"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT data FROM checkpoints WHERE job_id = ? AND stage = ?', (job_id, stage)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_checkpoint_parts(self, job_id: str, stage: str) -> List:
+        """Parts appended for a stage of a job, oldest first"""
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT data FROM checkpoint_parts WHERE job_id = ? AND stage = ? ORDER BY part', (job_id, stage)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class Heartbeat:
+    def __init__(self, queue: JobQueue, job_id: str, worker: str, interval: float):
+        """
+        Background thread refreshing a running job's heartbeat every `interval` seconds
+
+        One scrape group or scoring chunk can take longer than the queue's
+        `stale_after`, so the heartbeat cannot wait for the next checkpoint.
+        The thread stops by itself once the job is no longer the worker's.
+        """
+        self.queue = queue
+        self.job_id = job_id
+        self.worker = worker
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f'heartbeat-{job_id}', daemon=True)
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.job_id, self.worker):
+                    return
+            except sqlite3.Error as e:
+                logger.warning(f"Heartbeat of search job {self.job_id} failed: {e}")
+
+    def __enter__(self) -> 'Heartbeat':
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+
+
+def make_agents():
+    """Search, scraper and filtering agents as the app configures them"""
+    scraper_agent = WebScraperAgent()
+    # Queries are ranked by the new listings they found in past searches, within a request budget
+    planner = QueryPlanner(QueryHistory(), requests_per_query=scraper_agent.max_requests_per_query())
+    # Posting pages are only fetched for listings that pass the local ranking
+    filter_agent = FilteringAgent(cascade=ScoringCascade(), enricher=scraper_agent.enrich_jobs)
+    return SearchStrategyAgent(planner=planner), scraper_agent, filter_agent
+
+
+def run_search(queue: JobQueue, job: Dict, search_agent: SearchStrategyAgent, scraper_agent: WebScraperAgent,
+               filter_agent: FilteringAgent, scrape_group: int = 4, score_chunk: int = 50):
+    """
+    Run one search job stage by stage, checkpointing as it goes
+
+    Queries are checkpointed once generated, listings after every group of
+    `scrape_group` queries and matches after every `score_chunk` listings
+    scored, so a job picked up again after its worker died resumes after the
+    last checkpoint. Listings and matches are appended one group or chunk at
+    a time, and the scoring checkpoint also keeps what is left of the
+    cascade budget, so a resumed search cannot spend it twice. Cancellation
+    is checked between those steps. Progress and checkpoints are only
+    written while the job is still this worker's.
+
+    Args:
+        queue (JobQueue): Queue the job was claimed from
+        job (dict): Claimed job (id, params and worker)
+        search_agent, scraper_agent, filter_agent: The worker's agents
+        scrape_group (int): Queries scraped concurrently between checkpoints
+        score_chunk (int): Listings scored between checkpoints
+
+    Raises:
+        SearchCancelled: If the job was cancelled
+        JobLost: If the job was re-queued and possibly claimed by another worker
+    """
+    job_id, worker, params = job['id'], job['worker'], job['params']
+    resume_data = params['resume_data']
+    # The worker's agents serve every search it runs, so this search's stats are kept apart
+    stats = SearchStats()
+
+    def step(stage, progress, message):
+        if queue.cancel_requested(job_id):
+            raise SearchCancelled(job_id)
+        if not queue.progress(job_id, worker, stage, progress, message):
+            raise JobLost(job_id)
+
+    def checkpoint(stage, data):
+        if not queue.save_checkpoint(job_id, worker, stage, data):
+            raise JobLost(job_id)
+
+    def checkpoint_part(stage, part, state):
+        if not queue.append_checkpoint(job_id, worker, stage, part, state):
+            raise JobLost(job_id)
+
+    step('queries', 0.0, "Generating search queries")
+    queries = queue.load_checkpoint(job_id, 'queries')
+    if queries is None:
+        queries = search_agent.generate_queries(
+            resume_data, params.get('skills', []), params.get('job_titles', []), params.get('locations', []), stats
+        )
+        checkpoint('queries', queries)
+
+    # Each group is deduplicated against everything scraped before it, including earlier attempts.
+    # A group's part holds its new listings and the alternate links earlier listings gained.
+    scraped = queue.load_checkpoint(job_id, 'scrape') or {'done': 0}
+    listings = []
+    parts = queue.load_checkpoint_parts(job_id, 'scrape')
+    for part in parts:
+        listings.extend(part['listings'])
+    by_link = {job['link']: job for job in listings if job.get('link')}
+    for part in parts:
+        for link, links in part['alternate_links'].items():
+            if link in by_link:
+                by_link[link]['alternate_links'] = links
+    for start in range(scraped['done'], len(queries), scrape_group):
+        step('scrape', 0.05 + 0.55 * start / len(queries),
+             f"Scraped {start}/{len(queries)} queries, {len(listings)} listings")
+        group = queries[start:start + scrape_group]
+        new_listings = []
+        for batch in scraper_agent.scrape_jobs_stream(group, known_listings=listings, stats=stats):
+            new_listings.extend(batch)
+        listings.extend(new_listings)
+        checkpoint_part('scrape', {'listings': new_listings, 'alternate_links': stats.alternate_links},
+                        {'done': start + len(group)})
+    search_agent.planner.record(stats.query_report())
+
+    # Every listing is known before scoring, so the exact top-K replaces the stream's running cutoff
+    if filter_agent.prefilter_top_k is not None:
+        listings = filter_agent.ranker.top_k(listings, resume_data, filter_agent.prefilter_top_k)
+
+    scored = queue.load_checkpoint(job_id, 'filter') or {'done': 0, 'budget': filter_agent.new_budget()}
+    done, budget = scored['done'], scored['budget']
+    matches = sum(len(part) for part in queue.load_checkpoint_parts(job_id, 'filter'))
+    step('filter', 0.6 + 0.4 * done / max(1, len(listings)), f"Scored {done}/{len(listings)} listings")
+    chunks = (listings[i:i + score_chunk] for i in range(done, len(listings), score_chunk))
+    for batch_matches in filter_agent.filter_jobs_stream(chunks, resume_data, stats, budget):
+        matches += len(batch_matches)
+        done = min(len(listings), done + score_chunk)
+        # The stream has already taken this chunk's listings out of the budget
+        checkpoint_part('filter', batch_matches, {'done': done, 'budget': budget})
+        step('filter', 0.6 + 0.4 * done / max(1, len(listings)),
+             f"Scored {done}/{len(listings)} listings, {matches} matches")
+
+
+def worker_loop(path: str, worker: str, stop, agent_factory: Callable = make_agents,
+                poll_interval: float = 0.5, stale_after: float = 300, scrape_group: int = 4,
+                score_chunk: int = 50):
+    """
+    Claim and run jobs until the shared `stop` flag is set; the agents are created once per worker
+
+    A heartbeat thread keeps the running job alive several times per `stale_after`.
+    """
+    queue = JobQueue(path, stale_after=stale_after)
+    agents = agent_factory()
+    try:
+        while not stop.value:
+            job = queue.claim(worker)
+            if job is None:
+                time.sleep(poll_interval)
+                continue
+            try:
+                with Heartbeat(queue, job['id'], worker, stale_after / 5):
+                    run_search(queue, job, *agents, scrape_group=scrape_group, score_chunk=score_chunk)
+                queue.finish(job['id'], worker, DONE)
+            except SearchCancelled:
+                queue.finish(job['id'], worker, CANCELLED)
+            except JobLost:
+                logger.warning(f"Search job {job['id']} was re-queued; leaving it to the worker that claims it")
+            except Exception as e:
+                logger.exception(f"Search job {job['id']} failed")
+                queue.finish(job['id'], worker, FAILED, str(e))
+    finally:
+        queue.close()
+
+
+class JobService:
+    def __init__(self, path: str = DEFAULT_JOB_DB_PATH, workers: int = 2, agent_factory: Callable = make_agents,
+                 poll_interval: float = 0.5, stale_after: float = 300, scrape_group: int = 4,
+                 score_chunk: int = 50):
+        """
+        Local search job service: worker processes draining a SQLite queue
+
+        Args:
+            path (str): SQLite database of jobs and checkpoints
+            workers (int): Worker processes to start; 0 only submits and polls,
+                for workers run separately with `python src/job_service.py`
+            agent_factory (callable): Picklable function returning the
+                (search, scraper, filter) agents of a worker
+            poll_interval (float): Seconds an idle worker waits between claims
+            stale_after (float): Seconds without a heartbeat before a running job is re-queued
+            scrape_group (int): Queries scraped between checkpoints
+            score_chunk (int): Listings scored between checkpoints
+        """
+        self.path = path
+        self.workers = workers
+        self.agent_factory = agent_factory
+        self.options = {'poll_interval': poll_interval, 'stale_after': stale_after,
+                        'scrape_group': scrape_group, 'score_chunk': score_chunk}
+        self.queue = JobQueue(path, stale_after=stale_after)
+        # Spawned rather than forked: the app process runs threads (Streamlit, HTTP pools)
+        self.context = multiprocessing.get_context('spawn')
+        # A plain shared flag: an Event's condition variable hangs set() once a waiting worker was killed
+        self.stopping = self.context.RawValue('b', 0)
+        self.processes = []
+
+    def start(self) -> 'JobService':
+        for i in range(self.workers):
+            process = self.context.Process(
+                target=worker_loop,
+                args=(self.path, f"{os.getpid()}-{i}", self.stopping, self.agent_factory),
+                kwargs=self.options,
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+        return self
+
+    def stop(self, timeout: float = 10):
+        """Ask workers to exit after their current job; terminate any still running after `timeout`"""
+        self.stopping.value = 1
+        deadline = time.monotonic() + timeout
+        for process in self.processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.processes = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def submit(self, resume_data: Dict, skills: List[str], job_titles: List[str], locations: List[str]) -> str:
+        """Queue a search and return its job id"""
+        return self.queue.submit({
+            'resume_data': resume_data,
+            'skills': skills,
+            'job_titles': job_titles,
+            'locations': locations
+        })
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        return self.queue.status(job_id)
+
+    def cancel(self, job_id: str):
+        self.queue.cancel(job_id)
+
+    def results(self, job_id: str) -> ResultStore:
+        """Matches found so far (all of them once the job is done), best first"""
+        results = ResultStore()
+        for matches in self.queue.load_checkpoint_parts(job_id, 'filter'):
+            results.extend(matches)
+        return results.sort_by('match_score')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2, help='worker processes')
+    parser.add_argument('--db', default=DEFAULT_JOB_DB_PATH, help='SQLite job database')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    service = JobService(args.db, workers=args.workers).start()
+    print(f"{args.workers} workers draining {args.db}; Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        service.stop()
+
+
+if __name__ == '__main__':
+    main()
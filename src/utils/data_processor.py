@@ -1,39 +1,74 @@
 class DataProcessor:
     @staticmethod
-    def generate_markdown(job_listings):
+    def iter_markdown(job_listings):
         """
-        Generate markdown format of job listings
+        Generate markdown for job listings one listing at a time
         
         Args:
-            job_listings (list): List of job listing dictionaries
+            job_listings (iterable): Job listing dictionaries, or a ResultStore
             
-        Returns:
-            str: Markdown formatted text
+        Yields:
+            str: The document header, then one markdown section per listing
         """
-        markdown = "# Job Matches\n\n"
+        yield "# Job Matches\n\n"
         
         for job in job_listings:
-            markdown += f"## {job.get('title', 'Unknown Position')}\n\n"
-            markdown += f"**Company:** {job.get('company', 'Unknown')}\n\n"
-            markdown += f"**Location:** {job.get('location', 'Unknown')}\n\n"
+            parts = [
+                f"## {job.get('title') or 'Unknown Position'}\n\n",
+                f"**Company:** {job.get('company') or 'Unknown'}\n\n",
+                f"**Location:** {job.get('location') or 'Unknown'}\n\n",
+            ]
             
             if job.get('match_score'):
-                markdown += f"**Match Score:** {job['match_score']}%\n\n"
+                parts.append(f"**Match Score:** {job['match_score']}%\n\n")
             
             if job.get('description'):
-                markdown += "### Description\n\n"
-                markdown += f"{job['description']}\n\n"
+                parts.append(f"### Description\n\n{job['description']}\n\n")
             
             if job.get('requirements'):
-                markdown += "### Requirements\n\n"
-                markdown += f"{job['requirements']}\n\n"
+                parts.append(f"### Requirements\n\n{job['requirements']}\n\n")
+            
+            link = job.get('link') or job.get('url')
+            if link:
+                parts.append(f"[Apply Here]({link})\n\n")
             
-            if job.get('url'):
-                markdown += f"[Apply Here]({job['url']})\n\n"
+            parts.append("---\n\n")
+            yield "".join(parts)
+    
+    @staticmethod
+    def generate_markdown(job_listings):
+        """
+        Generate markdown format of job listings
+        
+        Args:
+            job_listings (iterable): Job listing dictionaries, or a ResultStore
             
-            markdown += "---\n\n"
+        Returns:
+            str: Markdown formatted text
+        """
+        return "".join(DataProcessor.iter_markdown(job_listings))
+    
+    @staticmethod
+    def write_markdown(job_listings, file, chunk_size=500):
+        """
+        Stream markdown to a file, writing every `chunk_size` listings
+        
+        Args:
+            job_listings (iterable): Job listing dictionaries, or a ResultStore
+            file: Path or text file object
+            chunk_size (int): Listings buffered per write
+        """
+        if isinstance(file, str):
+            with open(file, 'w', encoding='utf-8') as f:
+                return DataProcessor.write_markdown(job_listings, f, chunk_size)
         
-        return markdown
+        chunk = []
+        for section in DataProcessor.iter_markdown(job_listings):
+            chunk.append(section)
+            if len(chunk) >= chunk_size:
+                file.write("".join(chunk))
+                chunk = []
+        file.write("".join(chunk))
     
     @staticmethod
     def format_csv_data(job_listings):
@@ -56,7 +91,7 @@ class DataProcessor:
                 'Match Score': job.get('match_score', ''),
                 'Description': job.get('description', ''),
                 'Requirements': job.get('requirements', ''),
-                'URL': job.get('url', '')
+                'URL': job.get('link') or job.get('url', '')
             }
             formatted_data.append(formatted_job)
         
@@ -0,0 +1,214 @@
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Abbreviations folded to one spelling before shingling
+ABBREVIATIONS = {
+    'sr': 'senior', 'snr': 'senior', 'jr': 'junior', 'jnr': 'junior',
+    'eng': 'engineer', 'engr': 'engineer', 'dev': 'developer', 'mgr': 'manager',
+    'swe': 'software engineer', 'nyc': 'new york', 'sf': 'san francisco',
+    'la': 'los angeles', 'ny': 'new york', 'uk': 'united kingdom',
+    'us': 'united states', 'usa': 'united states', 'wfh': 'remote',
+}
+# Tokens that say nothing about which posting this is
+STOP_TOKENS = {'the', 'a', 'an', 'and', 'of', 'm', 'f', 'd', 'w', 'hybrid', 'onsite', 'on', 'site',
+               'united', 'states', 'kingdom', 'area', 'metropolitan', 'greater'}
+# Postings at different levels are different jobs however similar the titles
+SENIORITY_TOKENS = {'intern', 'junior', 'associate', 'mid', 'senior', 'lead', 'staff', 'principal',
+                    'head', 'director', 'vp', 'chief', 'i', 'ii', 'iii', 'iv'}
+COMPANY_SUFFIXES = {'inc', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'gmbh', 'plc', 'sa', 'ag', 'bv'}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9+#]+')
+
+# Large Mersenne prime for the universal hash family
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_tokens(text: str, drop: set = STOP_TOKENS) -> List[str]:
+    """Lower-case, split on punctuation, expand abbreviations and drop noise tokens"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(str(text or '').lower()):
+        tokens.extend(ABBREVIATIONS.get(token, token).split())
+    return [token for token in tokens if token not in drop]
+
+
+def normalize_company(company: str) -> str:
+    return ' '.join(normalize_tokens(company, STOP_TOKENS | COMPANY_SUFFIXES))
+
+
+def job_key(job: Dict) -> str:
+    """Exact identity of a listing: its raw title, company and location"""
+    return f"{job.get('title', '')}-{job.get('company', '')}-{job.get('location', '')}"
+
+
+def blocking_key(job: Dict) -> tuple:
+    """Fields that must agree exactly for two listings to be duplicates: company and seniority"""
+    seniority = frozenset(token for token in normalize_tokens(job.get('title', '')) if token in SENIORITY_TOKENS)
+    return normalize_company(job.get('company', '')), seniority
+
+
+class NearDuplicateIndex:
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle_size: int = 3,
+                 threshold: float = 0.6, seed: int = 1):
+        """
+        Incremental MinHash + LSH index collapsing near-duplicate job listings
+
+        Each listing is reduced to character shingles of its normalized title
+        and location. Listings whose MinHash signatures collide in at least
+        one LSH band, share the same normalized company and seniority and have an
+        estimated Jaccard similarity of at least `threshold` are treated as
+        the same posting. The first listing seen becomes the canonical one and
+        collects the links of its duplicates in `alternate_links`. A duplicate
+        can arrive after its canonical listing was handed on (scored, stored
+        or saved), so `alternate_links()` reports every canonical link that
+        gained alternates for consumers to merge.
+
+        Args:
+            num_perm (int): MinHash signature length
+            bands (int): LSH bands; num_perm must be divisible by bands
+            shingle_size (int): Characters per shingle
+            threshold (float): Minimum estimated Jaccard similarity to merge
+            seed (int): Seed for the hash permutations
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        rng = np.random.default_rng(seed)
+        # a < 2^31 and 32-bit shingle hashes keep a * h + b below 2^64
+        self.a = rng.integers(1, 1 << 31, size=(num_perm, 1), dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 31, size=(num_perm, 1), dtype=np.uint64)
+
+        self.buckets = [defaultdict(list) for _ in range(bands)]
+        self.canonical = []
+        self.signatures = []
+        self.blocks = []
+        self.exact = {}
+        self.merged = set()
+        self.lock = threading.Lock()
+        self.counters = {'listings': 0, 'exact_duplicates': 0, 'near_duplicates': 0, 'seconds': 0.0}
+
+    def _text(self, job: Dict) -> str:
+        title = ' '.join(normalize_tokens(job.get('title', '')))
+        location = ' '.join(sorted(set(normalize_tokens(job.get('location', '')))))
+        return f"{title} | {location}"
+
+    def signature(self, job: Dict) -> np.ndarray:
+        """MinHash signature of a listing"""
+        text = self._text(job)
+        k = self.shingle_size
+        shingles = {text[i:i + k] for i in range(max(1, len(text) - k + 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((self.a * hashes + self.b) % MERSENNE_PRIME).min(axis=1)
+
+    def add(self, job: Dict, count: bool = True) -> Optional[Dict]:
+        """
+        Add a listing to the index
+
+        Args:
+            job (dict): Job listing
+            count (bool): Include the listing in the report counters
+
+        Returns:
+            dict: The canonical listing it duplicates (with its link recorded in
+            `alternate_links`), or None if the listing is new
+        """
+        started = time.perf_counter()
+        exact_key = job_key(job)
+        signature = self.signature(job)
+        block = blocking_key(job)
+        band_keys = [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+        with self.lock:
+            match = self.exact.get(exact_key)
+            if match is not None:
+                kind = 'exact_duplicates'
+            else:
+                match = self._find_similar(signature, block, band_keys)
+                kind = 'near_duplicates'
+            if count:
+                self.counters['listings'] += 1
+                if match is not None:
+                    self.counters[kind] += 1
+
+            if match is not None:
+                canonical = self.canonical[match]
+                link = job.get('link') or job.get('url')
+                if link and link != canonical.get('link') and link not in canonical['alternate_links']:
+                    canonical['alternate_links'].append(link)
+                    self.merged.add(match)
+                if count:
+                    self.counters['seconds'] += time.perf_counter() - started
+                return canonical
+
+            job.setdefault('alternate_links', [])
+            position = len(self.canonical)
+            self.canonical.append(job)
+            self.signatures.append(signature)
+            self.blocks.append(block)
+            self.exact[exact_key] = position
+            for band, key in enumerate(band_keys):
+                self.buckets[band][key].append(position)
+            if count:
+                self.counters['seconds'] += time.perf_counter() - started
+            return None
+
+    def _find_similar(self, signature: np.ndarray, block: tuple, band_keys: List[bytes]) -> Optional[int]:
+        candidates = set()
+        for band, key in enumerate(band_keys):
+            candidates.update(self.buckets[band].get(key, ()))
+
+        best, best_similarity = None, self.threshold
+        for position in sorted(candidates):
+            if self.blocks[position] != block:
+                continue
+            similarity = float(np.mean(self.signatures[position] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = position, similarity
+        return best
+
+    def add_known(self, job: Dict):
+        """
+        Register a listing from an earlier run as a duplicate target
+
+        Listings that are exact or near duplicates of it will be rejected,
+        but it is left out of the report counters.
+        """
+        self.add(job, count=False)
+
+    def claim(self, jobs: List[Dict]) -> List[Dict]:
+        """Add listings and return only the ones that are new"""
+        return [job for job in jobs if self.add(job) is None]
+
+    def alternate_links(self) -> Dict[str, List[str]]:
+        """Canonical link -> links of its collapsed duplicates, for canonical listings that have any"""
+        with self.lock:
+            return {
+                self.canonical[position]['link']: list(self.canonical[position]['alternate_links'])
+                for position in self.merged if self.canonical[position].get('link')
+            }
+
+    def report(self) -> Dict:
+        """Listings seen, duplicates collapsed, dedup ratio and time per 10k listings"""
+        with self.lock:
+            counters = dict(self.counters)
+        listings = counters['listings']
+        duplicates = counters['exact_duplicates'] + counters['near_duplicates']
+        return {
+            'listings': listings,
+            'unique': listings - duplicates,
+            'exact_duplicates': counters['exact_duplicates'],
+            'near_duplicates': counters['near_duplicates'],
+            'dedup_ratio': duplicates / listings if listings else 0.0,
+            'seconds_per_10k': counters['seconds'] / listings * 10_000 if listings else 0.0
+        }
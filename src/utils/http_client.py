@@ -0,0 +1,184 @@
+import threading
+from collections import OrderedDict, namedtuple
+from contextlib import ExitStack
+from typing import Callable, Dict, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from utils.rate_limiter import HostRateLimiter
+from utils.response_cache import ResponseCache, normalize_url
+from utils.single_flight import SingleFlight
+from utils.tracing import span
+
+# `source` is 'network' for a full response, 'not_modified' for a 304 served
+# from stored content, 'cache' for a response served without a request, or
+# 'coalesced' for a response shared from an identical request already in flight
+FetchResult = namedtuple('FetchResult', ['status_code', 'text', 'source'])
+
+# Shared by every client in the process, so concurrent sessions fetching the same page make one request
+PAGE_FLIGHTS = SingleFlight()
+
+
+class HttpClient:
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 20,
+                 max_retries: int = 2, backoff_factor: float = 0.5,
+                 max_validators: int = 2000, cache: Optional[ResponseCache] = None,
+                 replay: bool = False, rate_limiter: Optional[HostRateLimiter] = None,
+                 coalesce: bool = True):
+        """
+        Shared keep-alive HTTP session with conditional GETs and transfer statistics
+
+        Args:
+            pool_connections (int): Number of hosts to keep connection pools for
+            pool_maxsize (int): Connections kept alive per host
+            max_retries (int): Retries on connection errors and 429/5xx responses
+            backoff_factor (float): Exponential backoff factor between retries
+            max_validators (int): URLs whose ETag/Last-Modified and body are remembered
+            cache (ResponseCache): On-disk response cache; fresh entries skip the network
+            replay (bool): Serve only from `cache`, never touching the network; a
+                miss returns status 504 like an HTTP `only-if-cached` request
+            rate_limiter (HostRateLimiter): Per-host budget applied to network requests only
+            coalesce (bool): Share one network request between concurrent GETs of
+                the same normalized URL, across every client in the process
+        """
+        if replay and cache is None:
+            raise ValueError("Replay mode needs a response cache")
+        self.cache = cache
+        self.replay = replay
+        self.rate_limiter = rate_limiter
+        self.flights = PAGE_FLIGHTS if coalesce else None
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                   max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+
+        # Only advertise encodings urllib3 can actually decode (br/zstd need optional packages)
+        self.accept_encoding = ACCEPT_ENCODING
+
+        self.max_validators = max_validators
+        self.validators = OrderedDict()
+        self.lock = threading.Lock()
+        self.counters = {'requests': 0, 'not_modified': 0, 'cache_hits': 0, 'coalesced': 0,
+                         'bytes_received': 0, 'bytes_decoded': 0}
+
+    def get(self, url: str, headers: Union[Dict, Callable[[], Dict], None] = None,
+            timeout: float = 15) -> FetchResult:
+        """
+        GET a URL, revalidating against any stored ETag/Last-Modified
+
+        Args:
+            url (str): Fully built URL including the query string
+            headers (dict): Request headers, or a callable building them; it is
+                only called when the request actually goes to the network
+            timeout (float): Seconds before the request is abandoned
+
+        Returns:
+            FetchResult: Status, body text and whether it came from a 304
+        """
+        cached = self.cache.get(url) if self.cache else None
+        if cached and (cached['fresh'] or self.replay):
+            with self.lock:
+                self.counters['cache_hits'] += 1
+            return FetchResult(cached['status_code'], cached['text'], 'cache')
+        if self.replay:
+            return FetchResult(504, '', 'cache')
+        if self.flights is None:
+            return self._fetch(url, headers, timeout, cached)
+
+        result, shared = self.flights.do(normalize_url(url), self._fetch, url, headers, timeout, cached)
+        if shared:
+            with self.lock:
+                self.counters['coalesced'] += 1
+            return FetchResult(result.status_code, result.text, 'coalesced')
+        return result
+
+    def _fetch(self, url: str, headers, timeout: float, cached: Optional[Dict]) -> FetchResult:
+        """Network part of get(): a conditional GET through the rate limiter"""
+        headers = dict((headers() if callable(headers) else headers) or {})
+        headers['Accept-Encoding'] = self.accept_encoding
+        with self.lock:
+            stored = self.validators.get(url)
+        if stored is None and cached and (cached['etag'] or cached['last_modified']):
+            # Revalidate a stale cache entry instead of refetching it
+            stored = cached
+        if stored:
+            if stored.get('etag'):
+                headers['If-None-Match'] = stored['etag']
+            if stored.get('last_modified'):
+                headers['If-Modified-Since'] = stored['last_modified']
+            # A conditional request is pointless if the server is told to ignore caches
+            headers.pop('Cache-Control', None)
+
+        with ExitStack() as stack:
+            if self.rate_limiter:
+                with span('http.rate_limit_wait'):
+                    stack.enter_context(self.rate_limiter.limit(url))
+            with span('http.request') as attrs:
+                response = self.session.get(url, headers=headers, timeout=timeout)
+                content = response.content
+                wire_bytes = response.raw.tell() if response.raw is not None else len(content)
+                attrs['bytes'] = wire_bytes or len(content)
+
+        with self.lock:
+            self.counters['requests'] += 1
+            self.counters['bytes_received'] += wire_bytes or len(content)
+
+            not_modified = response.status_code == 304 and stored
+            if not_modified:
+                self.counters['not_modified'] += 1
+                if url in self.validators:
+                    self.validators.move_to_end(url)
+            else:
+                self.counters['bytes_decoded'] += len(content)
+
+        if not_modified:
+            if self.cache:
+                self.cache.touch(url)
+            return FetchResult(200, stored['text'], 'not_modified')
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code == 200 and (etag or last_modified):
+            with self.lock:
+                self.validators[url] = {'etag': etag, 'last_modified': last_modified, 'text': response.text}
+                self.validators.move_to_end(url)
+                while len(self.validators) > self.max_validators:
+                    self.validators.popitem(last=False)
+
+        if self.cache and response.status_code == 200:
+            self.cache.set(url, response.status_code, response.text, etag, last_modified)
+
+        return FetchResult(response.status_code, response.text, 'network')
+
+    def stats(self) -> Dict:
+        """Request, 304, cache hit, coalesced, byte and connection reuse counters"""
+        connections = 0
+        pool_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+                pool_requests += pool.num_requests
+
+        with self.lock:
+            stats = dict(self.counters)
+        stats['connections_opened'] = connections
+        stats['connection_reuse_rate'] = 1 - connections / pool_requests if pool_requests else 0.0
+        return stats
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,275 @@
+import json
+import logging
+import re
+from typing import Dict, List
+from urllib.parse import urljoin
+
+from lxml import etree
+from lxml import html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+# Fields every listing carries once it leaves a board adapter
+LISTING_FIELDS = ('title', 'company', 'location', 'link', 'description', 'requirements', 'source')
+
+
+def normalize_listing(job: Dict) -> Dict:
+    """
+    Bring a parsed listing to the common schema
+
+    Every field in LISTING_FIELDS is present as a stripped string, and a
+    `url` key from older parsers or callers is moved to `link`. Other keys
+    are kept as they are.
+    """
+    if 'url' in job and not job.get('link'):
+        job['link'] = job.pop('url')
+    for field in LISTING_FIELDS:
+        value = job.get(field)
+        job[field] = value.strip() if isinstance(value, str) else ('' if value is None else str(value))
+    return job
+
+
+def has_class(class_name: str) -> str:
+    """XPath predicate matching elements whose class list contains `class_name`"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+class LinkedInCardParser:
+    """Parse LinkedIn guest search result pages with lxml in a single pass per card"""
+
+    source = 'LinkedIn'
+
+    # Compiled once; matching by class token like BeautifulSoup's class_ lookup
+    CARDS = etree.XPath(f"//div[{has_class('job-search-card')}]")
+
+    # (tag, class) -> field
+    FIELDS = {
+        ('h3', 'base-search-card__title'): 'title',
+        ('h4', 'base-search-card__subtitle'): 'company',
+        ('span', 'job-search-card__location'): 'location',
+        ('a', 'base-card__full-link'): 'link',
+    }
+    TAGS = tuple({tag for tag, _ in FIELDS})
+
+    def parse(self, html: str) -> List[Dict]:
+        """
+        Extract job cards from a search results page
+
+        Args:
+            html (str): Page or fragment HTML
+
+        Returns:
+            list: Job listings with title, company, location, link and source
+        """
+        if not html or not html.strip():
+            return []
+
+        jobs = []
+        root = lxml_html.document_fromstring(html)
+        for card in self.CARDS(root):
+            job = {}
+            # Walk the card's subtree once, picking out every field as we pass it
+            for element in card.iter(*self.TAGS):
+                classes = element.get('class')
+                if not classes:
+                    continue
+                for class_name in classes.split():
+                    field = self.FIELDS.get((element.tag, class_name))
+                    if field and field not in job:
+                        if field == 'link':
+                            job[field] = element.get('href')
+                        else:
+                            job[field] = element.text_content().strip()
+                        break
+
+            if len(job) < len(self.FIELDS) or not job['link']:
+                logger.warning(f"Error parsing job card: missing {sorted(set(self.FIELDS.values()) - set(job))}")
+                continue
+
+            job['source'] = self.source
+            jobs.append(job)
+
+        return jobs
+
+
+class GlassdoorCardParser:
+    """Parse Glassdoor job search result pages by their data-test attributes"""
+
+    source = 'Glassdoor'
+    base_url = 'https://www.glassdoor.com'
+
+    CARDS = etree.XPath("//li[@data-test='jobListing']")
+    TITLE = etree.XPath("string(.//a[@data-test='job-title'])")
+    LINK = etree.XPath("string(.//a[@data-test='job-title']/@href)")
+    COMPANY = etree.XPath(f"string(.//*[@data-test='emp-name' or {has_class('EmployerProfile_compactEmployerName')}])")
+    LOCATION = etree.XPath("string(.//*[@data-test='emp-location'])")
+
+    def parse(self, html: str) -> List[Dict]:
+        """
+        Extract job cards from a search results page
+
+        Args:
+            html (str): Page HTML
+
+        Returns:
+            list: Job listings with title, company, location, link and source
+        """
+        if not html or not html.strip():
+            return []
+
+        jobs = []
+        root = lxml_html.document_fromstring(html)
+        for card in self.CARDS(root):
+            job = {
+                'title': self.TITLE(card).strip(),
+                'company': self.COMPANY(card).strip(),
+                'location': self.LOCATION(card).strip(),
+                'link': urljoin(self.base_url, self.LINK(card).strip()),
+                'source': self.source
+            }
+            if not job['title'] or not self.LINK(card):
+                logger.warning("Error parsing job card: missing title or link")
+                continue
+            jobs.append(job)
+
+        return jobs
+
+
+class IndeedApiParser:
+    """Parse JSON responses of the Indeed publisher search API"""
+
+    source = 'Indeed'
+
+    def parse(self, text: str) -> List[Dict]:
+        """
+        Extract results from an API response
+
+        Args:
+            text (str): JSON response body
+
+        Returns:
+            list: Job listings with title, company, location, link, description and source
+        """
+        if not text or not text.strip():
+            return []
+
+        jobs = []
+        for result in json.loads(text).get('results', []):
+            if not result.get('jobtitle') or not result.get('url'):
+                continue
+            # lxml rejects empty and whitespace-only documents
+            snippet = (result.get('snippet') or '').strip()
+            jobs.append({
+                'title': result['jobtitle'].strip(),
+                'company': (result.get('company') or '').strip(),
+                'location': (result.get('formattedLocation') or '').strip(),
+                'link': result['url'],
+                'description': lxml_html.fromstring(snippet).text_content().strip() if snippet else '',
+                'source': self.source
+            })
+
+        return jobs
+
+
+class PostingDetailParser:
+    """Pull the description and requirements out of a single job posting page"""
+
+    # schema.org JobPosting data, which most boards embed for search engines
+    JSON_LD = etree.XPath("//script[@type='application/ld+json']/text()")
+    # Description containers of LinkedIn guest postings, Glassdoor and Indeed
+    DESCRIPTION = etree.XPath(
+        f"//*[{has_class('show-more-less-html__markup')} or {has_class('description__text')}"
+        " or @data-test='jobDescriptionContent' or @id='jobDescriptionText']"
+    )
+    BLOCK_TAGS = {'p', 'div', 'li', 'br', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr'}
+    REQUIREMENTS_HEADING = re.compile(
+        r"^\W*(requirements|qualifications|minimum qualifications|what you(?:'ll)? (?:need|bring)"
+        r"|what we(?:'re| are) looking for|must[- ]haves?|skills(?: and experience)?)\b[^\n]{0,40}$",
+        re.IGNORECASE | re.MULTILINE
+    )
+    # Sections after the requirements that are not requirements
+    TRAILING_HEADING = re.compile(
+        r"^\W*(benefits|perks|what we offer|about us|about the company|compensation|salary)\b[^\n]{0,40}$",
+        re.IGNORECASE | re.MULTILINE
+    )
+
+    def element_text(self, element) -> str:
+        """Text of an element with one line per block element"""
+        parts = []
+        for node in element.iter():
+            if node.tag in self.BLOCK_TAGS:
+                parts.append('\n')
+            if node.text:
+                parts.append(node.text)
+            if node is not element and node.tail:
+                parts.append(node.tail)
+        lines = (re.sub(r'\s+', ' ', line).strip() for line in ''.join(parts).split('\n'))
+        return '\n'.join(line for line in lines if line)
+
+    def posting_description(self, root) -> str:
+        for script in self.JSON_LD(root):
+            try:
+                data = json.loads(script)
+            except ValueError:
+                continue
+            for item in data if isinstance(data, list) else [data]:
+                if isinstance(item, dict) and item.get('@type') == 'JobPosting' and item.get('description'):
+                    return self.element_text(lxml_html.fragment_fromstring(item['description'], create_parent='div'))
+        for element in self.DESCRIPTION(root):
+            text = self.element_text(element)
+            if text:
+                return text
+        return ''
+
+    def parse(self, html: str) -> Dict:
+        """
+        Extract the posting text, split at a requirements/qualifications heading
+
+        Args:
+            html (str): Posting page HTML
+
+        Returns:
+            dict: `description` and `requirements`, either of which may be empty
+        """
+        if not html or not html.strip():
+            return {'description': '', 'requirements': ''}
+
+        text = self.posting_description(lxml_html.document_fromstring(html))
+        heading = self.REQUIREMENTS_HEADING.search(text)
+        if not heading:
+            return {'description': text, 'requirements': ''}
+
+        requirements = text[heading.end():]
+        trailing = self.TRAILING_HEADING.search(requirements)
+        if trailing:
+            requirements = requirements[:trailing.start()]
+        rest = (text[:heading.start()], text[heading.end() + len(requirements):])
+        description = '\n'.join(part.strip() for part in rest if part.strip())
+        return {'description': description, 'requirements': requirements.strip()}
+
+
+# Card parser per job board
+PARSERS = {
+    'linkedin': LinkedInCardParser(),
+    'glassdoor': GlassdoorCardParser(),
+    'indeed': IndeedApiParser(),
+}
+
+
+DETAIL_PARSER = PostingDetailParser()
+
+
+def get_parser(board: str):
+    """
+    Look up the card parser for a job board
+
+    Args:
+        board (str): Board name, e.g. 'linkedin'
+
+    Returns:
+        Parser exposing parse(html) -> list of job dicts
+    """
+    try:
+        return PARSERS[board]
+    except KeyError:
+        raise ValueError(f"No parser registered for job board '{board}'")
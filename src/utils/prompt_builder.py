@@ -0,0 +1,163 @@
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+# USD per million tokens: (input, output)
+MODEL_PRICES = {
+    'claude-3-haiku-20240307': (0.25, 1.25),
+    'claude-3-5-haiku-20241022': (0.80, 4.00),
+    'claude-3-sonnet-20240229': (3.00, 15.00),
+    'claude-3-5-sonnet-20241022': (3.00, 15.00),
+    'claude-3-7-sonnet-20250219': (3.00, 15.00),
+    'claude-3-opus-20240229': (15.00, 75.00),
+}
+DEFAULT_PRICE = (3.00, 15.00)
+
+WORD_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?;])\s+|\n+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return (len(text) + 3) // 4
+
+
+def _clip(text: str, limit: int) -> str:
+    text = re.sub(r'\s+', ' ', str(text or '')).strip()
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + '…'
+
+
+def compact_profile(resume_data: Dict, max_skills: int = 40, max_roles: int = 5,
+                    role_chars: int = 160) -> str:
+    """
+    Canonical, compact text form of a parsed resume
+
+    Skills are deduplicated and sorted, every role is one line with a clipped
+    description and education entries are one line each, so the same resume
+    always renders to the same text.
+    """
+    skills = sorted({str(skill).strip().lower() for skill in resume_data.get('skills', []) if str(skill).strip()})
+    lines = [f"Skills: {', '.join(skills[:max_skills])}"]
+
+    roles = []
+    for role in resume_data.get('experience', [])[:max_roles]:
+        title = ' at '.join(part for part in (role.get('title', ''), role.get('company', '')) if part)
+        if role.get('duration'):
+            title += f" ({role['duration']})"
+        if role.get('description'):
+            title += f": {_clip(role['description'], role_chars)}"
+        roles.append(f"- {_clip(title, role_chars * 2)}")
+    lines.append("Experience:" + ("\n" + "\n".join(roles) if roles else " none listed"))
+
+    degrees = []
+    for entry in resume_data.get('education', []):
+        degree = ', '.join(part for part in (entry.get('degree', ''), entry.get('institution', '')) if part)
+        if entry.get('year'):
+            degree += f" ({entry['year']})"
+        if degree:
+            degrees.append(f"- {_clip(degree, 120)}")
+    lines.append("Education:" + ("\n" + "\n".join(degrees) if degrees else " none listed"))
+    return "\n".join(lines)
+
+
+def resume_keywords(resume_data: Dict) -> set:
+    """Lower-cased words of the resume's skills and job titles, for picking relevant spans"""
+    words = set()
+    for skill in resume_data.get('skills', []):
+        words.update(WORD_PATTERN.findall(str(skill).lower()))
+    for role in resume_data.get('experience', []):
+        words.update(WORD_PATTERN.findall(str(role.get('title', '')).lower()))
+    return words
+
+
+def trim_to_budget(text: str, keywords: set, budget: int) -> str:
+    """
+    Keep the sentences of `text` that mention the resume's keywords, within a token budget
+
+    Sentences are ranked by how many keywords they mention (earlier sentences
+    win ties) and the chosen ones are put back in their original order.
+    Boilerplate without any keyword is dropped. If no sentence mentions one
+    the listing is probably a poor match, so only the leading sentences
+    within a quarter of the budget are kept.
+    """
+    text = str(text or '').strip()
+    if not text or estimate_tokens(text) <= budget:
+        return text
+
+    sentences = [sentence.strip() for sentence in SENTENCE_PATTERN.split(text) if sentence.strip()]
+    hits = [len(keywords.intersection(WORD_PATTERN.findall(sentence.lower()))) for sentence in sentences]
+    ranked = sorted((i for i in range(len(sentences)) if hits[i]), key=lambda i: (-hits[i], i))
+    if not ranked:
+        ranked = list(range(len(sentences)))
+        budget = max(1, budget // 4)
+
+    chosen, used = [], 0
+    for i in ranked:
+        cost = estimate_tokens(sentences[i]) + 1
+        if used + cost > budget:
+            if hits[i]:
+                continue
+            break
+        chosen.append(i)
+        used += cost
+    if not chosen:
+        return sentences[ranked[0]][:budget * 4]
+    return ' '.join(sentences[i] for i in sorted(chosen))
+
+
+class UsageMeter:
+    def __init__(self):
+        """Token and cost totals per model"""
+        self.lock = threading.Lock()
+        self.totals = defaultdict(lambda: defaultdict(int))
+
+    def record(self, model: str, response, uncompacted_tokens: int = 0):
+        """
+        Add the usage of one response
+
+        Args:
+            model (str): Model the request was sent to
+            response: Anthropic Messages response
+            uncompacted_tokens (int): Estimated input tokens the request would
+                have needed without prompt compaction
+        """
+        usage = getattr(response, 'usage', None)
+        counts = {
+            'calls': 1,
+            'input_tokens': getattr(usage, 'input_tokens', 0) or 0,
+            'output_tokens': getattr(usage, 'output_tokens', 0) or 0,
+            'uncompacted_tokens': uncompacted_tokens,
+        }
+        with self.lock:
+            for key, value in counts.items():
+                self.totals[model][key] += value
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self.lock:
+            return {model: dict(counts) for model, counts in self.totals.items()}
+
+    def report(self, since: Optional[Dict[str, Dict[str, int]]] = None) -> List[Dict]:
+        """
+        Per-model tokens and cost, optionally only since an earlier snapshot
+
+        `saved_usd` compares the actual cost with what the same calls would have
+        cost uncompacted.
+        """
+        rows = []
+        for model, counts in self.snapshot().items():
+            before = (since or {}).get(model, {})
+            counts = {key: value - before.get(key, 0) for key, value in counts.items()}
+            if not counts['calls']:
+                continue
+            input_price, output_price = MODEL_PRICES.get(model, DEFAULT_PRICE)
+            cost = (counts['input_tokens'] * input_price + counts['output_tokens'] * output_price) / 1_000_000
+            uncompacted = max(counts['uncompacted_tokens'], counts['input_tokens'])
+            full_cost = (uncompacted * input_price + counts['output_tokens'] * output_price) / 1_000_000
+            rows.append({
+                'model': model,
+                **counts,
+                'cost_usd': round(cost, 6),
+                'saved_usd': round(max(full_cost - cost, 0.0), 6),
+            })
+        return rows
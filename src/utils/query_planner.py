@@ -0,0 +1,234 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_QUERY_HISTORY_PATH = os.path.join(
+    os.getenv('JOB_SEARCH_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'job-search')),
+    'query_history.sqlite'
+)
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+
+def query_tokens(query: str) -> List[str]:
+    """Lower-cased words of a query in order, without punctuation or repeats"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(str(query).lower()):
+        token = token.rstrip('.')
+        if token and token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def normalize_query(query: str) -> str:
+    """Canonical spelling of a query: lower case, single spaces, no punctuation"""
+    return ' '.join(query_tokens(query))
+
+
+def query_key(query: str) -> str:
+    """Word-order independent key; queries sharing it are treated as the same search"""
+    return ' '.join(sorted(query_tokens(query)))
+
+
+def rank_skills(resume_data: Dict, extra_skills: Iterable[str] = (), limit: Optional[int] = None) -> List[str]:
+    """
+    Skills ordered by weight, deterministically
+
+    Skills the user typed in come first, then resume skills by how often the
+    resume text mentions them; ties are broken alphabetically, so the same
+    inputs always give the same order.
+
+    Args:
+        resume_data (dict): Parsed resume data
+        extra_skills (iterable): User-provided skills
+        limit (int): Number of skills to return; all if omitted
+
+    Returns:
+        list: Lower-cased skill names
+    """
+    text = ' '.join([resume_data.get('raw_text', '')] + [
+        f"{role.get('title', '')} {role.get('description', '')}" for role in resume_data.get('experience', [])
+    ]).lower()
+    user_skills = {str(skill).strip().lower() for skill in extra_skills if str(skill).strip()}
+    resume_skills = {str(skill).strip().lower() for skill in resume_data.get('skills', []) if str(skill).strip()}
+    skills = user_skills | resume_skills
+
+    def weight(skill):
+        mentions = len(re.findall(rf'(?<![a-z0-9]){re.escape(skill)}(?![a-z0-9])', text))
+        return (skill not in user_skills, -mentions, skill)
+
+    ranked = sorted(skills, key=weight)
+    return ranked if limit is None else ranked[:limit]
+
+
+class QueryHistory:
+    def __init__(self, path: str = DEFAULT_QUERY_HISTORY_PATH):
+        """
+        SQLite record of what each query has yielded in past searches
+
+        Args:
+            path (str): SQLite database file, or ':memory:'
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS query_stats ('
+            ' query TEXT PRIMARY KEY,'
+            ' runs INTEGER NOT NULL,'
+            ' requests INTEGER NOT NULL,'
+            ' listings INTEGER NOT NULL,'
+            ' new_listings INTEGER NOT NULL,'
+            ' exhausted INTEGER NOT NULL,'
+            ' last_run REAL NOT NULL)'
+        )
+        self.conn.commit()
+
+    def record(self, stats: Dict[str, Dict]):
+        """
+        Add one search's results per query
+
+        Args:
+            stats (dict): Query -> requests, listings, new_listings and
+                exhausted (every board ran out of results before the page cap),
+                e.g. SearchStats.query_report()
+        """
+        now = time.time()
+        rows = [
+            (normalize_query(query), s['requests'], s['listings'], s['new_listings'], int(s['exhausted']), now)
+            for query, s in stats.items()
+        ]
+        with self.lock:
+            self.conn.executemany(
+                'INSERT INTO query_stats (query, runs, requests, listings, new_listings, exhausted, last_run) '
+                'VALUES (?, 1, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(query) DO UPDATE SET runs = runs + 1, requests = requests + excluded.requests, '
+                'listings = listings + excluded.listings, new_listings = new_listings + excluded.new_listings, '
+                'exhausted = excluded.exhausted, last_run = excluded.last_run',
+                rows
+            )
+            self.conn.commit()
+
+    def get_many(self, queries: Iterable[str]) -> Dict[str, Dict]:
+        """Stats of the given queries that have run before, keyed by normalized query"""
+        names = list({normalize_query(query) for query in queries})
+        found = {}
+        with self.lock:
+            for i in range(0, len(names), 500):
+                chunk = names[i:i + 500]
+                rows = self.conn.execute(
+                    'SELECT query, runs, requests, listings, new_listings, exhausted FROM query_stats '
+                    f'WHERE query IN ({",".join("?" * len(chunk))})', chunk
+                )
+                for query, runs, requests_made, listings, new_listings, exhausted in rows:
+                    found[query] = {'runs': runs, 'requests': requests_made, 'listings': listings,
+                                    'new_listings': new_listings, 'exhausted': bool(exhausted)}
+        return found
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class QueryPlanner:
+    def __init__(self, history: Optional[QueryHistory] = None, max_requests: int = 60,
+                 requests_per_query: float = 5, prior_weight: float = 5):
+        """
+        Turn candidate search queries into a deduplicated, ranked plan within a request budget
+
+        Args:
+            history (QueryHistory): Past yield per query; without it queries
+                keep their candidate order and cost `requests_per_query`
+            max_requests (int): Board requests one search may spend
+            requests_per_query (float): Expected requests of a query that has
+                not run before (pages per query times boards)
+            prior_weight (float): How many requests of evidence the average
+                yield counts for when ranking queries with little history
+        """
+        self.history = history
+        self.max_requests = max_requests
+        self.requests_per_query = requests_per_query
+        self.prior_weight = prior_weight
+
+    def plan(self, queries: List[str], report: Optional[Dict] = None) -> List[str]:
+        """
+        Deduplicate, prune and rank queries, then cut them to the request budget
+
+        Queries with the same words in any order or spelling count once.
+        A query is dropped if a broader one (a strict subset of its words) is
+        also a candidate and returned all of its results last time, because the
+        narrower query cannot find anything the broader one did not. The rest
+        are ranked by their smoothed yield of new unique listings per request
+        (unseen queries get the average) and taken in that order while the
+        estimated requests fit the budget. At least one query is always kept.
+
+        Args:
+            queries (list): Candidate queries, most important first
+            report (dict): Filled in with the number of candidate, duplicate,
+                covered, over-budget and planned queries and the estimated requests
+
+        Returns:
+            list: Queries to run, best first
+        """
+        report = report if report is not None else {}
+        report.update(candidates=len(queries), duplicates=0, covered=0, over_budget=0)
+
+        unique, seen = [], set()
+        for query in queries:
+            key = query_key(query)
+            if not key or key in seen:
+                report['duplicates'] += 1
+                continue
+            seen.add(key)
+            unique.append(normalize_query(query))
+
+        stats = self.history.get_many(unique) if self.history is not None and unique else {}
+
+        # A broader query that ran out of results covers every narrower one
+        exhausted = [set(query_tokens(query)) for query in unique if stats.get(query, {}).get('exhausted')]
+        kept = []
+        for query in unique:
+            words = set(query_tokens(query))
+            if any(broader < words for broader in exhausted):
+                report['covered'] += 1
+            else:
+                kept.append(query)
+
+        requests_made = sum(s['requests'] for s in stats.values())
+        prior = sum(s['new_listings'] for s in stats.values()) / requests_made if requests_made else 1.0
+
+        def expected_yield(query):
+            s = stats.get(query)
+            if s is None:
+                return prior
+            return (s['new_listings'] + prior * self.prior_weight) / (s['requests'] + self.prior_weight)
+
+        def cost(query):
+            s = stats.get(query)
+            return s['requests'] / s['runs'] if s and s['runs'] else self.requests_per_query
+
+        order = {query: i for i, query in enumerate(kept)}
+        ranked = sorted(kept, key=lambda query: (-expected_yield(query), order[query]))
+
+        planned, spent = [], 0.0
+        for query in ranked:
+            if planned and spent + cost(query) > self.max_requests:
+                report['over_budget'] += 1
+                continue
+            planned.append(query)
+            spent += cost(query)
+
+        report['planned'] = len(planned)
+        report['estimated_requests'] = round(spent, 1)
+        return planned
+
+    def record(self, stats: Dict[str, Dict]):
+        """Feed one search's per-query results back into the history"""
+        if self.history is not None and stats:
+            self.history.record(stats)
@@ -0,0 +1,215 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+DEFAULT_RATE_LIMIT_PATH = os.path.join(
+    os.getenv('JOB_SEARCH_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'job-search')),
+    'rate_limits.sqlite'
+)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        """
+        Thread-safe token bucket
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Maximum number of tokens the bucket can hold
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until the requested tokens are available
+
+        Args:
+            tokens (float): Number of tokens to take
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                # Time until enough tokens have accumulated
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class SharedTokenBuckets:
+    def __init__(self, path: str = DEFAULT_RATE_LIMIT_PATH):
+        """
+        Token buckets kept in SQLite, one row per host, shared by every process using the file
+
+        The app, every job service worker and the batch CLI take their
+        requests to a host from the same bucket, so running more of them does
+        not multiply the budget a board sees.
+
+        Args:
+            path (str): SQLite database file
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        # Autocommit; every acquire is one short BEGIN IMMEDIATE transaction
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        # Losing the last updates in a crash only refills a bucket early
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS rate_buckets (host TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+        )
+
+    def acquire(self, host: str, rate: float, capacity: float, tokens: float = 1.0) -> float:
+        """
+        Take tokens from a host's bucket, then sleep until they are due
+
+        The tokens are reserved at once, letting the bucket go negative, so a
+        waiting caller does not hold the database lock and callers are served
+        in the order they asked.
+
+        Args:
+            host (str): Bucket key
+            rate (float): Tokens added per second
+            capacity (float): Maximum number of tokens the bucket can hold
+            tokens (float): Number of tokens to take
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                now = time.time()
+                row = self.conn.execute('SELECT tokens, updated FROM rate_buckets WHERE host = ?', (host,)).fetchone()
+                available = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+                self.conn.execute(
+                    'INSERT INTO rate_buckets (host, tokens, updated) VALUES (?, ?, ?) '
+                    'ON CONFLICT(host) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+                    (host, available - tokens, now)
+                )
+                self.conn.execute('COMMIT')
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+        wait = max(0.0, (tokens - available) / rate)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class HostRateLimiter:
+    def __init__(self, rate: float = 0.2, burst: float = 1.0, concurrency: int = 2,
+                 host_limits: Optional[Dict[str, Dict]] = None,
+                 shared_buckets: Optional[SharedTokenBuckets] = None,
+                 semaphores: Optional[Dict[str, threading.BoundedSemaphore]] = None):
+        """
+        Per-host politeness budget: a token bucket for request rate plus a
+        semaphore capping in-flight requests to the same host
+
+        Args:
+            rate (float): Default requests per second per host
+            burst (float): Default bucket capacity per host
+            concurrency (int): Default maximum in-flight requests per host
+            host_limits (dict): Per-host overrides, e.g.
+                {'www.linkedin.com': {'rate': 0.5, 'burst': 2, 'concurrency': 3}}
+            shared_buckets (SharedTokenBuckets): Take the rate budget from these
+                cross-process buckets instead of buckets of this limiter
+            semaphores (dict): (host, concurrency) -> in-flight slots shared with
+                other limiters; limiters with the same cap for a host share its
+                slots, and a limiter with a different cap gets its own
+        """
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.host_limits = host_limits or {}
+        self.shared_buckets = shared_buckets
+        self.buckets = {}
+        self.semaphores = semaphores if semaphores is not None else {}
+        self.lock = threading.Lock()
+
+    def _limits_for(self, host: str) -> Dict:
+        limits = {'rate': self.rate, 'burst': self.burst, 'concurrency': self.concurrency}
+        limits.update(self.host_limits.get(host, {}))
+        return limits
+
+    def _get(self, host: str):
+        with self.lock:
+            limits = self._limits_for(host)
+            if self.shared_buckets is None and host not in self.buckets:
+                self.buckets[host] = TokenBucket(limits['rate'], limits['burst'])
+            key = (host, limits['concurrency'])
+            semaphore = self.semaphores.get(key)
+            if semaphore is None:
+                # setdefault is atomic, so limiters sharing `semaphores` agree on one per host and cap
+                semaphore = self.semaphores.setdefault(key, threading.BoundedSemaphore(limits['concurrency']))
+            return limits, self.buckets.get(host), semaphore
+
+    @contextmanager
+    def limit(self, url: str):
+        """
+        Take a rate token, then hold a concurrency slot, for the host of `url`
+
+        The rate wait happens before the slot is taken, so a caller sleeping
+        on the budget does not keep other requests to the host out of a slot.
+
+        Args:
+            url (str): URL about to be requested
+        """
+        host = urlparse(url).netloc.lower()
+        limits, bucket, semaphore = self._get(host)
+        if bucket is None:
+            self.shared_buckets.acquire(host, limits['rate'], limits['burst'])
+        else:
+            bucket.acquire()
+        with semaphore:
+            yield
+
+
+_shared_buckets = {}
+_shared_semaphores = {}
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter(rate: float = 0.2, burst: float = 1.0, concurrency: int = 2,
+                        host_limits: Optional[Dict[str, Dict]] = None,
+                        path: str = DEFAULT_RATE_LIMIT_PATH) -> HostRateLimiter:
+    """
+    HostRateLimiter whose budget is shared per host by every agent and process
+
+    The request rate comes from SharedTokenBuckets in `path`, keyed only by
+    host, so agents of every session, job service worker and CLI take turns
+    on one budget per board whatever limits they were created with. The
+    in-flight cap is shared per host by the agents of one process that use
+    the same cap. Tools that must not touch the machine-wide budget, such as
+    benchmarks and tests, pass their own `path`.
+    """
+    with _shared_lock:
+        if path not in _shared_buckets:
+            _shared_buckets[path] = SharedTokenBuckets(path)
+        buckets = _shared_buckets[path]
+    return HostRateLimiter(rate, burst, concurrency, host_limits, shared_buckets=buckets,
+                           semaphores=_shared_semaphores)
@@ -0,0 +1,137 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is used when zstandard is not installed
+    zstandard = None
+
+# Errors raised by unreadable entries (gzip.BadGzipFile is an OSError)
+CORRUPT_ENTRY_ERRORS = (OSError, ValueError) + ((zstandard.ZstdError,) if zstandard else ())
+
+DEFAULT_RESPONSE_CACHE_DIR = os.path.join(
+    os.getenv('JOB_SEARCH_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'job-search')),
+    'http'
+)
+
+
+def normalize_url(url: str, params: Optional[Dict] = None) -> str:
+    """
+    Canonical form of a URL for cache lookups
+
+    Lower-cases scheme and host, merges `params` into the query string, sorts
+    the query parameters and drops the fragment, so the same request always
+    maps to the same key.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((key, str(value)) for key, value in params.items())
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or '/',
+        urlencode(sorted(query)),
+        ''
+    ))
+
+
+class ResponseCache:
+    def __init__(self, directory: str = DEFAULT_RESPONSE_CACHE_DIR, ttl: float = 3600):
+        """
+        Compressed on-disk cache of HTTP responses keyed on the normalized URL
+
+        Args:
+            directory (str): Directory holding one compressed file per response
+            ttl (float): Seconds a stored response counts as fresh
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.extension = '.zst' if zstandard else '.gz'
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str, extension: str) -> str:
+        digest = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + extension)
+
+    def _compress(self, data: bytes) -> bytes:
+        if zstandard:
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Look up a stored response, fresh or not
+
+        Args:
+            url (str): Request URL
+
+        Returns:
+            dict: Entry with url, status_code, text, etag, last_modified,
+            fetched_at and a computed `fresh` flag, or None if nothing is stored
+        """
+        for extension in ('.zst', '.gz'):
+            path = self._path(url, extension)
+            if not os.path.exists(path):
+                continue
+            if extension == '.zst' and not zstandard:
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                if extension == '.zst':
+                    data = zstandard.ZstdDecompressor().decompress(data)
+                else:
+                    data = gzip.decompress(data)
+                entry = json.loads(data)
+            except CORRUPT_ENTRY_ERRORS:
+                # A torn or corrupt file is treated as a miss
+                continue
+            entry['fresh'] = time.time() - entry['fetched_at'] <= self.ttl
+            return entry
+        return None
+
+    def set(self, url: str, status_code: int, text: str,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Store a response, replacing any previous entry for the URL
+
+        Args:
+            url (str): Request URL
+            status_code (int): HTTP status of the response
+            text (str): Decoded response body
+            etag (str): ETag header, if any
+            last_modified (str): Last-Modified header, if any
+        """
+        entry = {
+            'url': normalize_url(url),
+            'status_code': status_code,
+            'text': text,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time()
+        }
+        path = self._path(url, self.extension)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file and rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._compress(json.dumps(entry).encode('utf-8')))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def touch(self, url: str):
+        """Mark a stored response as freshly validated (after a 304)"""
+        entry = self.get(url)
+        if entry:
+            self.set(url, entry['status_code'], entry['text'], entry['etag'], entry['last_modified'])
@@ -0,0 +1,216 @@
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# Low-cardinality columns are dictionary encoded: each distinct value is stored once per chunk
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+RESULT_SCHEMA = pa.schema([
+    ('title', pa.string()),
+    ('company', CATEGORY),
+    ('location', CATEGORY),
+    ('link', pa.string()),
+    ('source', CATEGORY),
+    ('description', pa.string()),
+    ('requirements', pa.string()),
+    ('match_score', pa.float64()),
+    ('score_tier', CATEGORY),
+    ('alternate_links', pa.list_(pa.string())),
+])
+
+
+def column_values(column: pa.Array) -> list:
+    """
+    Python values of an Arrow column
+
+    Goes through NumPy for strings and numbers, which is several times faster
+    than Array.to_pylist; dictionary columns look their values up once per
+    distinct value.
+    """
+    if pa.types.is_dictionary(column.type):
+        if column.null_count:
+            column = column.dictionary_decode()
+        else:
+            values = column.dictionary.to_numpy(zero_copy_only=False)
+            return values[column.indices.to_numpy()].tolist()
+    if pa.types.is_nested(column.type) or (column.null_count and not pa.types.is_string(column.type)):
+        return column.to_pylist()
+    return column.to_numpy(zero_copy_only=False).tolist()
+
+
+def csv_ready(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """Batch with dictionary columns decoded and list columns joined with spaces, for the CSV writer"""
+    arrays = []
+    for column in batch.columns:
+        if pa.types.is_dictionary(column.type):
+            column = column.dictionary_decode()
+        elif pa.types.is_list(column.type):
+            column = pc.binary_join(column, ' ')
+        arrays.append(column)
+    return pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+
+
+class ResultStore:
+    def __init__(self, extra_fields: Optional[Dict[str, pa.DataType]] = None, chunk_size: int = 4096):
+        """
+        Append-only columnar store of scored job listings, backed by Arrow record batches
+
+        Listings are buffered column by column, with repeated strings such as
+        company and location interned, and frozen into an Arrow record batch
+        every `chunk_size` rows. Exports then stream batch by batch instead of
+        materialising the whole result set as dicts or one string.
+
+        Args:
+            extra_fields (dict): Additional leading columns and their Arrow types,
+                e.g. {'resume': pa.string()}; listing keys outside the schema are dropped
+            chunk_size (int): Rows per record batch
+        """
+        # Extra fields (e.g. which resume a match belongs to) come first
+        extra = [pa.field(name, type_) for name, type_ in (extra_fields or {}).items()]
+        schema = pa.schema(extra + list(RESULT_SCHEMA))
+        self.schema = schema
+        self.chunk_size = chunk_size
+        self.categories = {field.name for field in schema if field.type == CATEGORY}
+        self.frozen = []
+        self.pending = {name: [] for name in schema.names}
+        self.pending_rows = 0
+
+    @classmethod
+    def from_table(cls, table: pa.Table, chunk_size: int = 4096) -> 'ResultStore':
+        extra = {field.name: field.type for field in table.schema if field.name not in RESULT_SCHEMA.names}
+        store = cls(extra, chunk_size)
+        store.frozen = table.cast(store.schema).to_batches(max_chunksize=chunk_size)
+        return store
+
+    def __len__(self) -> int:
+        return sum(batch.num_rows for batch in self.frozen) + self.pending_rows
+
+    def append(self, job: Dict):
+        """Add one listing; missing fields are stored as nulls"""
+        self.extend([job])
+
+    def extend(self, jobs: Iterable[Dict]):
+        """Add listings column by column, freezing a record batch whenever the buffer fills"""
+        jobs = list(jobs)
+        start = 0
+        while start < len(jobs):
+            part = jobs[start:start + self.chunk_size - self.pending_rows]
+            for name, column in self.pending.items():
+                values = [job.get(name) for job in part]
+                if name in self.categories:
+                    values = [sys.intern(value) if isinstance(value, str) else value for value in values]
+                column.extend(values)
+            self.pending_rows += len(part)
+            start += len(part)
+            if self.pending_rows >= self.chunk_size:
+                self._freeze()
+
+    def merge_alternate_links(self, alternates: Dict[str, List[str]]):
+        """
+        Add links of duplicates found after their canonical listing was stored
+
+        Args:
+            alternates (dict): Canonical link -> alternate links, e.g. a search's
+                SearchStats.alternate_links
+        """
+        if not alternates:
+            return
+
+        def merged(link, links):
+            links = list(links or [])
+            return links + [alternate for alternate in alternates.get(link, ())
+                            if alternate not in links and alternate != link]
+
+        self.pending['alternate_links'] = [
+            merged(link, links) for link, links in zip(self.pending['link'], self.pending['alternate_links'])
+        ]
+        index = self.schema.get_field_index('alternate_links')
+        for i, batch in enumerate(self.frozen):
+            links = column_values(batch.column('link'))
+            if not any(link in alternates for link in links):
+                continue
+            column = pa.array(
+                [merged(link, values) for link, values in zip(links, batch.column(index).to_pylist())],
+                self.schema.field(index).type
+            )
+            self.frozen[i] = batch.set_column(index, self.schema.field(index), column)
+
+    def _freeze(self):
+        if not self.pending_rows:
+            return
+        arrays = []
+        for field in self.schema:
+            values = self.pending[field.name]
+            if field.type == CATEGORY:
+                arrays.append(pa.array(values, pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, field.type))
+        self.frozen.append(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.pending = {name: [] for name in self.schema.names}
+        self.pending_rows = 0
+
+    def batches(self) -> List[pa.RecordBatch]:
+        """All rows as record batches, flushing the buffer first"""
+        self._freeze()
+        return list(self.frozen)
+
+    def to_table(self) -> pa.Table:
+        return pa.Table.from_batches(self.batches(), schema=self.schema)
+
+    def to_pandas(self):
+        return self.to_table().to_pandas()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the frozen record batches"""
+        return sum(batch.nbytes for batch in self.frozen)
+
+    def sort_by(self, column: str = 'match_score', descending: bool = True) -> 'ResultStore':
+        """New store with the rows ordered by one column"""
+        order = 'descending' if descending else 'ascending'
+        return ResultStore.from_table(self.to_table().sort_by([(column, order)]), self.chunk_size)
+
+    def row(self, index: int) -> Dict:
+        """One row as a dict"""
+        return self.to_table().slice(index, 1).to_pylist()[0]
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Rows as dicts, converted one record batch at a time"""
+        names = self.schema.names
+        for batch in self.batches():
+            for values in zip(*(column_values(column) for column in batch.columns)):
+                yield dict(zip(names, values))
+
+    def write_csv(self, file):
+        """
+        Stream every column to CSV, one record batch at a time
+
+        List columns such as alternate_links are written space-separated.
+
+        Args:
+            file: Path or binary file object
+        """
+        schema = pa.schema([
+            (field.name, pa.string() if pa.types.is_dictionary(field.type) or pa.types.is_list(field.type)
+             else field.type)
+            for field in self.schema
+        ])
+        options = pa_csv.WriteOptions(quoting_style='needed')
+        with pa_csv.CSVWriter(file, schema, write_options=options) as writer:
+            for batch in self.batches():
+                writer.write_batch(csv_ready(batch))
+
+    def write_parquet(self, file):
+        """
+        Stream every column to Parquet, one row group per record batch
+
+        Args:
+            file: Path or binary file object
+        """
+        with pq.ParquetWriter(file, self.schema) as writer:
+            for batch in self.batches():
+                writer.write_batch(batch)
@@ -1,10 +1,32 @@
-import PyPDF2
-from docx import Document
-import io
 import re
 from datetime import datetime
+from utils.skill_matcher import default_matcher
+from utils.text_extraction import MAX_FILE_BYTES, MAX_PAGES, DocumentTooLargeError, extract_text
+
+# One alternation for all section headers, matched at the start of a line
+SECTION_HEADER = re.compile(
+    r'(?P<summary>summary|objective|profile)'
+    r'|(?P<skills>skills|technologies|technical expertise)'
+    r'|(?P<experience>experience|employment|work history)'
+    r'|(?P<education>education|academic|qualifications)',
+    re.IGNORECASE
+)
+SKILL_DELIMITERS = re.compile(r'[,•|/]')
 
 class ResumeParser:
+    def __init__(self, max_pages=MAX_PAGES, max_bytes=MAX_FILE_BYTES, workers=None, skill_matcher=None):
+        """
+        Args:
+            max_pages (int): Largest PDF accepted, in pages
+            max_bytes (int): Largest file accepted, in bytes
+            workers (int): Processes extracting large PDFs; defaults to the CPU count
+            skill_matcher (SkillMatcher): Skills taxonomy matcher; defaults to utils/skills.txt
+        """
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.skill_matcher = skill_matcher or default_matcher()
+    
     def parse(self, file):
         """
         Parse resume file (PDF, DOCX, or TXT) and extract relevant information
@@ -34,24 +56,14 @@ class ResumeParser:
     def _read_file(self, file):
         """Read content from PDF, DOCX, or TXT file"""
         file_type = file.name.split('.')[-1].lower()
-        content = ""
         
         try:
-            if file_type == 'pdf':
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(file.read()))
-                for page in pdf_reader.pages:
-                    content += page.extract_text() + "\n"
-            
-            elif file_type == 'docx':
-                doc = Document(io.BytesIO(file.read()))
-                for para in doc.paragraphs:
-                    content += para.text + "\n"
-            
-            elif file_type == 'txt':
-                content = file.read().decode('utf-8')
-            
+            content = extract_text(file, file_type, max_pages=self.max_pages,
+                                   max_bytes=self.max_bytes, workers=self.workers)
             return content.strip()
-            
+        
+        except DocumentTooLargeError:
+            raise
         except Exception as e:
             raise Exception(f"Error reading file: {str(e)}")
     
@@ -73,45 +85,29 @@ class ResumeParser:
     def _extract_sections(self, content):
         """Extract different sections from resume content"""
         sections = {
-            'header': '',
-            'summary': '',
-            'skills': '',
-            'experience': '',
-            'education': '',
-            'other': ''
+            'header': [],
+            'summary': [],
+            'skills': [],
+            'experience': [],
+            'education': [],
+            'other': []
         }
         
-        # Common section headers
-        section_patterns = {
-            'summary': r'(?i)(summary|objective|profile)',
-            'skills': r'(?i)(skills|technologies|technical expertise)',
-            'experience': r'(?i)(experience|employment|work history)',
-            'education': r'(?i)(education|academic|qualifications)'
-        }
-        
-        # Split content into lines
-        lines = content.split('\n')
         current_section = 'header'
-        
-        for line in lines:
+        for line in content.split('\n'):
             line = line.strip()
             if not line:
                 continue
             
             # Check if line is a section header
-            matched_section = None
-            for section, pattern in section_patterns.items():
-                if re.match(pattern, line, re.IGNORECASE):
-                    matched_section = section
-                    break
-            
-            if matched_section:
-                current_section = matched_section
-                sections[current_section] = ''
+            header = SECTION_HEADER.match(line)
+            if header:
+                current_section = header.lastgroup
+                sections[current_section] = []
             else:
-                sections[current_section] += line + '\n'
+                sections[current_section].append(line)
         
-        return sections
+        return {section: ''.join(line + '\n' for line in lines) for section, lines in sections.items()}
     
     def _extract_skills(self, content, sections):
         """Extract skills from resume content"""
@@ -121,30 +117,11 @@ class ResumeParser:
         skills_text = sections.get('skills', '')
         if skills_text:
             # Split by common delimiters
-            skill_candidates = re.split(r'[,•|/]', skills_text)
+            skill_candidates = SKILL_DELIMITERS.split(skills_text)
             skills.update([s.strip() for s in skill_candidates if s.strip()])
         
-        # Common technical skills to look for throughout the resume
-        common_skills = [
-            # Programming Languages
-            'python', 'java', 'javascript', 'c++', 'ruby', 'php',
-            # Web Technologies
-            'html', 'css', 'react', 'angular', 'vue', 'node.js',
-            # Frameworks
-            'django', 'flask', 'spring', 'express',
-            # Databases
-            'sql', 'mysql', 'postgresql', 'mongodb', 'redis',
-            # Cloud & DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins',
-            # Other
-            'git', 'agile', 'scrum', 'jira', 'machine learning'
-        ]
-        
-        # Look for common skills throughout the resume
-        content_lower = content.lower()
-        for skill in common_skills:
-            if skill in content_lower:
-                skills.add(skill)
+        # Taxonomy skills mentioned anywhere in the resume, as whole words
+        skills.update(self.skill_matcher.find(content))
         
         return sorted(list(skills))
     
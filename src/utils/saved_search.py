@@ -0,0 +1,264 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from utils.dedup import job_key
+from utils.score_cache import resume_digest
+from utils.search_stats import SearchStats
+
+DEFAULT_SAVED_SEARCH_PATH = os.path.join(
+    os.getenv('JOB_SEARCH_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'job-search')),
+    'saved_searches.sqlite'
+)
+
+
+class SavedSearchStore:
+    def __init__(self, path: str = DEFAULT_SAVED_SEARCH_PATH):
+        """
+        SQLite store of saved searches, the listings each has seen and their scores
+
+        Args:
+            path (str): SQLite database file, or ':memory:'
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(
+            'CREATE TABLE IF NOT EXISTS searches ('
+            ' name TEXT PRIMARY KEY,'
+            ' queries TEXT NOT NULL,'
+            ' resume_digest TEXT NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' last_run_at REAL);'
+            'CREATE TABLE IF NOT EXISTS listings ('
+            ' search_name TEXT NOT NULL,'
+            ' link TEXT NOT NULL,'
+            ' job_key TEXT NOT NULL,'
+            ' job TEXT NOT NULL,'
+            ' match_score REAL,'
+            ' needs_score INTEGER NOT NULL DEFAULT 0,'
+            ' first_seen REAL NOT NULL,'
+            ' last_seen REAL NOT NULL,'
+            ' PRIMARY KEY (search_name, link));'
+        )
+        # Stores created before needs_score existed
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(listings)')}
+        if 'needs_score' not in columns:
+            self.conn.execute('ALTER TABLE listings ADD COLUMN needs_score INTEGER NOT NULL DEFAULT 0')
+        self.conn.commit()
+
+    def list_searches(self) -> List[str]:
+        with self.lock:
+            return [row[0] for row in self.conn.execute('SELECT name FROM searches ORDER BY name')]
+
+    def get_search(self, name: str) -> Optional[Dict]:
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT queries, resume_digest, created_at, last_run_at FROM searches WHERE name = ?', (name,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'name': name, 'queries': json.loads(row[0]), 'resume_digest': row[1],
+                'created_at': row[2], 'last_run_at': row[3]}
+
+    def save_search(self, name: str, queries: List[str], digest: str) -> bool:
+        """
+        Create or update a saved search; a different resume invalidates its stored scores
+
+        Returns:
+            bool: True if stored scores were invalidated
+        """
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute('SELECT resume_digest FROM searches WHERE name = ?', (name,)).fetchone()
+            invalidated = row is not None and row[0] != digest
+            if invalidated:
+                self.conn.execute(
+                    'UPDATE listings SET match_score = NULL, needs_score = 1 WHERE search_name = ?', (name,)
+                )
+            self.conn.execute(
+                'INSERT INTO searches (name, queries, resume_digest, created_at, last_run_at) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET queries = excluded.queries, '
+                'resume_digest = excluded.resume_digest, last_run_at = excluded.last_run_at',
+                (name, json.dumps(queries), digest, now, now)
+            )
+            self.conn.commit()
+        return invalidated
+
+    def listings(self, name: str, needs_score: bool = False) -> List[Dict]:
+        """
+        Listings seen by a saved search, with `match_score` None if it has no score
+
+        Args:
+            name (str): Saved search name
+            needs_score (bool): Only listings whose score a resume change invalidated
+                and that have not been rescored yet
+        """
+        query = 'SELECT job, match_score FROM listings WHERE search_name = ?'
+        if needs_score:
+            query += ' AND needs_score = 1'
+        with self.lock:
+            rows = self.conn.execute(query, (name,)).fetchall()
+        jobs = []
+        for job_json, score in rows:
+            job = json.loads(job_json)
+            job['match_score'] = score
+            jobs.append(job)
+        return jobs
+
+    def record_listings(self, name: str, jobs: Iterable[Dict]):
+        """
+        Upsert listings by link; a link whose title, company or location changed keeps
+        its first_seen but loses its old score
+        """
+        with self.lock:
+            self._upsert_listings(name, jobs)
+            self.conn.commit()
+
+    def record_scores(self, name: str, jobs: Iterable[Dict]):
+        """Store the `match_score` of every scored listing"""
+        with self.lock:
+            self._update_scores(name, jobs)
+            self.conn.commit()
+
+    def record_batch(self, name: str, jobs: List[Dict]):
+        """
+        Store a batch that went through the scorer, listings and scores in one transaction
+
+        Listings of the batch without a score were dropped by the pre-filter on
+        purpose; they are stored as known and not sent to the scorer again.
+        """
+        with self.lock:
+            self._upsert_listings(name, jobs)
+            self._update_scores(name, jobs)
+            self.conn.executemany(
+                'UPDATE listings SET needs_score = 0 WHERE search_name = ? AND link = ?',
+                [(name, self._link(job)) for job in jobs]
+            )
+            self.conn.commit()
+
+    def record_alternate_links(self, name: str, alternates: Dict[str, List[str]]):
+        """
+        Add links of duplicates found after their canonical listing was stored
+
+        Args:
+            name (str): Saved search name
+            alternates (dict): Canonical link -> alternate links, e.g. SearchStats.alternate_links
+        """
+        with self.lock:
+            for link, links in alternates.items():
+                row = self.conn.execute(
+                    'SELECT job FROM listings WHERE search_name = ? AND link = ?', (name, link)
+                ).fetchone()
+                if row is None:
+                    continue
+                job = json.loads(row[0])
+                stored = job.get('alternate_links') or []
+                added = [alternate for alternate in links if alternate not in stored]
+                if added:
+                    job['alternate_links'] = stored + added
+                    self.conn.execute(
+                        'UPDATE listings SET job = ? WHERE search_name = ? AND link = ?',
+                        (json.dumps(job), name, link)
+                    )
+            self.conn.commit()
+
+    @staticmethod
+    def _link(job: Dict) -> str:
+        return job.get('link') or job.get('url') or job_key(job)
+
+    def _upsert_listings(self, name: str, jobs: Iterable[Dict]):
+        now = time.time()
+        for job in jobs:
+            stored = {k: v for k, v in job.items() if k != 'match_score'}
+            self.conn.execute(
+                'INSERT INTO listings (search_name, link, job_key, job, match_score, first_seen, last_seen) '
+                'VALUES (?, ?, ?, ?, NULL, ?, ?) '
+                'ON CONFLICT(search_name, link) DO UPDATE SET '
+                ' match_score = CASE WHEN listings.job_key = excluded.job_key THEN listings.match_score END,'
+                ' job_key = excluded.job_key, job = excluded.job, last_seen = excluded.last_seen',
+                (name, self._link(job), job_key(job), json.dumps(stored), now, now)
+            )
+
+    def _update_scores(self, name: str, jobs: Iterable[Dict]):
+        self.conn.executemany(
+            'UPDATE listings SET match_score = ? WHERE search_name = ? AND link = ?',
+            [(job['match_score'], name, self._link(job)) for job in jobs if job.get('match_score') is not None]
+        )
+
+    def run(self, name: str, scraper_agent, filter_agent, search_queries: List[str],
+            resume_data: Dict, track: Optional[Callable] = None,
+            stats: Optional[SearchStats] = None) -> Iterator[List[Dict]]:
+        """
+        Run a saved search incrementally
+
+        Previously ranked matches are yielded first. Known listings are handed
+        to the scraper's dedup index, so they (and near duplicates of them)
+        are not returned again and pages made up of them stop pagination
+        early. Only new listings, including re-titled postings under a known
+        link, are scored.
+        If the resume changed since the last run, known listings are rescored
+        once (repeat pairs are still served by the score cache).
+        A batch is stored only after it has been scored, so listings of an
+        interrupted run are scraped and scored again on the next run, and
+        known listings whose rescoring was interrupted are rescored then.
+        Links of duplicates found after their listing was stored are added to
+        the stored listing once the run completes; consumers holding yielded
+        matches merge them from `stats.alternate_links`.
+
+        Args:
+            name (str): Saved search name
+            scraper_agent (WebScraperAgent): Scraper used for new listings
+            filter_agent (FilteringAgent): Scorer used for new listings
+            search_queries (list): Queries of this run
+            resume_data (dict): Parsed resume data
+            track (callable): Optional wrapper around the stream of scraped batches,
+                e.g. for progress reporting
+            stats (SearchStats): Collects the run's scraping and scoring stats, and
+                its known, new and scored listing counts in `stats.saved_search`
+
+        Yields:
+            list: Batches of matching listings, starting with the cached matches
+        """
+        self.save_search(name, search_queries, resume_digest(resume_data))
+        known = self.listings(name)
+        rescore = self.listings(name, needs_score=True)
+        stats = stats if stats is not None else SearchStats()
+        run = stats.saved_search
+        run.update(known=len(known), new=0, scored=0)
+
+        # Matches from earlier runs are served straight from the store
+        cached_matches = [
+            job for job in known
+            if job['match_score'] is not None and job['match_score'] >= filter_agent.threshold
+        ]
+        if cached_matches:
+            yield cached_matches
+
+        def record(job_batches, new=True):
+            for batch in job_batches:
+                run['scored'] += len(batch)
+                if new:
+                    run['new'] += len(batch)
+                yield batch
+                # The next batch is only requested once this one has been scored
+                self.record_batch(name, batch)
+
+        scraped = scraper_agent.scrape_jobs_stream(search_queries, known_listings=known, stats=stats)
+        if track:
+            scraped = track(scraped)
+
+        # Known listings are rescored only if a resume change invalidated their scores
+        job_batches = chain(
+            record([rescore] if rescore else [], new=False),
+            record(scraped)
+        )
+        yield from filter_agent.filter_jobs_stream(job_batches, resume_data, stats)
+        self.record_alternate_links(name, stats.alternate_links)
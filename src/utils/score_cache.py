@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.getenv('JOB_SEARCH_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'job-search')),
+    'llm_cache.sqlite'
+)
+
+
+def _digest(value: Any) -> str:
+    """Stable SHA-256 of any JSON-serialisable value"""
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _normalize_text(value: Any) -> str:
+    return re.sub(r'\s+', ' ', str(value or '')).strip().lower()
+
+
+def normalize_job(job: Dict) -> Dict:
+    """Fields of a job listing that influence its match score, normalized"""
+    return {
+        field: _normalize_text(job.get(field, ''))
+        for field in ('title', 'company', 'location', 'description', 'requirements')
+    }
+
+
+def resume_digest(resume_data: Dict) -> str:
+    """Digest of the resume fields sent to Claude"""
+    return _digest({
+        'skills': resume_data.get('skills', []),
+        'experience': resume_data.get('experience', []),
+        'education': resume_data.get('education', [])
+    })
+
+
+def prompt_version(*templates: str) -> str:
+    """Version tag derived from prompt templates, so editing one invalidates its entries"""
+    return _digest(templates)[:16]
+
+
+def make_key(*parts: Any) -> str:
+    """Content-addressed cache key for the given parts"""
+    return _digest(parts)
+
+
+class ScoreCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = 7 * 24 * 3600,
+                 max_entries: int = 100_000, flush_every: int = 256, timeout: float = 30):
+        """
+        Disk-backed key-value cache for LLM results with TTL and LRU eviction
+
+        Hits only record their access time in memory; the times are written in
+        one transaction every `flush_every` hits or inserts, and the table is
+        only counted and trimmed when those inserts are flushed. A database
+        locked by another process for longer than `timeout` degrades to a miss
+        (get) or a skipped write (set) rather than failing the search.
+
+        Args:
+            path (str): SQLite database file, or ':memory:' for a process-local cache
+            ttl (float): Seconds an entry stays valid
+            max_entries (int): Entries kept before least recently used ones are evicted
+            flush_every (int): Hits or inserts between writes of access times and evictions
+            timeout (float): Seconds to wait for a lock held by another process
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.flush_every = flush_every
+        self._accessed = {}
+        self._inserts = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)')
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            key (str): Cache key from `make_key`
+
+        Returns:
+            The cached value, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self.lock:
+            try:
+                row = self.conn.execute(
+                    'SELECT value, created_at FROM cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None and now - row[1] > self.ttl:
+                    self.conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                    self.conn.commit()
+                    row = None
+            except sqlite3.OperationalError:
+                self.conn.rollback()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._accessed[key] = now
+            if len(self._accessed) >= self.flush_every:
+                self._flush()
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        """
+        Store a JSON-serialisable value, evicting least recently used entries if full
+
+        Args:
+            key (str): Cache key from `make_key`
+            value: Value to store
+        """
+        now = time.time()
+        with self.lock:
+            try:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                    (key, json.dumps(value), now, now)
+                )
+                self.conn.commit()
+            except sqlite3.OperationalError:
+                self.conn.rollback()
+                return
+            self._accessed.pop(key, None)
+            self._inserts += 1
+            if self._inserts >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        """Write pending access times and evict down to max_entries; caller holds the lock"""
+        accessed, self._accessed = self._accessed, {}
+        inserts, self._inserts = self._inserts, 0
+        try:
+            if accessed:
+                self.conn.executemany(
+                    'UPDATE cache SET accessed_at = MAX(accessed_at, ?) WHERE key = ?',
+                    [(at, key) for key, at in accessed.items()]
+                )
+            if inserts:
+                count = self.conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+                if count > self.max_entries:
+                    self.conn.execute(
+                        'DELETE FROM cache WHERE key IN '
+                        '(SELECT key FROM cache ORDER BY accessed_at ASC LIMIT ?)',
+                        (count - self.max_entries,)
+                    )
+            self.conn.commit()
+        except sqlite3.OperationalError:
+            # Access times are only an eviction hint; drop them rather than block the caller
+            self.conn.rollback()
+
+    def flush(self):
+        """Write pending access times and apply eviction now"""
+        with self.lock:
+            self._flush()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self.lock:
+            self._flush()
+            size = self.conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': size
+        }
@@ -0,0 +1,64 @@
+import threading
+from typing import Dict
+
+from utils.prompt_builder import UsageMeter
+
+
+class SearchStats:
+    def __init__(self):
+        """
+        Counters of one search, handed to every agent call the search makes
+
+        The app shares its agents between sessions and a job service worker
+        reuses them for every search, so anything describing a single search
+        (query yield, dedup ratio, query plan, Claude usage, work shared with
+        concurrent searches) is collected here rather than on the agents.
+
+        Attributes:
+            plan (dict): QueryPlanner counts of candidate, duplicate, covered,
+                over-budget and planned queries
+            dedup (dict): NearDuplicateIndex report of the scraped listings
+            alternate_links (dict): Link of each listing that collapsed duplicates ->
+                their links, including duplicates found after the listing was yielded
+            saved_search (dict): Known, new and scored listings of a saved search run
+            usage (UsageMeter): Claude tokens and cost of the search's scoring calls
+        """
+        self.lock = threading.Lock()
+        self.plan = {}
+        self.dedup = {}
+        self.alternate_links = {}
+        self.saved_search = {}
+        self.usage = UsageMeter()
+        self.queries = {}
+        self.coalesced = {'pages': 0, 'scores': 0}
+
+    def record_query(self, query: str, requests: int, listings: int, new_listings: int, exhausted: bool):
+        """Add one board's results to a query's stats; it is exhausted only if every board was"""
+        with self.lock:
+            stats = self.queries.setdefault(
+                query, {'requests': 0, 'listings': 0, 'new_listings': 0, 'exhausted': True}
+            )
+            stats['requests'] += requests
+            stats['listings'] += listings
+            stats['new_listings'] += new_listings
+            stats['exhausted'] = stats['exhausted'] and exhausted
+
+    def query_report(self) -> Dict[str, Dict]:
+        """
+        Per-query results, for QueryPlanner.record
+
+        Returns:
+            dict: Query -> requests, listings, new_listings and exhausted (every
+            board returned its last page before max_results_per_query)
+        """
+        with self.lock:
+            return {query: dict(stats) for query, stats in self.queries.items()}
+
+    def add_coalesced(self, name: str, count: int = 1):
+        """Count page fetches ('pages') or scores ('scores') shared from a concurrent search"""
+        with self.lock:
+            self.coalesced[name] += count
+
+    def coalesced_report(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.coalesced)
@@ -0,0 +1,80 @@
+import threading
+from typing import Callable, Dict, Hashable, Tuple
+
+
+class Flight:
+    def __init__(self):
+        """One in-flight call; waiters block until its leader finishes it"""
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        """Block until the call finished, then return its result or raise its error"""
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Coalesce concurrent identical calls into one
+
+        The first caller of a key becomes the leader and makes the call; callers
+        arriving with the same key while it is in flight wait for its result
+        instead of repeating it. Nothing is remembered once the call finished,
+        so this complements caches rather than replacing them.
+        """
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.counters = {'calls': 0, 'coalesced': 0}
+
+    def begin(self, key: Hashable) -> Tuple[Flight, bool]:
+        """
+        Join the flight for `key`, starting it if none is in the air
+
+        Returns:
+            tuple: The flight and whether the caller leads it; a leader must call
+                finish() for the key, even on failure
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is not None:
+                self.counters['coalesced'] += 1
+                return flight, False
+            flight = self.flights[key] = Flight()
+            self.counters['calls'] += 1
+            return flight, True
+
+    def finish(self, key: Hashable, result=None, error: BaseException = None):
+        """Land the flight for `key`, handing its result (or error) to every waiter"""
+        with self.lock:
+            flight = self.flights.pop(key)
+        flight.result = result
+        flight.error = error
+        flight.done.set()
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Tuple[object, bool]:
+        """
+        Call `fn`, or wait for the identical call already in flight
+
+        Returns:
+            tuple: The result and whether it was shared from another caller's call
+        """
+        flight, leader = self.begin(key)
+        if not leader:
+            return flight.wait(), True
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self.finish(key, error=e)
+            raise
+        self.finish(key, result)
+        return result, False
+
+    def stats(self) -> Dict[str, int]:
+        """Calls made and calls coalesced into them"""
+        with self.lock:
+            return dict(self.counters, in_flight=len(self.flights))
@@ -0,0 +1,117 @@
+import os
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Set
+
+DEFAULT_TAXONOMY_PATH = os.getenv(
+    'JOB_SEARCH_SKILLS_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills.txt')
+)
+
+
+def load_taxonomy(path: str = DEFAULT_TAXONOMY_PATH) -> Dict[str, str]:
+    """
+    Load a skills taxonomy file
+
+    One skill per line; `canonical = alias, alias` lines map aliases to the
+    canonical name. Blank lines and lines starting with '#' are ignored.
+
+    Returns:
+        dict: Lower-cased term -> canonical skill name
+    """
+    terms = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            canonical, _, aliases = line.partition('=')
+            canonical = canonical.strip().lower()
+            terms[canonical] = canonical
+            for alias in aliases.split(','):
+                if alias.strip():
+                    terms[alias.strip().lower()] = canonical
+    return terms
+
+
+class SkillMatcher:
+    def __init__(self, terms: Optional[Iterable[str]] = None):
+        """
+        Aho-Corasick automaton finding whole-word skill mentions in one pass
+
+        A match only counts if it is not glued to a letter or digit on either
+        side, so 'java' does not match inside 'javascript'. Scan time depends
+        on the text length, not on the number of terms.
+
+        Args:
+            terms: Skill names, or a dict of term -> canonical name; the
+                default taxonomy file is loaded if omitted
+        """
+        if terms is None:
+            terms = load_taxonomy()
+        if not isinstance(terms, dict):
+            terms = {term.lower(): term.lower() for term in terms}
+        self.terms = terms
+
+        # Trie as parallel arrays: transitions, failure links and outputs per state
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for term in terms:
+            state = 0
+            for char in term:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(term)
+
+        # Breadth-first failure links; outputs inherit their failure state's outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Canonical names of all skills mentioned in a text
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            set: Canonical skill names
+        """
+        text = text.lower()
+        goto, fail, output, terms = self.goto, self.fail, self.output, self.terms
+        found = set()
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            after = text[end + 1] if end + 1 < len(text) else ''
+            for term in output[state]:
+                start = end - len(term) + 1
+                before = text[start - 1] if start > 0 else ''
+                if not (before.isalnum() or after.isalnum()):
+                    found.add(terms[term])
+        return found
+
+
+@lru_cache(maxsize=None)
+def default_matcher() -> SkillMatcher:
+    """Matcher over the default taxonomy, built once per process"""
+    return SkillMatcher()
@@ -0,0 +1,159 @@
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import PyPDF2
+from docx import Document
+
+# Resumes beyond these limits are rejected instead of tying up a worker
+MAX_PAGES = 50
+MAX_FILE_BYTES = 10 * 1024 * 1024
+
+# PDFs with at least this many pages are split across worker processes
+PARALLEL_MIN_PAGES = 20
+# Size of the shared extraction pool; larger requests queue on it
+POOL_WORKERS = os.cpu_count() or 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class DocumentTooLargeError(ValueError):
+    """Raised when a document exceeds the page or size limit"""
+
+
+def stream_size(stream: BinaryIO) -> Optional[int]:
+    """Size in bytes of a file object, without reading it"""
+    size = getattr(stream, 'size', None)
+    if size is not None:
+        return size
+    try:
+        position = stream.tell()
+        size = stream.seek(0, os.SEEK_END)
+        stream.seek(position)
+        return size
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def check_size(stream: BinaryIO, max_bytes: int = MAX_FILE_BYTES):
+    size = stream_size(stream)
+    if size is not None and max_bytes and size > max_bytes:
+        raise DocumentTooLargeError(
+            f"File is {size / 1024 / 1024:.1f} MB; the limit is {max_bytes / 1024 / 1024:.0f} MB"
+        )
+
+
+def open_pdf(stream: BinaryIO, max_pages: int = MAX_PAGES) -> PyPDF2.PdfReader:
+    """
+    Open a PDF and enforce the page limit
+
+    The reader works on the file object directly, so the document is not
+    copied into memory first.
+
+    Raises:
+        DocumentTooLargeError: If the PDF has more than `max_pages` pages
+    """
+    reader = PyPDF2.PdfReader(stream)
+    page_count = len(reader.pages)
+    if max_pages and page_count > max_pages:
+        raise DocumentTooLargeError(f"PDF has {page_count} pages; the limit is {max_pages}")
+    return reader
+
+
+def iter_pdf_pages(stream: BinaryIO, max_pages: int = MAX_PAGES) -> Iterator[str]:
+    """Yield the text of each page of a PDF as it is extracted"""
+    for page in open_pdf(stream, max_pages).pages:
+        yield page.extract_text() or ''
+
+
+def _extract_page_range(args: Tuple[bytes, int, int]) -> List[str]:
+    """Extract pages [start, stop) of a PDF; runs in a worker process"""
+    data, start, stop = args
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [(reader.pages[i].extract_text() or '') for i in range(start, stop)]
+
+
+def extraction_pool() -> ProcessPoolExecutor:
+    """
+    Process pool for page-range extraction, created once at POOL_WORKERS and reused
+
+    Sessions share the pool, so it is never resized or shut down while one
+    of them may still be submitting to it; a PDF split into more ranges
+    than the pool has workers queues the rest. Workers are spawned rather
+    than forked: the Streamlit server is multi-threaded, and forking it can
+    copy locks held by other threads.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def extract_pdf_text(stream: BinaryIO, max_pages: int = MAX_PAGES, workers: Optional[int] = None,
+                     parallel_min_pages: int = PARALLEL_MIN_PAGES) -> str:
+    """
+    Extract the text of a PDF, one line break between pages
+
+    Args:
+        stream: Seekable binary file object
+        max_pages (int): Page limit
+        workers (int): Worker processes for large PDFs; defaults to the CPU count
+        parallel_min_pages (int): Smallest page count split across processes
+
+    Returns:
+        str: Document text
+    """
+    workers = workers or os.cpu_count() or 1
+    reader = open_pdf(stream, max_pages)
+    page_count = len(reader.pages)
+    if workers < 2 or page_count < parallel_min_pages:
+        return "\n".join(page.extract_text() or '' for page in reader.pages)
+
+    # Each worker parses its own copy of the document and extracts one page range
+    stream.seek(0)
+    data = stream.read()
+    chunk = -(-page_count // workers)
+    ranges = [(data, start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    executor = extraction_pool()
+    pages = [text for texts in executor.map(_extract_page_range, ranges) for text in texts]
+    return "\n".join(pages)
+
+
+def extract_docx_text(stream: BinaryIO) -> str:
+    """Extract the paragraph text of a DOCX document"""
+    return "\n".join(para.text for para in Document(stream).paragraphs)
+
+
+def extract_text(stream: BinaryIO, file_type: str, max_pages: int = MAX_PAGES,
+                 max_bytes: int = MAX_FILE_BYTES, workers: Optional[int] = None) -> str:
+    """
+    Extract the text of a PDF, DOCX or TXT file
+
+    Args:
+        stream: Seekable binary file object, e.g. a Streamlit UploadedFile
+        file_type (str): 'pdf', 'docx' or 'txt'
+        max_pages (int): Page limit for PDFs
+        max_bytes (int): File size limit
+        workers (int): Worker processes for large PDFs
+
+    Returns:
+        str: Document text
+
+    Raises:
+        DocumentTooLargeError: If the file exceeds the page or size limit
+        ValueError: If the file type is not supported
+    """
+    check_size(stream, max_bytes)
+    if file_type == 'pdf':
+        return extract_pdf_text(stream, max_pages=max_pages, workers=workers)
+    if file_type == 'docx':
+        return extract_docx_text(stream)
+    if file_type == 'txt':
+        return stream.read().decode('utf-8')
+    raise ValueError(f"Unsupported file type '{file_type}'")
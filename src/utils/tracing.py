@@ -0,0 +1,169 @@
+import contextvars
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import pyinstrument
+except ImportError:  # optional; only needed for profile='pyinstrument'
+    pyinstrument = None
+
+# The trace of the run in progress; worker threads see it via submit_in_context
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+
+
+class Trace:
+    def __init__(self, name: str = 'search'):
+        """
+        Timings and counters of one pipeline run, aggregated per span name
+
+        Args:
+            name (str): Run name, used as a label in the exports
+        """
+        self.name = name
+        self.started = time.time()
+        self.finished = None
+        self.lock = threading.Lock()
+        self.durations = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.totals = defaultdict(lambda: defaultdict(float))
+        self.profile = None
+
+    def record(self, name: str, seconds: float, error: bool = False, attrs: Optional[Dict] = None):
+        """Add one finished span; numeric attributes (e.g. token counts) are summed"""
+        with self.lock:
+            self.durations[name].append(seconds)
+            if error:
+                self.errors[name] += 1
+            for key, value in (attrs or {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    self.totals[name][key] += value
+
+    def summary(self) -> List[Dict]:
+        """One row per span name: calls, errors, total/mean/p95/max seconds and summed attributes"""
+        rows = []
+        with self.lock:
+            for name in sorted(self.durations):
+                durations = sorted(self.durations[name])
+                row = {
+                    'stage': name,
+                    'calls': len(durations),
+                    'errors': self.errors[name],
+                    'total_s': sum(durations),
+                    'mean_ms': sum(durations) / len(durations) * 1000,
+                    'p95_ms': durations[min(len(durations) - 1, int(0.95 * len(durations)))] * 1000,
+                    'max_ms': durations[-1] * 1000,
+                }
+                row.update(self.totals[name])
+                rows.append(row)
+        return rows
+
+    def to_json(self) -> str:
+        return json.dumps({
+            'run': self.name,
+            'started': self.started,
+            'seconds': (self.finished or time.time()) - self.started,
+            'stages': self.summary()
+        }, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Summary in the Prometheus text exposition format"""
+        lines = [
+            '# TYPE job_search_stage_seconds_total counter',
+            '# TYPE job_search_stage_calls_total counter',
+            '# TYPE job_search_stage_errors_total counter',
+        ]
+        for row in self.summary():
+            labels = f'run="{self.name}",stage="{row["stage"]}"'
+            lines.append(f'job_search_stage_seconds_total{{{labels}}} {row["total_s"]:.6f}')
+            lines.append(f'job_search_stage_calls_total{{{labels}}} {row["calls"]}')
+            lines.append(f'job_search_stage_errors_total{{{labels}}} {row["errors"]}')
+            for key, value in row.items():
+                if key not in ('stage', 'calls', 'errors', 'total_s', 'mean_ms', 'p95_ms', 'max_ms'):
+                    lines.append(f'job_search_stage_{key}_total{{{labels}}} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def trace_run(name: str = 'search', profile: Optional[str] = None) -> Iterator[Trace]:
+    """
+    Collect the spans of everything run inside the block into a new Trace
+
+    Args:
+        name (str): Run name
+        profile (str): 'cprofile' or 'pyinstrument' to also profile the calling
+            thread; the report is left in `trace.profile`
+    """
+    trace = Trace(name)
+    token = _current_trace.set(trace)
+    profiler = None
+    if profile == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif profile == 'pyinstrument':
+        if pyinstrument is None:
+            raise ValueError("profile='pyinstrument' needs the pyinstrument package")
+        profiler = pyinstrument.Profiler()
+        profiler.start()
+    try:
+        yield trace
+    finally:
+        if profile == 'cprofile':
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(40)
+            trace.profile = out.getvalue()
+        elif profile == 'pyinstrument':
+            profiler.stop()
+            trace.profile = profiler.output_text()
+        trace.finished = time.time()
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Dict]:
+    """
+    Time a block as one span of the current trace
+
+    Yields a dict of attributes the block may add to, e.g. token counts;
+    setting `error` marks the span failed without raising. Outside a
+    trace_run block this does nothing beyond the yield.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield attrs
+        return
+    started = time.perf_counter()
+    error = False
+    try:
+        yield attrs
+    except BaseException:
+        error = True
+        raise
+    finally:
+        error = bool(attrs.pop('error', False)) or error
+        trace.record(name, time.perf_counter() - started, error, attrs)
+
+
+def add_usage(attrs: Dict, response):
+    """Copy the token counts of an Anthropic response into span attributes"""
+    usage = getattr(response, 'usage', None)
+    if usage is not None:
+        attrs['input_tokens'] = getattr(usage, 'input_tokens', 0) or 0
+        attrs['output_tokens'] = getattr(usage, 'output_tokens', 0) or 0
+
+
+def submit_in_context(executor: Executor, fn, *args, **kwargs) -> Future:
+    """executor.submit that runs `fn` in a copy of the caller's context, keeping its trace"""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
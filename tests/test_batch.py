@@ -0,0 +1,22 @@
+from batch import CorpusEnricher
+
+
+def test_corpus_enricher_fetches_each_posting_once():
+    fetched = []
+
+    def enricher(jobs, stats=None):
+        for job in jobs:
+            if not job.get('details_fetched'):
+                fetched.append(job['link'])
+                job['description'] = f"full posting {job['link']}"
+                job['details_fetched'] = True
+        return jobs
+
+    corpus = [{'link': 'https://example.com/1', 'description': 'short'}, {'link': 'https://example.com/2'}]
+    shared = CorpusEnricher(enricher, corpus)
+    for _ in range(3):
+        copies = [dict(job) for job in corpus]
+        shared(copies)
+        assert copies[0]['description'] == 'full posting https://example.com/1'
+        assert all(copy['details_fetched'] for copy in copies)
+    assert fetched == ['https://example.com/1', 'https://example.com/2']
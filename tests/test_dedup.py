@@ -0,0 +1,85 @@
+from utils.dedup import NearDuplicateIndex, blocking_key, normalize_company
+from utils.result_store import ResultStore
+from utils.saved_search import SavedSearchStore
+
+
+def listing(title, company='Acme Inc', location='Berlin, Germany', link=None):
+    return {'title': title, 'company': company, 'location': location,
+            'link': link or f"https://jobs.example.com/{title.replace(' ', '-')}-{company}"}
+
+
+def test_exact_duplicate_collapses_into_canonical():
+    index = NearDuplicateIndex()
+    first = listing('Senior Python Engineer', link='https://a.example.com/1')
+    again = listing('Senior Python Engineer', link='https://b.example.com/1')
+    assert index.claim([first, again]) == [first]
+    assert first['alternate_links'] == ['https://b.example.com/1']
+    assert index.report()['exact_duplicates'] == 1
+
+
+def test_near_duplicate_with_abbreviations_collapses():
+    index = NearDuplicateIndex()
+    first = listing('Senior Software Engineer', location='New York, NY', link='https://a.example.com/1')
+    near = listing('Sr. Software Engineer', company='ACME', location='NYC', link='https://b.example.com/2')
+    assert index.claim([first]) == [first]
+    assert index.claim([near]) == []
+    assert first['alternate_links'] == ['https://b.example.com/2']
+    assert index.report()['near_duplicates'] == 1
+
+
+def test_different_seniority_or_company_is_kept():
+    index = NearDuplicateIndex()
+    jobs = [listing('Senior Data Engineer'), listing('Junior Data Engineer'),
+            listing('Senior Data Engineer', company='Globex')]
+    assert index.claim(jobs) == jobs
+    assert blocking_key(jobs[0]) != blocking_key(jobs[1])
+    assert normalize_company('Acme, Inc.') == normalize_company('ACME')
+
+
+def test_known_listings_reject_duplicates_without_counting():
+    index = NearDuplicateIndex()
+    known = listing('Backend Developer', link='https://a.example.com/known')
+    index.add_known(known)
+    assert index.claim([listing('Backend Dev', link='https://b.example.com/new')]) == []
+    report = index.report()
+    assert (report['listings'], report['unique']) == (1, 0)
+    assert known['alternate_links'] == ['https://b.example.com/new']
+
+
+def test_alternate_links_reports_duplicates_found_later():
+    index = NearDuplicateIndex()
+    first = listing('Platform Engineer', link='https://a.example.com/1')
+    index.claim([first, listing('Site Reliability Engineer')])
+    assert index.alternate_links() == {}
+    index.claim([listing('Platform Engineer', link='https://b.example.com/1')])
+    assert index.alternate_links() == {'https://a.example.com/1': ['https://b.example.com/1']}
+
+
+def test_result_store_merges_late_alternate_links():
+    store = ResultStore(chunk_size=2)
+    store.extend([
+        dict(listing('A'), link='https://a.example.com/1', alternate_links=[]),
+        dict(listing('B'), link='https://a.example.com/2', alternate_links=['https://b.example.com/2']),
+        dict(listing('C'), link='https://a.example.com/3', alternate_links=[]),
+    ])
+    store.merge_alternate_links({
+        'https://a.example.com/2': ['https://b.example.com/2', 'https://c.example.com/2'],
+        'https://a.example.com/3': ['https://b.example.com/3'],
+    })
+    rows = {row['link']: row['alternate_links'] for row in store}
+    assert rows == {
+        'https://a.example.com/1': [],
+        'https://a.example.com/2': ['https://b.example.com/2', 'https://c.example.com/2'],
+        'https://a.example.com/3': ['https://b.example.com/3'],
+    }
+
+
+def test_saved_search_records_late_alternate_links():
+    store = SavedSearchStore(':memory:')
+    job = dict(listing('Data Analyst', link='https://a.example.com/1'), alternate_links=[], match_score=80.0)
+    store.record_batch('analyst', [job])
+    store.record_alternate_links('analyst', {'https://a.example.com/1': ['https://b.example.com/1'],
+                                             'https://a.example.com/9': ['https://b.example.com/9']})
+    [stored] = store.listings('analyst')
+    assert stored['alternate_links'] == ['https://b.example.com/1']
+    assert stored['match_score'] == 80.0
@@ -0,0 +1,44 @@
+from agents.filtering import FilteringAgent, TfidfRanker
+from utils.score_cache import ScoreCache
+
+RESUME = {'skills': ['python', 'django', 'postgres'], 'experience': [], 'education': []}
+
+
+def make_agent(k):
+    agent = FilteringAgent(client=object(), cache=ScoreCache(':memory:'), prefilter_top_k=k)
+    scored = []
+
+    def score_search(job_listings, resume_data, budget, stats=None):
+        scored.extend(job_listings)
+        for job in job_listings:
+            job['match_score'] = 100
+
+    agent._score_search = score_search
+    return agent, scored
+
+
+def job(title):
+    return {'title': title, 'description': ''}
+
+
+def test_top_k_keeps_original_order():
+    jobs = [job('cook'), job('python django postgres'), job('java'), job('python')]
+    assert TfidfRanker().top_k(jobs, RESUME, 2) == [jobs[1], jobs[3]]
+
+
+def test_stream_only_scores_listings_in_running_top_k():
+    agent, scored = make_agent(2)
+    batches = [
+        [job('python django postgres'), job('python django'), job('cook')],
+        [job('python java'), job('java spring'), job('sales')],
+    ]
+    matches = [match for batch in agent.filter_jobs_stream(batches, RESUME) for match in batch]
+    assert [match['title'] for match in scored] == ['python django postgres', 'python django']
+    assert matches == scored
+
+
+def test_stream_without_prefilter_scores_everything():
+    agent, scored = make_agent(None)
+    batches = [[job('cook'), job('python')], [job('sales')]]
+    list(agent.filter_jobs_stream(batches, RESUME))
+    assert len(scored) == 3
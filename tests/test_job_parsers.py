@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from utils.job_parsers import DETAIL_PARSER, get_parser, normalize_listing
+
+LINKEDIN_PAGE = """
+<ul>
+<li><div class="base-card job-search-card">
+  <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/1"></a>
+  <h3 class="base-search-card__title"> Python Developer </h3>
+  <h4 class="base-search-card__subtitle">Acme</h4>
+  <span class="job-search-card__location">Berlin</span>
+</div></li>
+<li><div class="base-card job-search-card">
+  <h3 class="base-search-card__title">No link</h3>
+</div></li>
+</ul>
+"""
+
+GLASSDOOR_PAGE = """
+<ul><li data-test="jobListing">
+  <a data-test="job-title" href="/job-listing/data-engineer-1">Data Engineer</a>
+  <span data-test="emp-name">Globex</span>
+  <div data-test="emp-location">Remote</div>
+</li></ul>
+"""
+
+
+def test_linkedin_cards_skip_incomplete_ones():
+    assert get_parser('linkedin').parse(LINKEDIN_PAGE) == [{
+        'title': 'Python Developer', 'company': 'Acme', 'location': 'Berlin',
+        'link': 'https://www.linkedin.com/jobs/view/1', 'source': 'LinkedIn'
+    }]
+
+
+def test_glassdoor_links_are_absolute():
+    [job] = get_parser('glassdoor').parse(GLASSDOOR_PAGE)
+    assert job['link'] == 'https://www.glassdoor.com/job-listing/data-engineer-1'
+    assert (job['title'], job['company'], job['location']) == ('Data Engineer', 'Globex', 'Remote')
+
+
+@pytest.mark.parametrize('snippet', [None, '', '   ', '\n\t'])
+def test_indeed_empty_snippet_gives_empty_description(snippet):
+    text = json.dumps({'results': [
+        {'jobtitle': 'QA Engineer', 'company': 'Initech', 'url': 'https://indeed.com/1', 'snippet': snippet},
+        {'jobtitle': '', 'url': 'https://indeed.com/2'},
+    ]})
+    [job] = get_parser('indeed').parse(text)
+    assert job['description'] == ''
+    assert job['title'] == 'QA Engineer'
+
+
+def test_indeed_snippet_markup_is_stripped():
+    text = json.dumps({'results': [
+        {'jobtitle': 'QA', 'url': 'https://indeed.com/1', 'snippet': '<b>Test</b> automation'}
+    ]})
+    assert get_parser('indeed').parse(text)[0]['description'] == 'Test automation'
+
+
+@pytest.mark.parametrize('board', ['linkedin', 'glassdoor', 'indeed'])
+def test_empty_page_has_no_listings(board):
+    assert get_parser(board).parse('  ') == []
+
+
+def test_unknown_board_is_rejected():
+    with pytest.raises(ValueError):
+        get_parser('monster')
+
+
+def test_posting_splits_requirements_from_description():
+    html = """
+    <div id="jobDescriptionText">
+      <p>We build payment systems.</p>
+      <h3>Requirements</h3>
+      <ul><li>5+ years of Go</li><li>Postgres</li></ul>
+      <h3>Benefits</h3>
+      <p>Remote first</p>
+    </div>
+    """
+    details = DETAIL_PARSER.parse(html)
+    assert details['requirements'] == '5+ years of Go\nPostgres'
+    assert details['description'] == 'We build payment systems.\nBenefits\nRemote first'
+
+
+def test_normalize_listing_moves_url_and_fills_fields():
+    job = normalize_listing({'title': ' Dev ', 'url': 'https://example.com/1', 'company': None})
+    assert job['link'] == 'https://example.com/1'
+    assert job['title'] == 'Dev'
+    assert job['company'] == '' and job['requirements'] == ''
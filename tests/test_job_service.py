@@ -0,0 +1,145 @@
+import time
+
+import pytest
+
+from job_service import CANCELLED, DONE, FAILED, RUNNING, JobLost, JobQueue, run_search
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite'), stale_after=0.05, max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_claim_takes_oldest_queued_job_once(queue):
+    first = queue.submit({'n': 1})
+    queue.submit({'n': 2})
+    job = queue.claim('w1')
+    assert (job['id'], job['params'], job['attempts'], job['worker']) == (first, {'n': 1}, 1, 'w1')
+    assert queue.claim('w2')['params'] == {'n': 2}
+    assert queue.claim('w3') is None
+    assert queue.status(first)['status'] == RUNNING
+
+
+def test_stale_job_is_requeued_then_failed(queue):
+    job_id = queue.submit({})
+    queue.claim('w1')
+    time.sleep(0.1)
+    job = queue.claim('w2')
+    assert (job['id'], job['attempts']) == (job_id, 2)
+    time.sleep(0.1)
+    assert queue.claim('w3') is None
+    status = queue.status(job_id)
+    assert status['status'] == FAILED
+    assert status['error'] == 'worker stopped responding'
+
+
+def test_heartbeat_keeps_job_claimed(queue):
+    job_id = queue.submit({})
+    queue.claim('w1')
+    for _ in range(4):
+        time.sleep(0.03)
+        assert queue.heartbeat(job_id, 'w1')
+    assert queue.claim('w2') is None
+
+
+def test_writes_of_a_worker_that_lost_its_job_are_ignored(queue):
+    job_id = queue.submit({})
+    queue.claim('w1')
+    time.sleep(0.1)
+    assert queue.claim('w2')['id'] == job_id
+    assert not queue.heartbeat(job_id, 'w1')
+    assert not queue.progress(job_id, 'w1', 'scrape', 0.5)
+    assert not queue.save_checkpoint(job_id, 'w1', 'queries', ['stale'])
+    assert not queue.append_checkpoint(job_id, 'w1', 'filter', [{'title': 'stale'}], {'done': 1})
+    assert not queue.finish(job_id, 'w1', DONE)
+    assert queue.load_checkpoint(job_id, 'queries') is None
+    assert queue.load_checkpoint_parts(job_id, 'filter') == []
+    assert queue.finish(job_id, 'w2', DONE)
+    assert queue.status(job_id)['status'] == DONE
+
+
+def test_cancel_queued_job(queue):
+    job_id = queue.submit({})
+    queue.cancel(job_id)
+    assert queue.claim('w1') is None
+    assert queue.status(job_id)['status'] == CANCELLED
+
+
+def test_checkpoint_parts_are_appended_with_the_latest_state(queue):
+    job_id = queue.submit({})
+    queue.claim('w1')
+    assert queue.append_checkpoint(job_id, 'w1', 'filter', [1, 2], {'done': 2})
+    assert queue.append_checkpoint(job_id, 'w1', 'filter', [3], {'done': 3})
+    assert queue.load_checkpoint_parts(job_id, 'filter') == [[1, 2], [3]]
+    assert queue.load_checkpoint(job_id, 'filter') == {'done': 3}
+
+
+class Planner:
+    def record(self, report):
+        pass
+
+
+class SearchAgent:
+    planner = Planner()
+
+    def generate_queries(self, resume_data, skills, job_titles, locations, stats=None):
+        return ['python developer', 'data engineer']
+
+
+class Scraper:
+    def scrape_jobs_stream(self, queries, known_listings=None, stats=None):
+        for query in queries:
+            yield [{'title': f"{query} {i}", 'link': f"https://example.com/{query}/{i}", 'alternate_links': []}
+                   for i in range(3)]
+
+
+class Filter:
+    prefilter_top_k = None
+
+    def __init__(self, crash_after=None):
+        self.crash_after = crash_after
+        self.started_with = None
+
+    def new_budget(self):
+        return {'cheap': 0, 'expensive': 4}
+
+    def filter_jobs_stream(self, batches, resume_data, stats=None, budget=None):
+        self.started_with = dict(budget)
+        for n, batch in enumerate(batches):
+            if n == self.crash_after:
+                raise RuntimeError('worker died')
+            for job in batch:
+                scored = budget['expensive'] > 0
+                budget['expensive'] -= scored
+                job['match_score'] = 90.0 if scored else 0.0
+            yield [job for job in batch if job['match_score'] >= 50]
+
+
+def test_resumed_search_keeps_checkpointed_matches_and_budget(queue):
+    job_id = queue.submit({'resume_data': {}})
+    job = queue.claim('w1')
+    with pytest.raises(RuntimeError):
+        run_search(queue, job, SearchAgent(), Scraper(), Filter(crash_after=1), scrape_group=1, score_chunk=2)
+    assert queue.load_checkpoint(job_id, 'filter') == {'done': 2, 'budget': {'cheap': 0, 'expensive': 2}}
+
+    time.sleep(0.1)
+    job = queue.claim('w2')
+    resumed = Filter()
+    run_search(queue, job, SearchAgent(), Scraper(), resumed, scrape_group=1, score_chunk=2)
+    assert resumed.started_with == {'cheap': 0, 'expensive': 2}
+    matches = [match for part in queue.load_checkpoint_parts(job_id, 'filter') for match in part]
+    assert len(matches) == 4
+    assert len({match['link'] for match in matches}) == 4
+    assert len(queue.load_checkpoint_parts(job_id, 'scrape')) == 2
+
+
+def test_lost_job_stops_run_search(queue):
+    job_id = queue.submit({'resume_data': {}})
+    job = queue.claim('w1')
+    time.sleep(0.1)
+    queue.claim('w2')
+    with pytest.raises(JobLost):
+        run_search(queue, job, SearchAgent(), Scraper(), Filter())
+    assert queue.load_checkpoint(job_id, 'queries') is None
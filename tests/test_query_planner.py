@@ -0,0 +1,48 @@
+from utils.query_planner import QueryHistory, QueryPlanner, normalize_query, query_key, rank_skills
+
+
+def run(query, requests=5, new_listings=10, exhausted=False):
+    return {query: {'requests': requests, 'listings': new_listings, 'new_listings': new_listings,
+                    'exhausted': exhausted}}
+
+
+def test_query_key_ignores_order_case_and_punctuation():
+    assert query_key('Python, Developer Berlin') == query_key('berlin python developer')
+    assert normalize_query('  Python,  Developer ') == 'python developer'
+
+
+def test_rank_skills_puts_user_skills_first_then_mentions():
+    resume = {'skills': ['SQL', 'Go', 'Python'], 'raw_text': 'python python go'}
+    assert rank_skills(resume, ['Docker']) == ['docker', 'python', 'go', 'sql']
+    assert rank_skills(resume, limit=2) == ['python', 'go']
+
+
+def test_plan_drops_duplicates_and_keeps_order_without_history():
+    report = {}
+    planned = QueryPlanner().plan(['Python Developer', 'developer python', 'Data Engineer'], report)
+    assert planned == ['python developer', 'data engineer']
+    assert (report['candidates'], report['duplicates'], report['planned']) == (3, 1, 2)
+
+
+def test_plan_prunes_queries_covered_by_an_exhausted_broader_one():
+    history = QueryHistory(':memory:')
+    history.record(run('python developer', exhausted=True))
+    report = {}
+    planned = QueryPlanner(history).plan(['python developer', 'senior python developer', 'go developer'], report)
+    assert 'senior python developer' not in planned
+    assert report['covered'] == 1
+
+
+def test_plan_ranks_by_yield_within_the_budget():
+    history = QueryHistory(':memory:')
+    history.record(run('java developer', requests=5, new_listings=1))
+    history.record(run('rust developer', requests=5, new_listings=40))
+    report = {}
+    planner = QueryPlanner(history, max_requests=10, requests_per_query=5, prior_weight=1)
+    planned = planner.plan(['java developer', 'rust developer', 'go developer'], report)
+    assert planned == ['rust developer', 'go developer']
+    assert report['over_budget'] == 1
+
+
+def test_plan_keeps_at_least_one_query():
+    assert QueryPlanner(max_requests=1, requests_per_query=5).plan(['python developer']) == ['python developer']
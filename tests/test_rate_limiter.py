@@ -0,0 +1,62 @@
+import threading
+import time
+
+from utils.rate_limiter import HostRateLimiter, SharedTokenBuckets, TokenBucket
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate=20, capacity=1)
+    assert bucket.acquire() == 0.0
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.04
+
+
+def test_shared_buckets_reserve_in_order(tmp_path):
+    buckets = SharedTokenBuckets(str(tmp_path / 'rate.sqlite'))
+    waits = [buckets.acquire('board.example.com', rate=100, capacity=2) for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert all(0.0 < wait <= 0.02 for wait in waits[2:])
+    assert buckets.acquire('other.example.com', rate=100, capacity=1) == 0.0
+
+
+def test_shared_buckets_are_shared_through_the_file(tmp_path):
+    path = str(tmp_path / 'rate.sqlite')
+    first, second = SharedTokenBuckets(path), SharedTokenBuckets(path)
+    assert first.acquire('board.example.com', rate=50, capacity=1) == 0.0
+    assert second.acquire('board.example.com', rate=50, capacity=1) > 0.0
+
+
+def test_limiters_share_slots_only_with_the_same_cap():
+    semaphores = {}
+    narrow = HostRateLimiter(rate=1000, burst=100, concurrency=1, semaphores=semaphores)
+    same = HostRateLimiter(rate=1000, burst=100, concurrency=1, semaphores=semaphores)
+    wide = HostRateLimiter(rate=1000, burst=100, concurrency=4, semaphores=semaphores)
+    url = 'https://board.example.com/search'
+    assert narrow._get('board.example.com')[2] is same._get('board.example.com')[2]
+    assert wide._get('board.example.com')[2] is not narrow._get('board.example.com')[2]
+    assert set(semaphores) == {('board.example.com', 1), ('board.example.com', 4)}
+    with narrow.limit(url):
+        blocked = threading.Thread(target=lambda: same.limit(url).__enter__())
+        blocked.daemon = True
+        blocked.start()
+        blocked.join(0.05)
+        assert blocked.is_alive()
+        with wide.limit(url):
+            pass
+
+
+def test_rate_wait_does_not_hold_a_slot(tmp_path):
+    buckets = SharedTokenBuckets(str(tmp_path / 'rate.sqlite'))
+    limiter = HostRateLimiter(rate=5, burst=1, concurrency=1, shared_buckets=buckets)
+    url = 'https://board.example.com/search'
+    with limiter.limit(url):
+        pass
+    waiting = threading.Thread(target=lambda: limiter.limit(url).__enter__(), daemon=True)
+    waiting.start()
+    time.sleep(0.05)
+    # The second caller is still sleeping on the budget, so the slot is free
+    semaphore = limiter._get('board.example.com')[2]
+    assert semaphore.acquire(blocking=False)
+    semaphore.release()
+    waiting.join(1)
@@ -0,0 +1,57 @@
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.result_store import ResultStore
+
+
+def match(i, score):
+    return {'title': f"Role {i}", 'company': 'Acme', 'location': 'Berlin', 'link': f"https://example.com/{i}",
+            'source': 'LinkedIn', 'match_score': score, 'alternate_links': [f"https://mirror.example.com/{i}"],
+            'unknown_field': 'dropped'}
+
+
+def test_rows_survive_freezing_in_chunks():
+    store = ResultStore(chunk_size=2)
+    store.extend(match(i, float(i)) for i in range(5))
+    assert len(store) == 5
+    assert len(store.batches()) == 3
+    rows = list(store)
+    assert [row['title'] for row in rows] == [f"Role {i}" for i in range(5)]
+    assert rows[0]['alternate_links'] == ['https://mirror.example.com/0']
+    assert 'unknown_field' not in rows[0]
+    assert rows[0]['description'] is None
+
+
+def test_sort_by_score_descending():
+    store = ResultStore(chunk_size=2)
+    store.extend([match(0, 40.0), match(1, 90.0), match(2, 65.0)])
+    assert [row['match_score'] for row in store.sort_by('match_score')] == [90.0, 65.0, 40.0]
+
+
+def test_extra_fields_lead_the_schema():
+    store = ResultStore({'resume': pa.string()})
+    store.append(dict(match(0, 50.0), resume='a.pdf'))
+    assert store.schema.names[0] == 'resume'
+    assert store.row(0)['resume'] == 'a.pdf'
+
+
+def test_csv_joins_list_columns():
+    store = ResultStore()
+    store.append(dict(match(0, 50.0), alternate_links=['https://a.example.com', 'https://b.example.com']))
+    out = io.BytesIO()
+    store.write_csv(out)
+    lines = out.getvalue().decode().splitlines()
+    assert lines[0].startswith('"title","company"')
+    assert 'https://a.example.com https://b.example.com' in lines[1]
+
+
+def test_parquet_round_trip():
+    store = ResultStore(chunk_size=2)
+    store.extend(match(i, float(i)) for i in range(3))
+    out = io.BytesIO()
+    store.write_parquet(out)
+    table = pq.read_table(io.BytesIO(out.getvalue()))
+    assert table.num_rows == 3
+    assert ResultStore.from_table(table).row(2)['link'] == 'https://example.com/2'
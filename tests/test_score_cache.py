@@ -0,0 +1,66 @@
+import sqlite3
+import time
+
+from utils.score_cache import ScoreCache, make_key, normalize_job
+
+
+def test_roundtrip_counts_hits_and_misses(tmp_path):
+    cache = ScoreCache(str(tmp_path / 'cache.sqlite'))
+    key = make_key('job', 'resume')
+    assert cache.get(key) is None
+    cache.set(key, 87.5)
+    assert cache.get(key) == 87.5
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = ScoreCache(str(tmp_path / 'cache.sqlite'), ttl=0.01)
+    cache.set('k', 1)
+    time.sleep(0.02)
+    assert cache.get('k') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_hits_do_not_write_until_flushed(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = ScoreCache(path, flush_every=100)
+    cache.set('k', 1)
+    cache.flush()
+    before = sqlite3.connect(path).execute('SELECT accessed_at FROM cache').fetchone()[0]
+    time.sleep(0.01)
+    cache.get('k')
+    assert sqlite3.connect(path).execute('SELECT accessed_at FROM cache').fetchone()[0] == before
+    cache.flush()
+    assert sqlite3.connect(path).execute('SELECT accessed_at FROM cache').fetchone()[0] > before
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ScoreCache(str(tmp_path / 'cache.sqlite'), max_entries=3, flush_every=1)
+    for key in 'abc':
+        cache.set(key, key)
+        time.sleep(0.002)
+    cache.get('a')
+    cache.set('d', 'd')
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in 'acd'] == ['a', 'c', 'd']
+
+
+def test_locked_database_skips_the_write(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = ScoreCache(path, timeout=0.05)
+    cache.set('k', 1)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute('BEGIN IMMEDIATE')
+    try:
+        cache.set('j', 2)
+        assert cache.get('k') == 1
+    finally:
+        other.execute('ROLLBACK')
+    assert cache.get('j') is None
+    cache.set('j', 2)
+    assert cache.get('j') == 2
+
+
+def test_normalize_job_ignores_case_and_whitespace():
+    assert normalize_job({'title': '  Senior   Engineer '}) == normalize_job({'title': 'senior engineer'})
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def run_concurrently(flights, key, fn, callers):
+    results = [None] * callers
+    errors = [None] * callers
+
+    def call(i):
+        try:
+            results[i] = flights.do(key, fn)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_result():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'page'
+
+    leader = threading.Thread(target=flights.do, args=('key', fetch))
+    leader.start()
+    started.wait(5)
+    threads, results, errors = run_concurrently(flights, 'key', fetch, 3)
+    while flights.stats()['coalesced'] < 3:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in [leader] + threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert results == [('page', True)] * 3
+    assert errors == [None] * 3
+    assert flights.stats() == {'calls': 1, 'coalesced': 3, 'in_flight': 0}
+
+
+def test_errors_reach_every_waiter():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise ValueError('board down')
+
+    leader_errors = []
+
+    def lead():
+        try:
+            flights.do('key', fail)
+        except ValueError as e:
+            leader_errors.append(e)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    started.wait(5)
+    threads, _, errors = run_concurrently(flights, 'key', fail, 2)
+    while flights.stats()['coalesced'] < 2:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in [leader] + threads:
+        thread.join(5)
+    assert len(leader_errors) == 1
+    assert all(error is leader_errors[0] for error in errors)
+
+
+def test_nothing_is_remembered_after_landing():
+    flights = SingleFlight()
+    assert flights.do('key', lambda: 1) == (1, False)
+    assert flights.do('key', lambda: 2) == (2, False)
+    with pytest.raises(KeyError):
+        flights.do('other', lambda: {}['missing'])
+    assert flights.stats() == {'calls': 3, 'coalesced': 0, 'in_flight': 0}
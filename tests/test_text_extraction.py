@@ -0,0 +1,31 @@
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.text_extraction import DocumentTooLargeError, extract_pdf_text, extraction_pool
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from corpus import make_pdf  # noqa: E402
+
+
+def test_page_limit_is_enforced():
+    with pytest.raises(DocumentTooLargeError):
+        extract_pdf_text(io.BytesIO(make_pdf(3)), max_pages=2)
+
+
+def test_concurrent_parallel_extractions_share_one_pool():
+    data = make_pdf(12, lines_per_page=5)
+    expected = extract_pdf_text(io.BytesIO(data), workers=1)
+    pool = extraction_pool()
+
+    def extract(workers):
+        return extract_pdf_text(io.BytesIO(data), workers=workers, parallel_min_pages=2)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        texts = list(executor.map(extract, [2, 3, 4, 6]))
+    assert texts == [expected] * 4
+    assert extraction_pool() is pool
@@ -0,0 +1,36 @@
+import pytest
+
+from agents.web_scraper import WebScraperAgent
+from utils.search_stats import SearchStats
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    return WebScraperAgent(use_cache=False, boards=['linkedin'], rate_limit_path=str(tmp_path / 'rate_limits.sqlite'))
+
+
+def card(i):
+    return (f'<div class="job-search-card"><a class="base-card__full-link" href="https://example.com/{i}"></a>'
+            f'<h3 class="base-search-card__title">Role {i}</h3><h4 class="base-search-card__subtitle">Co {i}</h4>'
+            f'<span class="job-search-card__location">City {i}</span></div>')
+
+
+def test_parse_error_keeps_earlier_pages_and_records_query(scraper, monkeypatch):
+    board = scraper.boards['linkedin']
+    pages = iter(['<ul>' + ''.join(card(i) for i in range(board.page_size)) + '</ul>', 'not parsed'])
+    parse = board.parse
+
+    def flaky_parse(text):
+        if text == 'not parsed':
+            raise ValueError('broken page')
+        return parse(text)
+
+    monkeypatch.setattr(scraper, '_fetch_page', lambda board, query, start, stats=None: (next(pages), True))
+    monkeypatch.setattr(board, 'parse', flaky_parse)
+    stats = SearchStats()
+    jobs = scraper._scrape_board(board, 'python developer', stats=stats)
+    assert len(jobs) == board.page_size
+    assert stats.query_report()['python developer'] == {
+        'requests': 2, 'listings': board.page_size, 'new_listings': board.page_size, 'exhausted': False
+    }
+    assert scraper.board_report()[0]['errors'] == 1